@@ -12,14 +12,15 @@ tasks, notes), owners, pipelines, associations, form submissions.
 """
 
 import argparse
-import json
 import os
 import sys
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Iterable, List, Optional
 
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -35,9 +36,9 @@ RAW_DIR = BASE_DIR / "data" / "raw"
 RAW_DIR.mkdir(parents=True, exist_ok=True)
 
 sys.path.insert(0, str(BASE_DIR))
-from scripts.lib.hubspot_client import HubSpotClient
+from scripts.lib.hubspot_client import HUBSPOT_MAX_WORKERS, HubSpotClient, to_epoch_ms
 from scripts.lib.sync_state import (
-    get_last_sync_ms, load_cached_records, merge_records, save_sync_state,
+    load_cached_records, load_sync_state, merge_records, save_sync_state,
 )
 
 # ---------- Property lists --------------------------------------------------
@@ -55,7 +56,7 @@ CONTACT_PROPS = [
     "hs_analytics_first_url", "hs_analytics_last_url",
     "hs_email_last_open_date", "hs_email_last_click_date",
     "hs_latest_meeting_activity", "notes_last_updated",
-    "num_associated_deals",
+    "num_associated_deals", "num_associated_companies",
     "hs_lifecyclestage_lead_date",
     "hs_lifecyclestage_marketingqualifiedlead_date",
     "hs_lifecyclestage_salesqualifiedlead_date",
@@ -96,6 +97,18 @@ DEAL_PROPS = [
     "closed_lost_reason", "closed_won_reason",
 ]
 
+OBJECT_PROPS = {
+    "contacts": CONTACT_PROPS,
+    "companies": COMPANY_PROPS,
+    "deals": DEAL_PROPS,
+}
+
+# Properties kept in memory per record after a fetch (everything else is
+# streamed to disk). Association counts let empty lookups be skipped.
+SLIM_PROPS = {
+    "contacts": ("num_associated_deals", "num_associated_companies"),
+}
+
 ENGAGEMENT_PROPS = {
     "calls": ["hs_call_title", "hs_call_duration", "hs_call_disposition",
               "hs_call_direction", "hs_timestamp", "hubspot_owner_id"],
@@ -112,59 +125,181 @@ ENGAGEMENT_PROPS = {
 
 # ---------- Helpers ----------------------------------------------------------
 
-def _write_raw(name: str, date_stamp: str, data: Any):
-    payload = {
+def _raw_header(name: str, date_stamp: str) -> dict:
+    return {
         "source": "hubspot",
         "object_type": name.replace("hubspot_", ""),
         "captured_at": date_stamp,
-        "record_count": len(data) if isinstance(data, list) else None,
-        "results": data,
     }
+
+
+_COUNT_SLOT = 20  # bytes reserved for record_count; JSON allows the padding
+
+
+def _write_raw_pages(name: str, date_stamp: str, pages: Iterable[List[Any]]) -> int:
+    """Stream pages of records into a raw file and return the record count.
+
+    Records are encoded as each page arrives, so a full extraction never
+    holds more than one page in memory. ``record_count`` keeps its place
+    ahead of the results: a space-padded slot is reserved and filled in
+    after the last page. The file is written to a temp path and only
+    replaces today's raw file once complete, so a failure partway through
+    leaves the previous file untouched.
+    """
     out_path = RAW_DIR / f"{name}_{date_stamp}.json"
     tmp_path = out_path.with_suffix(".tmp")
+    count = 0
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, default=str)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(_raw_header(name, date_stamp))[:-1] + b',"record_count":')
+            count_pos = f.tell()
+            f.write(b" " * _COUNT_SLOT + b',"results":[')
+            for page in pages:
+                for record in page:
+                    if count:
+                        f.write(b",")
+                    f.write(orjson.dumps(record, default=str))
+                    count += 1
+            f.write(b"]}")
+            f.seek(count_pos)
+            f.write(b"%-*d" % (_COUNT_SLOT, count))
         os.replace(str(tmp_path), str(out_path))
-        count = len(data) if isinstance(data, list) else "N/A"
         logger.info(f"Saved {name}: {count} records -> {out_path}")
+    except (OSError, TypeError) as e:
+        logger.error(f"Failed to write {name}: {e}")
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
+
+
+def _write_raw(name: str, date_stamp: str, data: Any):
+    if isinstance(data, list):
+        _write_raw_pages(name, date_stamp, [data])
+        return
+    out_path = RAW_DIR / f"{name}_{date_stamp}.json"
+    tmp_path = out_path.with_suffix(".tmp")
+    payload = {**_raw_header(name, date_stamp), "record_count": None, "results": data}
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(str(tmp_path), str(out_path))
+        logger.info(f"Saved {name}: N/A records -> {out_path}")
     except Exception as e:
         logger.error(f"Failed to write {name}: {e}")
         if tmp_path.exists():
             tmp_path.unlink()
 
 
+def _slim_records(obj_type: str, records: Iterable[dict]) -> List[dict]:
+    """Reduce records to ID, updatedAt and the SLIM_PROPS for the object type."""
+    keep = SLIM_PROPS.get(obj_type, ())
+    return [
+        {
+            "id": str(r["id"]),
+            "updatedAt": r.get("updatedAt"),
+            **{p: (r.get("properties") or {}).get(p) for p in keep},
+        }
+        for r in records if r.get("id")
+    ]
+
+
+def _high_watermark(records: Iterable[dict], previous: Optional[int]) -> Optional[int]:
+    """Latest updatedAt (epoch ms) across records, never moving backwards.
+
+    Taken from HubSpot's own timestamps rather than the local clock, so
+    clock skew between this machine and HubSpot cannot drop changes.
+    """
+    stamps = [ms for ms in (to_epoch_ms(r.get("updatedAt")) for r in records) if ms]
+    if previous is not None:
+        stamps.append(previous)
+    return max(stamps) if stamps else None
+
+
+def _is_zero(value: Any) -> bool:
+    """True only for a count HubSpot reports as zero (unknown is not zero)."""
+    try:
+        return float(value) == 0
+    except (TypeError, ValueError):
+        return False
+
+
 def _fetch_object_incremental(
     client: HubSpotClient, obj_type: str, props: List[str],
     since_ms: int, date_stamp: str, raw_name: str,
 ) -> List[dict]:
-    """Fetch modified records and merge with cached full dataset."""
+    """Fetch modified records and merge with cached full dataset.
+
+    Returns every record in the merged dataset, slimmed by _slim_records.
+    """
     updated = client.search_modified(obj_type, since_ms, props)
     if not updated:
         logger.info(f"No {obj_type} modified since last sync — using cache")
         cached = load_cached_records("hubspot", obj_type)
         if cached:
             _write_raw(raw_name, date_stamp, cached)
-            return cached
+            return _slim_records(obj_type, cached)
     existing = load_cached_records("hubspot", obj_type)
     merged = merge_records(existing, updated)
     _write_raw(raw_name, date_stamp, merged)
-    return merged
+    return _slim_records(obj_type, merged)
 
 
 def _fetch_object_full(
     client: HubSpotClient, obj_type: str, props: List[str],
     date_stamp: str, raw_name: str,
 ) -> List[dict]:
-    """Full-fetch all records for an object type."""
+    """Full-fetch all records for an object type, streaming pages to disk.
+
+    Only the slimmed records (see _slim_records) are kept and returned.
+    """
     logger.info(f"Fetching all {obj_type} ({len(props)} properties)...")
-    records = client.paginate_all(
-        f"/crm/v3/objects/{obj_type}",
-        params={"properties": ",".join(props)},
-    )
-    logger.info(f"Fetched {len(records)} {obj_type}")
-    _write_raw(raw_name, date_stamp, records)
-    return records
+    slim: List[dict] = []
+
+    def _pages():
+        for page in client.iter_pages(
+            f"/crm/v3/objects/{obj_type}",
+            params={"properties": ",".join(props)},
+        ):
+            slim.extend(_slim_records(obj_type, page))
+            yield page
+
+    count = _write_raw_pages(raw_name, date_stamp, _pages())
+    logger.info(f"Fetched {count} {obj_type}")
+    return slim
+
+
+def _fetch_object(
+    client: HubSpotClient, obj_type: str, props: List[str],
+    last_sync: Optional[int], date_stamp: str,
+) -> List[dict]:
+    """Incremental fetch when a previous sync exists, full fetch otherwise."""
+    raw_name = f"hubspot_{obj_type}"
+    if last_sync is not None:
+        return _fetch_object_incremental(
+            client, obj_type, props, last_sync, date_stamp, raw_name)
+    return _fetch_object_full(client, obj_type, props, date_stamp, raw_name)
+
+
+def _fetch_form_submissions(client: HubSpotClient, date_stamp: str):
+    """Fetch submissions for every form, one form per worker."""
+    logger.info("Fetching forms...")
+    forms = client.paginate_all("/marketing/v3/forms")
+    logger.info(f"Found {len(forms)} forms")
+
+    def _form_subs(form: dict) -> List[dict]:
+        fid = form.get("id")
+        name = form.get("name", "")
+        return [
+            {**sub, "_form_id": fid, "_form_name": name}
+            for sub in client.iter_records(f"/form-integrations/v1/submissions/forms/{fid}")
+        ]
+
+    # Each form's submissions are written as soon as they are next in order,
+    # so the combined list is never built in memory.
+    with ThreadPoolExecutor(max_workers=HUBSPOT_MAX_WORKERS) as pool:
+        count = _write_raw_pages("hubspot_forms", date_stamp, pool.map(_form_subs, forms))
+    logger.info(f"Fetched {count} form submissions")
 
 
 # ---------- Main entry -------------------------------------------------------
@@ -176,79 +311,110 @@ def fetch_hubspot(force_refresh: bool = False):
         logger.warning("Missing HUBSPOT_API_KEY environment variable")
         return
 
-    client = HubSpotClient(api_key)
-    client.probe_auth()
     date_stamp = time.strftime("%Y-%m-%d")
     sync_start_ms = int(time.time() * 1000)
 
-    # Owners + pipelines: always full (cheap — 1-2 API calls)
-    owners = client.paginate_all("/crm/v3/owners/")
-    _write_raw("hubspot_owners", date_stamp, owners)
-    logger.info(f"Fetched {len(owners)} owners")
-
-    pipelines_data = client.get("/crm/v3/pipelines/deals")
-    pipelines = pipelines_data.get("results", []) if pipelines_data else []
-    _write_raw("hubspot_pipelines", date_stamp, pipelines)
-    logger.info(f"Fetched {len(pipelines)} pipelines")
-
-    # Determine sync mode
-    last_sync = None if force_refresh else get_last_sync_ms("hubspot")
-    incremental = last_sync is not None
-
-    if incremental:
-        logger.info(f"INCREMENTAL mode — fetching changes since {last_sync}")
-        contacts = _fetch_object_incremental(
-            client, "contacts", CONTACT_PROPS, last_sync, date_stamp, "hubspot_contacts")
-        companies = _fetch_object_incremental(
-            client, "companies", COMPANY_PROPS, last_sync, date_stamp, "hubspot_companies")
-        deals = _fetch_object_incremental(
-            client, "deals", DEAL_PROPS, last_sync, date_stamp, "hubspot_deals")
+    # Per-object high-watermarks; objects without one are fully fetched.
+    # last_sync_ms is the fallback for state written before cursors existed.
+    state = {} if force_refresh else load_sync_state("hubspot")
+    cursors = dict(state.get("cursors") or {})
+    fetch_props = {**OBJECT_PROPS, **ENGAGEMENT_PROPS}
+    since = {
+        obj_type: cursors.get(obj_type, state.get("last_sync_ms"))
+        for obj_type in fetch_props
+    }
+    if any(v is not None for v in since.values()):
+        logger.info(f"INCREMENTAL mode — fetching changes since {since}")
     else:
         logger.info("FULL mode — fetching all records")
-        contacts = _fetch_object_full(client, "contacts", CONTACT_PROPS, date_stamp, "hubspot_contacts")
-        companies = _fetch_object_full(client, "companies", COMPANY_PROPS, date_stamp, "hubspot_companies")
-        deals = _fetch_object_full(client, "deals", DEAL_PROPS, date_stamp, "hubspot_deals")
-
-    # Associations — only for modified records in incremental mode
-    contact_ids = [str(c.get("id")) for c in contacts if c.get("id")]
-    deal_ids = [str(d.get("id")) for d in deals if d.get("id")]
-    contact_deal_assoc = client.fetch_associations("contacts", "deals", contact_ids)
-    contact_company_assoc = client.fetch_associations("contacts", "companies", contact_ids)
-    deal_company_assoc = client.fetch_associations("deals", "companies", deal_ids)
-    _write_raw("hubspot_associations", date_stamp, {
-        "contact_to_deal": contact_deal_assoc,
-        "contact_to_company": contact_company_assoc,
-        "deal_to_company": deal_company_assoc,
-    })
 
-    # Engagements
-    for eng_type, props in ENGAGEMENT_PROPS.items():
-        if incremental:
-            _fetch_object_incremental(
-                client, eng_type, props, last_sync, date_stamp, f"hubspot_{eng_type}")
-        else:
-            _fetch_object_full(client, eng_type, props, date_stamp, f"hubspot_{eng_type}")
-
-    # Form submissions (always full — no lastmodifieddate filter available)
-    try:
-        logger.info("Fetching forms...")
-        forms = client.paginate_all("/marketing/v3/forms")
-        logger.info(f"Found {len(forms)} forms")
-        all_subs = []
-        for form in forms:
-            fid = form.get("id")
-            subs = client.paginate_all(f"/form-integrations/v1/submissions/forms/{fid}")
-            for sub in subs:
-                sub["_form_id"] = fid
-                sub["_form_name"] = form.get("name", "")
-            all_subs.extend(subs)
-        _write_raw("hubspot_forms", date_stamp, all_subs)
-        logger.info(f"Fetched {len(all_subs)} form submissions")
-    except Exception as e:
-        logger.warning(f"Form submissions fetch failed: {e}")
-
-    # Save sync state
-    save_sync_state("hubspot", {"last_sync_ms": sync_start_ms})
+    # Independent endpoints run concurrently; the client's rate limiter
+    # keeps the combined request rate inside HubSpot's budget.
+    with HubSpotClient(api_key) as client, \
+            ThreadPoolExecutor(max_workers=HUBSPOT_MAX_WORKERS) as pool:
+        # Owners + pipelines: always full (cheap — 1-2 API calls)
+        owners_future = pool.submit(client.paginate_all, "/crm/v3/owners/")
+        pipelines_future = pool.submit(client.get, "/crm/v3/pipelines/deals")
+        object_futures = {
+            obj_type: pool.submit(
+                _fetch_object, client, obj_type, props, since[obj_type], date_stamp)
+            for obj_type, props in fetch_props.items()
+        }
+        # Form submissions (always full — no lastmodifieddate filter available)
+        forms_future = pool.submit(_fetch_form_submissions, client, date_stamp)
+
+        owners = owners_future.result()
+        _write_raw("hubspot_owners", date_stamp, owners)
+        logger.info(f"Fetched {len(owners)} owners")
+
+        pipelines_data = pipelines_future.result()
+        pipelines = pipelines_data.get("results", []) if pipelines_data else []
+        _write_raw("hubspot_pipelines", date_stamp, pipelines)
+        logger.info(f"Fetched {len(pipelines)} pipelines")
+
+        fetched = {
+            obj_type: object_futures[obj_type].result() for obj_type in OBJECT_PROPS
+        }
+        contacts = fetched["contacts"]
+        deals = fetched["deals"]
+
+        # Associations — only for modified records in incremental mode
+        deal_ids = [d["id"] for d in deals]
+        # Contacts HubSpot reports as having no deals (or no companies) would
+        # return empty rows; an unknown count is still looked up
+        contact_ids_with_deals = [
+            c["id"] for c in contacts if not _is_zero(c.get("num_associated_deals"))
+        ]
+        contact_ids_with_companies = [
+            c["id"] for c in contacts if not _is_zero(c.get("num_associated_companies"))
+        ]
+        logger.info(
+            f"Skipping {len(contacts) - len(contact_ids_with_deals)} deal and "
+            f"{len(contacts) - len(contact_ids_with_companies)} company lookups "
+            f"for contacts with no associations"
+        )
+        # The three directions share no data, so they run side by side on
+        # their own executor rather than queueing behind engagement pulls.
+        with ThreadPoolExecutor(max_workers=3) as assoc_pool:
+            contact_deal_future = assoc_pool.submit(
+                client.fetch_associations, "contacts", "deals", contact_ids_with_deals)
+            contact_company_future = assoc_pool.submit(
+                client.fetch_associations, "contacts", "companies", contact_ids_with_companies)
+            deal_company_future = assoc_pool.submit(
+                client.fetch_associations, "deals", "companies", deal_ids)
+            contact_deal_assoc = contact_deal_future.result()
+            contact_company_assoc = contact_company_future.result()
+            deal_company_assoc = deal_company_future.result()
+        _write_raw("hubspot_associations", date_stamp, {
+            "contact_to_deal": contact_deal_assoc,
+            "contact_to_company": contact_company_assoc,
+            "deal_to_company": deal_company_assoc,
+        })
+
+        # Engagement types are independent — each raw file is written as its
+        # fetch completes, so one failing type keeps the others (and its own
+        # cursor stays put, so the next run retries it).
+        for eng_type in ENGAGEMENT_PROPS:
+            try:
+                fetched[eng_type] = object_futures[eng_type].result()
+            except Exception as e:
+                logger.warning(f"{eng_type.title()} fetch failed: {e}")
+                cursors[eng_type] = since[eng_type]
+
+        try:
+            forms_future.result()
+        except Exception as e:
+            logger.warning(f"Form submissions fetch failed: {e}")
+
+    # Save sync state. The previous watermark is the one this run fetched
+    # from, so a type that fell back to last_sync_ms keeps it when nothing
+    # new arrived instead of dropping to a full fetch next run.
+    for obj_type, records in fetched.items():
+        cursors[obj_type] = _high_watermark(records, since[obj_type])
+    save_sync_state("hubspot", {
+        "last_sync_ms": sync_start_ms,
+        "cursors": cursors,
+    })
     logger.info("HubSpot extraction complete")
 
 
@@ -7,7 +7,7 @@ re-fetching items. Dormant boards use cached data (no API calls).
 First run is always a full fetch.
 
 Caching:
-    - Per-board cache in data/cache/board_<id>.json
+    - Per-board cache rows in data/cache/boards.db (SQLite)
     - Activity check: 1 API call per board to detect changes
     - Dormant boards skip items fetch entirely
     - Use --force-refresh to bypass cache and re-fetch everything
@@ -19,15 +19,22 @@ Usage:
 """
 
 import argparse
-import json
+import hashlib
 import os
+import sqlite3
 import sys
+import threading
 import time
 import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -43,76 +50,145 @@ RAW_DIR = BASE_DIR / "data" / "raw"
 RAW_DIR.mkdir(parents=True, exist_ok=True)
 CACHE_DIR = BASE_DIR / "data" / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DB = CACHE_DIR / "boards.db"
 
 DEFAULT_CACHE_HOURS = 24  # Increased from 4h — boards rarely change hourly
 
 sys.path.insert(0, str(BASE_DIR))
-from scripts.lib.monday_client import MondayClient
+from scripts.lib.monday_client import (
+    ITEM_FIELDS_FULL, ITEM_FIELDS_MINIMAL, MONDAY_BATCH_BOARDS, MONDAY_MAX_WORKERS,
+    MondayClient,
+)
+from scripts.lib.monday_boards import board_needs_item_detail
 from scripts.lib.sync_state import save_sync_state
 
 
 # ---------- Cache helpers ----------------------------------------------------
 
-def _cache_path(board_id: str) -> Path:
-    return CACHE_DIR / f"board_{board_id}.json"
+# One SQLite file holds every board's cache row, so a freshness check is a
+# single indexed lookup instead of opening and parsing a JSON file. The
+# connection is shared by the board workers and serialised by a lock.
+# Payloads are zlib-compressed: the GraphQL JSON is highly repetitive, and
+# decompressing is cheaper than reading the extra bytes.
+_CACHE_ZLIB_LEVEL = 1
+_cache_conn: Optional[sqlite3.Connection] = None
+_cache_lock = threading.Lock()
+
+
+def _cache_db() -> sqlite3.Connection:
+    global _cache_conn
+    if _cache_conn is None:
+        conn = sqlite3.connect(str(CACHE_DB), isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS boards ("
+            "board_id TEXT PRIMARY KEY, cached_at REAL NOT NULL, payload BLOB NOT NULL)"
+        )
+        _cache_conn = conn
+    return _cache_conn
+
+
+def _cache_close():
+    global _cache_conn
+    with _cache_lock:
+        if _cache_conn is not None:
+            _cache_conn.close()
+            _cache_conn = None
 
 
-def _cache_read(path: Path) -> Optional[dict]:
+@contextmanager
+def _cache_session():
+    """Scope for cache use; the connection is closed even if the run fails."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return None
+        yield
+    finally:
+        _cache_close()
 
 
-def _cache_is_fresh(path: Path, max_age_hours: float) -> bool:
-    if not path.exists():
-        return False
+def _cache_read(board_id: str) -> Optional[dict]:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
-        cached_at = datetime.fromisoformat(meta.get("cached_at", ""))
-        age_hours = (datetime.now(timezone.utc) - cached_at).total_seconds() / 3600
-        return age_hours < max_age_hours
+        with _cache_lock:
+            row = _cache_db().execute(
+                "SELECT payload FROM boards WHERE board_id = ?", (str(board_id),)
+            ).fetchone()
+        if not row:
+            return None
+        blob = row[0]
+        # Rows written before compression are plain JSON
+        return orjson.loads(blob if blob[:1] == b"{" else zlib.decompress(blob))
     except Exception:
-        return False
+        return None
 
 
-def _cache_get_timestamp(path: Path) -> Optional[str]:
-    """Get the ISO timestamp when this cache was written."""
-    if not path.exists():
-        return None
+@lru_cache(maxsize=64)
+def _cache_read_version(board_id: str, cached_at: float) -> Optional[dict]:
+    """_cache_read memoised per cache version, for long-running processes.
+
+    A rewrite changes cached_at, so a stale entry is never served. The
+    returned dict is shared between calls and must not be mutated.
+    """
+    return _cache_read(board_id)
+
+
+def _cache_timestamps() -> Dict[str, float]:
+    """Epoch write time of every cached board, from one query on the table.
+
+    Rows from before epoch timestamps (ISO strings) are left out, so those
+    boards are simply re-fetched once.
+    """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
-        return meta.get("cached_at")
+        with _cache_lock:
+            rows = _cache_db().execute("SELECT board_id, cached_at FROM boards").fetchall()
     except Exception:
-        return None
+        return {}
+    stamps = {}
+    for board_id, cached_at in rows:
+        try:
+            stamps[board_id] = float(cached_at)
+        except (TypeError, ValueError):
+            continue
+    return stamps
 
 
-def _cache_write(path: Path, board_id: str, board_name: str,
+def _fresh_cutoff(max_age_hours: float) -> float:
+    """Epoch time after which a cache row counts as fresh.
+
+    Computed once per run so the board loop compares floats in memory
+    against the _cache_timestamps() snapshot.
+    """
+    return time.time() - max_age_hours * 3600
+
+
+def _cache_write(board_id: str, board_name: str,
                  items: list, activity_logs: list):
     payload = {
-        "cached_at": datetime.now(timezone.utc).isoformat(),
         "board_id": board_id,
         "board_name": board_name,
         "items": items,
         "activity_logs": activity_logs,
     }
-    tmp = path.with_suffix(".tmp")
     try:
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, default=str)
-        os.replace(str(tmp), str(path))
+        blob = zlib.compress(orjson.dumps(payload, default=str), _CACHE_ZLIB_LEVEL)
+        with _cache_lock:
+            _cache_db().execute(
+                "INSERT OR REPLACE INTO boards (board_id, cached_at, payload) "
+                "VALUES (?, ?, ?)",
+                (str(board_id), time.time(), blob),
+            )
     except Exception as e:
         logger.warning(f"Cache write failed for board {board_id}: {e}")
-        if tmp.exists():
-            tmp.unlink()
 
 
 # ---------- Raw-file writer --------------------------------------------------
 
-def _write_raw(name: str, date_stamp: str, data: Any):
+def _write_raw(name: str, date_stamp: str, data: Any, skip_unchanged: bool = False):
+    """Write a raw envelope atomically.
+
+    With ``skip_unchanged`` a sha256 of the bytes is kept in a sibling
+    ``.sha256`` file; when today's file already holds the same bytes the
+    disk write is skipped.
+    """
     payload = {
         "source": "monday",
         "object_type": name.replace("monday_", ""),
@@ -122,10 +198,18 @@ def _write_raw(name: str, date_stamp: str, data: Any):
     }
     out_path = RAW_DIR / f"{name}_{date_stamp}.json"
     tmp_path = out_path.with_suffix(".tmp")
+    digest_path = out_path.with_suffix(".sha256")
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, default=str)
+        blob = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+        digest = hashlib.sha256(blob).hexdigest() if skip_unchanged else None
+        if (digest and out_path.exists() and digest_path.exists()
+                and digest_path.read_text().strip() == digest):
+            logger.info(f"Unchanged {name}, keeping {out_path}")
+            return
+        tmp_path.write_bytes(blob)
         os.replace(str(tmp_path), str(out_path))
+        if digest:
+            digest_path.write_text(digest)
         count = len(data) if isinstance(data, list) else "N/A"
         logger.info(f"Saved {name}: {count} records -> {out_path}")
     except Exception as e:
@@ -134,6 +218,69 @@ def _write_raw(name: str, date_stamp: str, data: Any):
             tmp_path.unlink()
 
 
+# ---------- Per-board sync ---------------------------------------------------
+
+def _board_entry(board: dict, items: list, activity_logs: list) -> dict:
+    return {
+        "board_id": board.get("id"),
+        "board_name": board.get("name", ""),
+        "items": items,
+        "activity_logs": activity_logs,
+    }
+
+
+def _updated_before(board: dict, cached_at: float) -> bool:
+    """True when Monday reports no board change since cached_at (epoch s)."""
+    updated_at = board.get("updated_at")
+    if not updated_at:
+        return False
+    try:
+        updated = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return updated.timestamp() <= cached_at
+
+
+def _dormant_entry(client: MondayClient, board: dict,
+                   cache_ts: float) -> Optional[dict]:
+    """Cached entry for a stale board with no activity since it was cached.
+
+    Returns None when the board has changed (or the cache is unreadable)
+    and its items must be re-fetched.
+    """
+    since_iso = datetime.fromtimestamp(cache_ts, timezone.utc).isoformat()
+    if not client.check_board_activity(board.get("id"), since_iso):
+        cached_data = _cache_read_version(board.get("id"), cache_ts)
+        if cached_data:
+            return _board_entry(board, cached_data.get("items", []),
+                                cached_data.get("activity_logs", []))
+    return None
+
+
+def _item_fields(board: dict) -> str:
+    return ITEM_FIELDS_FULL if board_needs_item_detail(board) else ITEM_FIELDS_MINIMAL
+
+
+def _fetch_board(client: MondayClient, board: dict,
+                 first_page: Optional[dict]) -> dict:
+    """Fetch a board's items and activity logs and refresh its cache.
+
+    The activity logs arrive with the first page. If the batched query
+    missed this board, its first page is fetched here as a one-board batch
+    so the logs still come back with it.
+    """
+    board_id = board.get("id")
+    board_name = board.get("name", "")
+    fields = _item_fields(board)
+    if first_page is None:
+        first_page = client.fetch_boards_first_pages([board_id], fields).get(str(board_id)) or {}
+    items = client.fetch_board_items(
+        board_id, board_name, first_page=first_page, fields=fields)
+    logs = first_page.get("activity_logs", []) if items else []
+    _cache_write(board_id, board_name, items, logs)
+    return _board_entry(board, items, logs)
+
+
 # ---------- Main orchestration -----------------------------------------------
 
 def fetch_monday(force_refresh: bool = False,
@@ -141,7 +288,8 @@ def fetch_monday(force_refresh: bool = False,
     """Fetch Monday.com data with incremental activity-based caching.
 
     For each board:
-      1. If cache exists and is fresh (< cache_hours) -> use cache
+      1. If cache exists and is fresh (< cache_hours), or the board's
+         updated_at predates it -> use cache
       2. If cache exists but stale -> check activity_logs for changes
       3. If no recent activity -> use cache (board is dormant)
       4. If recent activity or no cache -> full fetch board items + logs
@@ -155,82 +303,100 @@ def fetch_monday(force_refresh: bool = False,
     mode = "FULL" if force_refresh else "INCREMENTAL"
     logger.info(f"Mode: {mode} | Cache TTL: {cache_hours}h")
 
-    client = MondayClient(api_key)
     date_stamp = time.strftime("%Y-%m-%d")
 
-    # 1. Users (always — cheap, 1 API call)
-    users = client.fetch_users()
-    _write_raw("monday_users", date_stamp, users)
-
-    # 2. Boards metadata (always — ~15 API calls)
-    boards = client.fetch_boards()
-    _write_raw("monday_boards", date_stamp, boards)
-
-    # 3. Items per board — incremental with activity check
-    all_board_items: Dict[str, dict] = {}
-    cached_count = 0
-    dormant_count = 0
-    fetched_count = 0
-    skipped_count = 0
-
-    for board in boards:
-        board_id = board.get("id")
-        board_name = board.get("name", "")
-
-        if board.get("state") != "active":
-            skipped_count += 1
-            continue
-
-        cp = _cache_path(board_id)
+    with MondayClient(api_key) as client, _cache_session():
+        # 1. Users (always — cheap, 1 API call)
+        users = client.fetch_users()
+        _write_raw("monday_users", date_stamp, users)
+
+        # 2. Boards metadata (always — ~15 API calls)
+        boards = client.fetch_boards()
+        _write_raw("monday_boards", date_stamp, boards)
+
+        # 3. Items per board — incremental with activity check
+        # Entries land out of order from the pool; the output dict is built
+        # once at the end. Monday board ids are already strings.
+        entries: List[dict] = []
+        counts = {"cached": 0, "dormant": 0, "fetched": 0}
+        skipped_count = 0
+        stale, to_fetch = [], []
+        cache_times = {} if force_refresh else _cache_timestamps()
+        fresh_after = _fresh_cutoff(cache_hours)
+
+        for board in boards:
+            if board.get("state") != "active":
+                skipped_count += 1
+                continue
 
-        # Fresh cache? Use it directly
-        if not force_refresh and _cache_is_fresh(cp, cache_hours):
-            cached_data = _cache_read(cp)
-            if cached_data:
-                all_board_items[str(board_id)] = {
-                    "board_id": board_id,
-                    "board_name": board_name,
-                    "items": cached_data.get("items", []),
-                    "activity_logs": cached_data.get("activity_logs", []),
-                }
-                cached_count += 1
+            board_id = board.get("id")
+            cache_ts = cache_times.get(board_id)
+            if cache_ts is None:
+                to_fetch.append(board)
                 continue
 
-        # Stale cache? Check if board has activity since cache time
-        if not force_refresh and cp.exists():
-            cache_ts = _cache_get_timestamp(cp)
-            if cache_ts and not client.check_board_activity(board_id, cache_ts):
-                cached_data = _cache_read(cp)
-                if cached_data:
-                    all_board_items[str(board_id)] = {
-                        "board_id": board_id,
-                        "board_name": board_name,
-                        "items": cached_data.get("items", []),
-                        "activity_logs": cached_data.get("activity_logs", []),
-                    }
-                    dormant_count += 1
-                    continue
-
-        # Need to fetch: cache miss, stale with activity, or force refresh
-        columns = board.get("columns", [])
-        items = client.fetch_board_items(board_id, board_name, columns=columns)
-        logs = client.fetch_activity_logs(board_id) if items else []
-
-        all_board_items[str(board_id)] = {
-            "board_id": board_id,
-            "board_name": board_name,
-            "items": items,
-            "activity_logs": logs,
-        }
-        _cache_write(cp, board_id, board_name, items, logs)
-        fetched_count += 1
+            # Fresh cache, or untouched since it was written (board updated_at
+            # comes free with the metadata)? Use it directly — no API call
+            fresh = cache_ts > fresh_after
+            cached_data = (_cache_read_version(board_id, cache_ts)
+                           if fresh or _updated_before(board, cache_ts) else None)
+            if cached_data:
+                entries.append(_board_entry(
+                    board, cached_data.get("items", []),
+                    cached_data.get("activity_logs", [])))
+                counts["cached" if fresh else "dormant"] += 1
+            else:
+                stale.append((board, cache_ts))
+
+        # Boards are independent, so the API work runs concurrently under
+        # the client's shared rate limiter.
+        with ThreadPoolExecutor(max_workers=MONDAY_MAX_WORKERS) as pool:
+            # Stale cache? Check if board has activity since cache time
+            checks = {pool.submit(_dormant_entry, client, b, ts): b for b, ts in stale}
+            for future in as_completed(checks):
+                entry = future.result()
+                if entry is None:
+                    to_fetch.append(checks[future])
+                else:
+                    entries.append(entry)
+                    counts["dormant"] += 1
+
+            # First pages of several boards share one aliased query (boards
+            # grouped by field set); remaining cursor pages go per board.
+            by_fields: Dict[str, list] = {}
+            for board in to_fetch:
+                by_fields.setdefault(_item_fields(board), []).append(board)
+            batches = {
+                pool.submit(client.fetch_boards_first_pages,
+                            [b.get("id") for b in group[i:i + MONDAY_BATCH_BOARDS]],
+                            fields):
+                    group[i:i + MONDAY_BATCH_BOARDS]
+                for fields, group in by_fields.items()
+                for i in range(0, len(group), MONDAY_BATCH_BOARDS)
+            }
+            board_futures = []
+            for future in as_completed(batches):
+                first_pages = future.result()
+                board_futures.extend(
+                    pool.submit(_fetch_board, client, b, first_pages.get(b.get("id")))
+                    for b in batches[future]
+                )
+            for future in as_completed(board_futures):
+                entry = future.result()
+                entries.append(entry)
+                counts["fetched"] += 1
+
+    # Keep the output in board order regardless of completion order
+    order = {b.get("id"): i for i, b in enumerate(boards)}
+    entries.sort(key=lambda e: order[e["board_id"]])
+    all_board_items = {e["board_id"]: e for e in entries}
 
     logger.info(
-        f"Board items: {fetched_count} fetched, {cached_count} cached (fresh), "
-        f"{dormant_count} cached (dormant), {skipped_count} skipped (inactive)"
+        f"Board items: {counts['fetched']} fetched, {counts['cached']} cached (fresh), "
+        f"{counts['dormant']} cached (dormant), {skipped_count} skipped (inactive)"
     )
 
-    _write_raw("monday_items", date_stamp, all_board_items)
+    _write_raw("monday_items", date_stamp, all_board_items, skip_unchanged=True)
     save_sync_state("monday", {"last_sync_ms": int(time.time() * 1000)})
     logger.info("Monday.com extraction complete")
 
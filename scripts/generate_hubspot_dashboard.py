@@ -13,21 +13,32 @@ Usage:
 
 from __future__ import annotations
 
+import heapq
 import html
 import json
 import logging
 import math
 import os
+import pickle
+import struct
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain, count, cycle
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
 
 # ---------------------------------------------------------------------------
 # Path setup
 # ---------------------------------------------------------------------------
 BASE_DIR = Path(__file__).resolve().parent.parent          # Annas Ai Hub/
-DATA_FILE = BASE_DIR / "data" / "processed" / "hubspot_sales_metrics.json"
+PROCESSED_DIR = BASE_DIR / "data" / "processed"
+DATA_FILE = PROCESSED_DIR / "hubspot_sales_metrics.json"
+METRICS_CACHE = BASE_DIR / "data" / "cache" / "hubspot_metrics.norm.pkl"
+METRICS_CACHE_VERSION = 2  # bump when _normalize_metrics changes its output shape
 OUTPUT_DIR = BASE_DIR / "dashboard" / "frontend"
 OUTPUT_FILE = OUTPUT_DIR / "dashboard-v2.html"
 
@@ -64,6 +75,14 @@ COLORS = {
     "surface2":     "#f3f4f6",       # Light grey
 }
 
+# Hot-path aliases: the chart and table helpers interpolate these per row,
+# so they are bound once instead of looked up in COLORS each time.
+_BG = COLORS["bg"]
+_TEXT = COLORS["text"]
+_TEXT_MUTED = COLORS["text_muted"]
+_CARD_BORDER = COLORS["card_border"]
+_SURFACE2 = COLORS["surface2"]
+
 CHART_PALETTE = [
     "#3CB4AD", "#334FB4", "#a78bfa", "#34d399", "#f472b6",
     "#f59e0b", "#60a5fa", "#ef4444", "#2dd4bf", "#c084fc",
@@ -116,26 +135,114 @@ def _register_builders() -> None:
 
 def _esc(text: Any) -> str:
     """HTML-escape a value; converts None to empty string."""
+    # html.escape's chained str.replace calls measure 3-4x faster than a
+    # str.translate table on CPython, so it stays.
     if text is None:
         return ""
     return html.escape(str(text))
 
 
-def _fmt_currency(value: Any, symbol: str = "\u00a3") -> str:
-    """Format a number as GBP currency (£)."""
+# For values already known to be str (JSON keys, labels built here): skips
+# _esc's None check and str() call, ~20% cheaper per field.
+_esc_str = html.escape
+
+
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file with orjson.
+
+    The analyzers write with json.dump, which allows NaN/Infinity; orjson
+    rejects those, so such files fall back to the stdlib parser.
+    """
+    raw = path.read_bytes()
     try:
-        v = float(value)
-    except (TypeError, ValueError):
-        return f"{symbol}0"
-    if abs(v) >= 1_000_000:
-        return f"{symbol}{v / 1_000_000:,.1f}M"
-    if abs(v) >= 1_000:
-        return f"{symbol}{v / 1_000:,.1f}K"
-    return f"{symbol}{v:,.0f}"
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
 
 
-def _fmt_number(value: Any) -> str:
-    """Format a number with commas."""
+@lru_cache(maxsize=8)
+def _load_processed_version(name: str, mtime_ns: int) -> Any:
+    return _load_json(PROCESSED_DIR / name)
+
+
+def _load_processed(name: str) -> Any:
+    """Load a side file from data/processed on first use; None if missing.
+
+    Several pages read the same file (the inbound queue feeds the summary,
+    the freshness bar and its own page), so each version is parsed once.
+    The result is shared and must not be mutated.
+    """
+    try:
+        mtime_ns = (PROCESSED_DIR / name).stat().st_mtime_ns
+    except OSError:
+        return None
+    return _load_processed_version(name, mtime_ns)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """True if a NaN or +/-Infinity float sits anywhere in *obj*."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def _json_embed(obj: Any) -> str:
+    """Serialise *obj* for an inline <script>: compact orjson, str() fallback.
+
+    orjson writes NaN/Infinity as null, which the page's JS would coerce to
+    0. The analyzer files can contain them (see _load_json), so a payload
+    holding a non-finite float goes through json.dumps instead, which
+    keeps the NaN/Infinity literals. Only payloads whose orjson output has
+    a null can hold one, so the rest skip the float walk.
+    """
+    out = orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    if b"null" in out and _has_non_finite(obj):
+        try:
+            return json.dumps(obj, default=str, separators=(",", ":"), ensure_ascii=False)
+        except TypeError:  # key types only orjson's OPT_NON_STR_KEYS accepts
+            pass
+    return out.decode()
+
+
+def _make_currency_formatter(symbol: str) -> Any:
+    """Return a memoised value -> "£1.2M" formatter bound to *symbol*.
+
+    The same totals are formatted again and again across cards, charts and
+    tables, so outputs are cached on the raw value.
+    """
+    zero = f"{symbol}0"
+
+    @lru_cache(maxsize=4096)
+    def fmt(value: Any) -> str:
+        try:
+            v = float(value)
+        except (TypeError, ValueError):
+            return zero
+        if abs(v) >= 1_000_000:
+            return f"{symbol}{v / 1_000_000:,.1f}M"
+        if abs(v) >= 1_000:
+            return f"{symbol}{v / 1_000:,.1f}K"
+        return f"{symbol}{v:,.0f}"
+
+    return fmt
+
+
+_CURRENCY_FORMATTERS: Dict[str, Any] = {"\u00a3": _make_currency_formatter("\u00a3")}
+
+
+# A cache hit is cheaper than any type-specialised fast path (a bound
+# "{:,}".format check measured ~3x slower), so formatting stays behind
+# the caches.
+@lru_cache(maxsize=4096)
+def _fmt_number_cached(value: Any) -> str:
     try:
         v = float(value)
         if v == int(v):
@@ -145,8 +252,8 @@ def _fmt_number(value: Any) -> str:
         return "0"
 
 
-def _fmt_pct(value: Any) -> str:
-    """Format a value as a percentage string."""
+@lru_cache(maxsize=4096)
+def _fmt_pct_cached(value: Any) -> str:
     try:
         v = float(value)
         return f"{v:.1f}%"
@@ -154,112 +261,200 @@ def _fmt_pct(value: Any) -> str:
         return "0%"
 
 
-def _safe_get(data: dict, *keys, default=None):
-    """Safely traverse nested dicts."""
-    current = data
-    for k in keys:
-        if isinstance(current, dict):
-            current = current.get(k, default)
-        else:
-            return default
-    return current if current is not None else default
+def _fmt_currency(value: Any, symbol: str = "\u00a3") -> str:
+    """Format a number as GBP currency (£)."""
+    fmt = _CURRENCY_FORMATTERS.get(symbol)
+    if fmt is None:
+        fmt = _CURRENCY_FORMATTERS.setdefault(symbol, _make_currency_formatter(symbol))
+    try:
+        return fmt(value)
+    except TypeError:  # unhashable, so not a number
+        return f"{symbol}0"
+
+
+def _fmt_number(value: Any) -> str:
+    """Format a number with commas."""
+    try:
+        return _fmt_number_cached(value)
+    except TypeError:
+        return "0"
+
+
+def _fmt_pct(value: Any) -> str:
+    """Format a value as a percentage string."""
+    try:
+        return _fmt_pct_cached(value)
+    except TypeError:
+        return "0%"
+
+
+# Dict-keyed analyzer fields the builders expect as lists of dicts:
+# (section, field, key names, value). The map key is copied into each key
+# name. *value* is the field name when the map holds scalars, or a callable
+# giving the row body when a map of dicts holds a bare value instead.
+# Left as dicts on purpose (charts use .items()): leads_by_source,
+# lead_status_distribution, close_date_distribution, by_lifecycle.
+_NORM_SPEC: List[Tuple[str, str, Tuple[str, ...], Any]] = [
+    ("lead_metrics", "leads_over_time", ("month",), "count"),
+    ("lead_metrics", "source_effectiveness", ("source",),
+     lambda k, v: {"lead_count": v, "mql_count": 0, "conversion_rate": 0}),
+    ("pipeline_metrics", "deals_by_stage", ("stage", "label"),
+     lambda k, v: {"count": v, "value": 0, "weighted_value": 0,
+                   "probability": 0, "avg_days_in_stage": 0}),
+    ("pipeline_metrics", "pipeline_by_owner", ("owner_id",),
+     lambda k, v: {"owner_name": str(k), "deal_count": 0, "total_value": 0}),
+    ("activity_metrics", "by_rep", ("owner_name",), lambda k, v: {"total": v}),
+    ("activity_metrics", "daily_trend", ("date",), "count"),
+    ("insights", "sales_cycle_trend", ("month",), "avg_days"),
+    ("insights", "deal_size_distribution", ("range",), "count"),
+    ("insights", "rep_performance", ("owner_id",), lambda k, v: {"name": str(k)}),
+    ("insights", "cohort_analysis", ("cohort_month",), lambda k, v: {"total_leads": v}),
+]
 
 
 def _normalize_metrics(data: dict) -> dict:
     """Normalize analyzer output: convert dict-keyed fields to list-of-dict format
     expected by dashboard builder.  Mutates *data* in-place and returns it."""
-
-    # -- lead_metrics --
-    lm = data.get("lead_metrics", {})
-    # leads_over_time: {month: count} -> [{month, count}]
-    if isinstance(lm.get("leads_over_time"), dict):
-        lm["leads_over_time"] = [{"month": k, "count": v} for k, v in lm["leads_over_time"].items()]
-    # source_effectiveness: {source: {mql: ..}} -> [{source, ...}]
-    if isinstance(lm.get("source_effectiveness"), dict):
-        lm["source_effectiveness"] = [
-            {"source": k, **(v if isinstance(v, dict) else {"lead_count": v, "mql_count": 0, "conversion_rate": 0})}
-            for k, v in lm["source_effectiveness"].items()
-        ]
-    # leads_by_source already dict {source:count} - keep as-is, charts handle dicts
-    # lead_status_distribution already dict - keep as-is
-
-    # -- pipeline_metrics --
-    pm = data.get("pipeline_metrics", {})
-    # deals_by_stage: {label: {count, value, ...}} -> [{stage, label, count, value, ...}]
-    if isinstance(pm.get("deals_by_stage"), dict):
-        pm["deals_by_stage"] = [
-            {"stage": k, "label": k, **(v if isinstance(v, dict) else {"count": v, "value": 0, "weighted_value": 0, "probability": 0, "avg_days_in_stage": 0})}
-            for k, v in pm["deals_by_stage"].items()
-        ]
-    # pipeline_by_owner: {id: {name, deals, ...}} -> [{owner_id, owner_name, ...}]
-    if isinstance(pm.get("pipeline_by_owner"), dict):
-        pm["pipeline_by_owner"] = [
-            {"owner_id": k, **(v if isinstance(v, dict) else {"owner_name": str(k), "deal_count": 0, "total_value": 0})}
-            for k, v in pm["pipeline_by_owner"].items()
-        ]
-    # close_date_distribution: keep as dict {month: count} - generator uses .items()
-
-    # -- activity_metrics --
-    am = data.get("activity_metrics", {})
-    # by_rep: {name: {calls, emails, ...}} -> [{owner_name, calls, ...}]
-    if isinstance(am.get("by_rep"), dict):
-        am["by_rep"] = [
-            {"owner_name": k, **(v if isinstance(v, dict) else {"total": v})}
-            for k, v in am["by_rep"].items()
-        ]
-    # daily_trend: {date: count} -> [{date, count}]
-    if isinstance(am.get("daily_trend"), dict):
-        am["daily_trend"] = [{"date": k, "count": v} for k, v in am["daily_trend"].items()]
-
-    # -- contact_metrics --
-    cm = data.get("contact_metrics", {})
-    # by_lifecycle: {stage: count} - keep as dict for charts
-    # companies_summary might be dict not list
-    if isinstance(cm.get("companies_summary"), dict) and "total" in cm["companies_summary"]:
-        # It's a summary object, wrap it
-        pass  # handled inline
-
-    # -- insights --
-    ins = data.get("insights", {})
-    # sales_cycle_trend: {month: avg_days} -> [{month, avg_days}]
-    if isinstance(ins.get("sales_cycle_trend"), dict):
-        ins["sales_cycle_trend"] = [{"month": k, "avg_days": v} for k, v in ins["sales_cycle_trend"].items()]
-    # deal_size_distribution: {range: count} -> [{range, count}]
-    if isinstance(ins.get("deal_size_distribution"), dict):
-        ins["deal_size_distribution"] = [{"range": k, "count": v} for k, v in ins["deal_size_distribution"].items()]
-    # rep_performance: {id: {...}} -> [{owner_id, ...}]
-    if isinstance(ins.get("rep_performance"), dict):
-        ins["rep_performance"] = [
-            {"owner_id": k, **(v if isinstance(v, dict) else {"name": str(k)})}
-            for k, v in ins["rep_performance"].items()
-        ]
-    # cohort_analysis: {month: {...}} -> [{cohort_month, ...}]
-    if isinstance(ins.get("cohort_analysis"), dict):
-        ins["cohort_analysis"] = [
-            {"cohort_month": k, **(v if isinstance(v, dict) else {"total_leads": v})}
-            for k, v in ins["cohort_analysis"].items()
-        ]
-
+    for section, field, key_names, value in _NORM_SPEC:
+        sec = data.get(section, {})
+        mapping = sec.get(field)
+        if not isinstance(mapping, dict):
+            continue
+        if callable(value):
+            sec[field] = [
+                {**dict.fromkeys(key_names, k), **(v if isinstance(v, dict) else value(k, v))}
+                for k, v in mapping.items()
+            ]
+        else:
+            sec[field] = [{**dict.fromkeys(key_names, k), value: v} for k, v in mapping.items()]
+    # Win/loss reasons arrive as {reason: count} or a bare list of reasons;
+    # store both as (reason, count) pairs ranked by count, count None for lists.
+    wl = data.get("insights", {}).get("win_loss_analysis")
+    if isinstance(wl, dict):
+        for field in ("won_reasons", "lost_reasons"):
+            reasons = wl.get(field)
+            if isinstance(reasons, dict):
+                wl[field] = sorted(reasons.items(), key=itemgetter(1), reverse=True)
+            elif isinstance(reasons, list) and not (reasons and isinstance(reasons[0], tuple)):
+                wl[field] = [(item, None) for item in reasons]
     return data
 
 
-def _color_at(idx: int) -> str:
-    """Return a palette colour by index (wrapping)."""
-    return CHART_PALETTE[idx % len(CHART_PALETTE)]
+def _load_metrics() -> dict:
+    """DATA_FILE parsed and normalised, reusing a pickle while it is unchanged.
+
+    The cache starts with the source's (mtime_ns, size) and
+    METRICS_CACHE_VERSION; on any mismatch the JSON is parsed again and the
+    cache rewritten.
+    """
+    st = DATA_FILE.stat()
+    key = struct.pack("<qqi", st.st_mtime_ns, st.st_size, METRICS_CACHE_VERSION)
+    try:
+        blob = METRICS_CACHE.read_bytes()
+        if blob[:len(key)] == key:
+            return pickle.loads(blob[len(key):])
+    except Exception:
+        pass
+    data = _normalize_metrics(_load_json(DATA_FILE))
+    tmp_path = METRICS_CACHE.with_suffix(".tmp")
+    try:
+        METRICS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(key + pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, METRICS_CACHE)
+    except Exception as exc:
+        logger.warning("Could not cache normalised metrics: %s", exc)
+    return data
 
 
 # ---------------------------------------------------------------------------
 # SVG chart generators
 # ---------------------------------------------------------------------------
 
+# The chart helpers below are memoised on their (tuple-converted) inputs:
+# KPI rows and tabs repeat the same series, so a repeat render is a dict
+# lookup. Each cache is bounded at _SVG_CACHE_SIZE entries.
+_SVG_CACHE_SIZE = 2048
+# Donuts with more than _DONUT_MAX_SEGMENTS slices keep the largest
+# _DONUT_TOP_SEGMENTS and fold the rest into "Other"
+_DONUT_MAX_SEGMENTS = 12
+_DONUT_TOP_SEGMENTS = 10
+# Longer series render static: one <animate> per bar or dot bloats the page
+# and slows the browser's SVG setup for no visible benefit.
+_ANIMATE_MAX_POINTS = 40
+
+# Per-row bar chart markup, compiled once with the palette baked in; rows
+# fill only the geometry.
+_BAR_ROW_TPL = f'''
+        <text x="{{label_x}}" y="{{text_y}}"
+              text-anchor="end" fill="{_TEXT_MUTED}"
+              font-size="12" font-family="system-ui, sans-serif">{{label}}</text>
+        <rect x="{{bar_x}}" y="{{y}}" width="0" height="{{bar_height}}"
+              rx="6" fill="{{color}}" opacity="0.85">
+            <animate attributeName="width" from="0" to="{{bar_w}}"
+                     dur="0.8s" begin="{{begin}}s" fill="freeze"
+                     calcMode="spline" keySplines="0.25 0.1 0.25 1"/>
+        </rect>'''
+
+_BAR_VALUE_TPL = f'''
+        <text x="{{value_x}}" y="{{text_y}}"
+              fill="{_TEXT}" font-size="12" font-weight="600"
+              font-family="system-ui, sans-serif" opacity="0">
+            {{value}}
+            <animate attributeName="opacity" from="0" to="1"
+                     dur="0.3s" begin="{{begin}}s" fill="freeze"/>
+        </text>'''
+
+_BAR_ROW_STATIC_TPL = f'''
+        <text x="{{label_x}}" y="{{text_y}}"
+              text-anchor="end" fill="{_TEXT_MUTED}"
+              font-size="12" font-family="system-ui, sans-serif">{{label}}</text>
+        <rect x="{{bar_x}}" y="{{y}}" width="{{bar_w}}" height="{{bar_height}}"
+              rx="6" fill="{{color}}" opacity="0.85"/>'''
+
+_BAR_VALUE_STATIC_TPL = f'''
+        <text x="{{value_x}}" y="{{text_y}}"
+              fill="{_TEXT}" font-size="12" font-weight="600"
+              font-family="system-ui, sans-serif">
+            {{value}}
+        </text>'''
+
+
+# Element ids for chart gradients and unnamed tables, unique per process
+_uid_counter = count(1)
+
+
+def _svg_points(points: List[Tuple[float, float]]) -> str:
+    """SVG "x,y x,y ..." list at one decimal, built by a single % format."""
+    return ("%.1f,%.1f " * len(points) % tuple(chain.from_iterable(points)))[:-1]
+
+
 def _svg_bar_chart(
     data: List[Tuple[str, float]],
     width: int = 500,
     height: int = 180,
     color: str = "#3CB4AD",
     show_values: bool = True,
+    animate: Optional[bool] = None,
+) -> str:
+    """Horizontal bar chart.  data = [(label, value), ...].
+
+    ``animate`` defaults to True up to _ANIMATE_MAX_POINTS bars.
+    """
+    if animate is None:
+        animate = len(data) <= _ANIMATE_MAX_POINTS
+    return _svg_bar_chart_cached(
+        tuple(map(tuple, data)), width, height, color, show_values, animate)
+
+
+@lru_cache(maxsize=_SVG_CACHE_SIZE)
+def _svg_bar_chart_cached(
+    data: Tuple[Tuple[str, float], ...],
+    width: int,
+    height: int,
+    color: str,
+    show_values: bool,
+    animate: bool,
 ) -> str:
-    """Horizontal bar chart.  data = [(label, value), ...]."""
     if not data:
         return _no_data_svg(width, height)
     bar_height = 22
@@ -269,33 +464,26 @@ def _svg_bar_chart(
     chart_width = width - label_width - value_width - 20
     max_val = max(v for _, v in data) or 1
     total_height = max(height, len(data) * (bar_height + gap) + 20)
+    row_tpl = _BAR_ROW_TPL if animate else _BAR_ROW_STATIC_TPL
+    value_tpl = _BAR_VALUE_TPL if animate else _BAR_VALUE_STATIC_TPL
 
     bars = []
-    for i, (label, val) in enumerate(data):
+    for i, ((label, val), c) in enumerate(zip(data, cycle(CHART_PALETTE))):
         y = i * (bar_height + gap) + 10
         bar_w = max(2, (val / max_val) * chart_width)
         label_text = label[:18] + ".." if len(str(label)) > 20 else str(label)
-        c = _color_at(i)
-        bars.append(f'''
-        <text x="{label_width - 8}" y="{y + bar_height / 2 + 5}"
-              text-anchor="end" fill="{COLORS['text_muted']}"
-              font-size="12" font-family="system-ui, sans-serif">{_esc(label_text)}</text>
-        <rect x="{label_width}" y="{y}" width="0" height="{bar_height}"
-              rx="6" fill="{c}" opacity="0.85">
-            <animate attributeName="width" from="0" to="{bar_w}"
-                     dur="0.8s" begin="{i * 0.05}s" fill="freeze"
-                     calcMode="spline" keySplines="0.25 0.1 0.25 1"/>
-        </rect>''')
+        text_y = y + bar_height / 2 + 5
+        bars.append(row_tpl.format(
+            label_x=label_width - 8, text_y=text_y, label=_esc(label_text),
+            bar_x=label_width, y=y, bar_height=bar_height, color=c,
+            bar_w=bar_w, begin=i * 0.05,
+        ))
         if show_values:
             display_val = _fmt_currency(val) if val > 100 else _fmt_number(val)
-            bars.append(f'''
-        <text x="{label_width + bar_w + 8}" y="{y + bar_height / 2 + 5}"
-              fill="{COLORS['text']}" font-size="12" font-weight="600"
-              font-family="system-ui, sans-serif" opacity="0">
-            {_esc(display_val)}
-            <animate attributeName="opacity" from="0" to="1"
-                     dur="0.3s" begin="{0.5 + i * 0.05}s" fill="freeze"/>
-        </text>''')
+            bars.append(value_tpl.format(
+                value_x=label_width + bar_w + 8, text_y=text_y,
+                value=_esc(display_val), begin=0.5 + i * 0.05,
+            ))
 
     return f'''<svg width="100%" viewBox="0 0 {width} {total_height}"
          xmlns="http://www.w3.org/2000/svg" role="img"
@@ -308,7 +496,25 @@ def _svg_donut(
     size: int = 150,
     inner_ratio: float = 0.6,
 ) -> str:
-    """Donut / pie chart with animated segments and legend."""
+    """Donut / pie chart with animated segments and legend.
+
+    More than _DONUT_MAX_SEGMENTS segments are cut to the largest
+    _DONUT_TOP_SEGMENTS plus an "Other" slice, keeping the legend readable
+    and the palette unwrapped.
+    """
+    if len(segments) > _DONUT_MAX_SEGMENTS:
+        ranked = sorted(segments, key=itemgetter(1), reverse=True)
+        segments = ranked[:_DONUT_TOP_SEGMENTS] + [
+            ("Other", sum(v for _, v in ranked[_DONUT_TOP_SEGMENTS:]))]
+    return _svg_donut_cached(tuple(map(tuple, segments)), size, inner_ratio)
+
+
+@lru_cache(maxsize=_SVG_CACHE_SIZE)
+def _svg_donut_cached(
+    segments: Tuple[Tuple[str, float], ...],
+    size: int,
+    inner_ratio: float,
+) -> str:
     if not segments or all(v == 0 for _, v in segments):
         return _no_data_svg(size, size)
     total = sum(v for _, v in segments) or 1
@@ -319,54 +525,58 @@ def _svg_donut(
     paths = []
     legend_items = []
     angle = -90  # start at top
+    # Each segment starts where the previous one ended, so every boundary's
+    # cos/sin is computed once and shared by the outer and inner arcs.
+    start_rad = math.radians(angle)
+    cos_s, sin_s = math.cos(start_rad), math.sin(start_rad)
 
-    for i, (label, val) in enumerate(segments):
+    for i, ((label, val), c) in enumerate(zip(segments, cycle(CHART_PALETTE))):
         pct = val / total
         sweep = pct * 360
         if sweep < 0.5:
             continue
         large = 1 if sweep > 180 else 0
-        start_rad = math.radians(angle)
         end_rad = math.radians(angle + sweep)
+        cos_e, sin_e = math.cos(end_rad), math.sin(end_rad)
 
         # Outer arc
-        x1 = cx + r * math.cos(start_rad)
-        y1 = cy + r * math.sin(start_rad)
-        x2 = cx + r * math.cos(end_rad)
-        y2 = cy + r * math.sin(end_rad)
+        x1 = cx + r * cos_s
+        y1 = cy + r * sin_s
+        x2 = cx + r * cos_e
+        y2 = cy + r * sin_e
         # Inner arc (reverse)
-        ix1 = cx + ir * math.cos(end_rad)
-        iy1 = cy + ir * math.sin(end_rad)
-        ix2 = cx + ir * math.cos(start_rad)
-        iy2 = cy + ir * math.sin(start_rad)
+        ix1 = cx + ir * cos_e
+        iy1 = cy + ir * sin_e
+        ix2 = cx + ir * cos_s
+        iy2 = cy + ir * sin_s
 
-        c = _color_at(i)
         d = (f"M {x1:.1f} {y1:.1f} "
              f"A {r:.1f} {r:.1f} 0 {large} 1 {x2:.1f} {y2:.1f} "
              f"L {ix1:.1f} {iy1:.1f} "
              f"A {ir:.1f} {ir:.1f} 0 {large} 0 {ix2:.1f} {iy2:.1f} Z")
 
         paths.append(f'''
-        <path d="{d}" fill="{c}" opacity="0" stroke="{COLORS['bg']}" stroke-width="2">
+        <path d="{d}" fill="{c}" opacity="0" stroke="{_BG}" stroke-width="2">
             <animate attributeName="opacity" from="0" to="0.9"
                      dur="0.6s" begin="{i * 0.08}s" fill="freeze"/>
         </path>''')
 
         short_label = label[:16] + ".." if len(str(label)) > 18 else str(label)
         legend_items.append(f'''
-        <div style="display:flex;align-items:center;gap:6px;font-size:11px;color:{COLORS['text_muted']}">
+        <div style="display:flex;align-items:center;gap:6px;font-size:11px;color:{_TEXT_MUTED}">
             <span style="width:10px;height:10px;border-radius:50%;background:{c};flex-shrink:0"></span>
             {_esc(short_label)}: {_fmt_pct(pct * 100)}
         </div>''')
         angle += sweep
+        cos_s, sin_s = cos_e, sin_e
 
     # Centre label
     centre = f'''
         <text x="{cx}" y="{cy - 6}" text-anchor="middle"
-              fill="{COLORS['text']}" font-size="22" font-weight="700"
+              fill="{_TEXT}" font-size="22" font-weight="700"
               font-family="system-ui, sans-serif">{_fmt_number(total)}</text>
         <text x="{cx}" y="{cy + 14}" text-anchor="middle"
-              fill="{COLORS['text_muted']}" font-size="11"
+              fill="{_TEXT_MUTED}" font-size="11"
               font-family="system-ui, sans-serif">Total</text>'''
 
     svg = f'''<svg width="{size}" height="{size}" viewBox="0 0 {size} {size}"
@@ -387,6 +597,26 @@ def _svg_sparkline(
     fill: bool = True,
 ) -> str:
     """Tiny trend sparkline."""
+    return _fill_spark_uid(_svg_sparkline_cached(tuple(values), width, height, color, fill))
+
+
+# Cached sparklines carry this in place of their gradient id; callers swap in
+# a fresh _uid_counter value per use so repeated cards keep distinct ids
+_SPARK_UID_SLOT = "sparkGrad_@uid@"
+
+
+def _fill_spark_uid(svg: str) -> str:
+    return svg.replace(_SPARK_UID_SLOT, f"sparkGrad_{next(_uid_counter)}")
+
+
+@lru_cache(maxsize=_SVG_CACHE_SIZE)
+def _svg_sparkline_cached(
+    values: Tuple[float, ...],
+    width: int,
+    height: int,
+    color: str,
+    fill: bool,
+) -> str:
     if not values or len(values) < 2:
         return f'<svg width="{width}" height="{height}"></svg>'
     mn = min(values)
@@ -396,25 +626,23 @@ def _svg_sparkline(
     w = width - pad * 2
     h = height - pad * 2
 
-    points = []
-    for i, v in enumerate(values):
-        x = pad + (i / (len(values) - 1)) * w
-        y = pad + h - ((v - mn) / rng) * h
-        points.append(f"{x:.1f},{y:.1f}")
-
-    polyline = ' '.join(points)
+    points = [
+        (pad + (i / (len(values) - 1)) * w, pad + h - ((v - mn) / rng) * h)
+        for i, v in enumerate(values)
+    ]
+    polyline = _svg_points(points)
     fill_path = ""
     if fill:
         first_x = pad
         last_x = pad + w
         fill_points = f"{first_x},{pad + h} {polyline} {last_x},{pad + h}"
         fill_path = f'''<polygon points="{fill_points}"
-            fill="url(#sparkGrad_{id(values)})" opacity="0.3"/>'''
+            fill="url(#{_SPARK_UID_SLOT})" opacity="0.3"/>'''
 
     return f'''<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}"
          xmlns="http://www.w3.org/2000/svg">
         <defs>
-            <linearGradient id="sparkGrad_{id(values)}" x1="0" y1="0" x2="0" y2="1">
+            <linearGradient id="{_SPARK_UID_SLOT}" x1="0" y1="0" x2="0" y2="1">
                 <stop offset="0%" stop-color="{color}" stop-opacity="0.4"/>
                 <stop offset="100%" stop-color="{color}" stop-opacity="0"/>
             </linearGradient>
@@ -423,7 +651,7 @@ def _svg_sparkline(
         <polyline points="{polyline}" fill="none"
                   stroke="{color}" stroke-width="2" stroke-linecap="round"
                   stroke-linejoin="round"/>
-        <circle cx="{points[-1].split(',')[0]}" cy="{points[-1].split(',')[1]}"
+        <circle cx="{points[-1][0]:.1f}" cy="{points[-1][1]:.1f}"
                 r="3" fill="{color}"/>
     </svg>'''
 
@@ -442,14 +670,16 @@ def _svg_funnel(
     min_width_pct = 0.25
     pad = 40
 
-    shapes = []
-    for i, (label, val, conv_text) in enumerate(stages):
-        pct = max(val / max_val, min_width_pct)
-        next_pct = max(stages[i + 1][1] / max_val, min_width_pct) if i < n - 1 else pct * 0.8
+    # Each stage's width is the next one's top, so scale them all once
+    pcts = [max(s[1] / max_val, min_width_pct) for s in stages]
+    pcts.append(pcts[-1] * 0.8)
+    inner_w = width - 2 * pad
+    cx_val = width / 2
 
-        top_w = pct * (width - 2 * pad)
-        bot_w = next_pct * (width - 2 * pad)
-        cx_val = width / 2
+    shapes = []
+    for i, ((label, val, conv_text), c) in enumerate(zip(stages, cycle(CHART_PALETTE))):
+        top_w = pcts[i] * inner_w
+        bot_w = pcts[i + 1] * inner_w
         y_top = i * stage_h
         y_bot = y_top + stage_h
 
@@ -458,11 +688,10 @@ def _svg_funnel(
         bl = cx_val - bot_w / 2
         br = cx_val + bot_w / 2
 
-        c = _color_at(i)
         shapes.append(f'''
         <polygon points="{tl:.0f},{y_top:.0f} {tr:.0f},{y_top:.0f}
                          {br:.0f},{y_bot:.0f} {bl:.0f},{y_bot:.0f}"
-                 fill="{c}" opacity="0" stroke="{COLORS['bg']}" stroke-width="2">
+                 fill="{c}" opacity="0" stroke="{_BG}" stroke-width="2">
             <animate attributeName="opacity" from="0" to="0.85"
                      dur="0.5s" begin="{i * 0.12}s" fill="freeze"/>
         </polygon>
@@ -487,6 +716,7 @@ def _svg_funnel(
     </svg>'''
 
 
+@lru_cache(maxsize=_SVG_CACHE_SIZE)
 def _svg_horizontal_bar(
     label: str,
     value: float,
@@ -500,18 +730,33 @@ def _svg_horizontal_bar(
     pct = min(value / max_val, 1.0) * 100 if max_val else 0
     return f'''<div style="margin-bottom:10px">
         <div style="display:flex;justify-content:space-between;margin-bottom:4px;
-                    font-size:13px;color:{COLORS['text_muted']}">
+                    font-size:13px;color:{_TEXT_MUTED}">
             <span>{_esc(str(label))}</span>
-            <span style="font-weight:600;color:{COLORS['text']}">{_fmt_number(value)}
+            <span style="font-weight:600;color:{_TEXT}">{_fmt_number(value)}
                 {f' ({pct:.0f}%)' if show_pct else ''}</span>
         </div>
-        <div style="height:8px;background:{COLORS['card_border']};border-radius:4px;overflow:hidden">
+        <div style="height:8px;background:{_CARD_BORDER};border-radius:4px;overflow:hidden">
             <div style="height:100%;width:{pct:.1f}%;background:linear-gradient(90deg,{color},{color}dd);
                         border-radius:4px;transition:width 1.2s cubic-bezier(.25,.1,.25,1)"></div>
         </div>
     </div>'''
 
 
+@lru_cache(maxsize=_SVG_CACHE_SIZE)
+def _short_date_label(raw: str) -> str:
+    """Axis label for a date key; every trend chart repeats the same months."""
+    # Format YYYY-MM dates as "Mon YY"
+    try:
+        return datetime.strptime(raw[:7], "%Y-%m").strftime("%b %y")
+    except ValueError:
+        pass
+    # Format YYYY-MM-DD dates as "DD Mon"
+    try:
+        return datetime.strptime(raw[:10], "%Y-%m-%d").strftime("%d %b")
+    except ValueError:
+        return raw[-5:]
+
+
 def _svg_line_chart(
     data_points: List[Tuple[str, float]],
     width: int = 500,
@@ -519,8 +764,12 @@ def _svg_line_chart(
     color: str = "#38bdf8",
     show_dots: bool = True,
     show_labels: bool = True,
+    animate: Optional[bool] = None,
 ) -> str:
-    """Line chart with area fill.  data_points = [(label, value), ...]."""
+    """Line chart with area fill.  data_points = [(label, value), ...].
+
+    ``animate`` (dot fade-in) defaults to True up to _ANIMATE_MAX_POINTS points.
+    """
     if not data_points or len(data_points) < 2:
         return _no_data_svg(width, height)
     values = [v for _, v in data_points]
@@ -532,59 +781,53 @@ def _svg_line_chart(
     chart_w = width - pad_x * 2
     chart_h = height - pad_y * 2
 
-    points = []
-    for i, v in enumerate(values):
-        x = pad_x + (i / (len(values) - 1)) * chart_w
-        y = pad_y + chart_h - ((v - mn) / rng) * chart_h
-        points.append((x, y))
-
-    polyline = ' '.join(f"{x:.1f},{y:.1f}" for x, y in points)
+    points = [
+        (pad_x + (i / (len(values) - 1)) * chart_w, pad_y + chart_h - ((v - mn) / rng) * chart_h)
+        for i, v in enumerate(values)
+    ]
+    polyline = _svg_points(points)
     fill_pts = (f"{points[0][0]:.1f},{pad_y + chart_h} {polyline} "
                 f"{points[-1][0]:.1f},{pad_y + chart_h}")
 
-    uid = abs(hash(str(data_points))) % 100000
+    uid = next(_uid_counter)
 
-    dots = ""
-    if show_dots:
+    dots = []
+    if animate is None:
+        animate = len(points) <= _ANIMATE_MAX_POINTS
+    if show_dots and animate:
         for i, (x, y) in enumerate(points):
-            dots += f'''<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{color}"
-                stroke="{COLORS['bg']}" stroke-width="2" opacity="0">
+            dots.append(f'''<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{color}"
+                stroke="{_BG}" stroke-width="2" opacity="0">
                 <animate attributeName="opacity" from="0" to="1"
                          dur="0.2s" begin="{0.5 + i * 0.03}s" fill="freeze"/>
-            </circle>\n'''
+            </circle>\n''')
+    elif show_dots:
+        dots.extend(
+            f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{color}" '
+            f'stroke="{_BG}" stroke-width="2"/>\n'
+            for x, y in points
+        )
 
-    x_labels = ""
+    x_labels = []
     if show_labels and len(labels) <= 20:
         step = max(1, len(labels) // 8)
         for i in range(0, len(labels), step):
             x = pad_x + (i / (len(labels) - 1)) * chart_w
-            raw = str(labels[i])
-            # Format YYYY-MM dates as "Mon YY"
-            try:
-                from datetime import datetime as _dt
-                dt = _dt.strptime(raw[:7], "%Y-%m")
-                short = dt.strftime("%b %y")
-            except Exception:
-                # Format YYYY-MM-DD dates as "DD Mon"
-                try:
-                    dt = _dt.strptime(raw[:10], "%Y-%m-%d")
-                    short = dt.strftime("%d %b")
-                except Exception:
-                    short = raw[-5:]
-            x_labels += f'''<text x="{x:.1f}" y="{pad_y + chart_h + 18}"
-                text-anchor="middle" fill="{COLORS['text_muted']}" font-size="10"
-                font-family="system-ui, sans-serif">{_esc(short)}</text>\n'''
+            short = _short_date_label(str(labels[i]))
+            x_labels.append(f'''<text x="{x:.1f}" y="{pad_y + chart_h + 18}"
+                text-anchor="middle" fill="{_TEXT_MUTED}" font-size="10"
+                font-family="system-ui, sans-serif">{_esc(short)}</text>\n''')
 
     # Y-axis labels
-    y_labels = ""
+    y_labels = []
     for i in range(5):
         val = mn + (rng * i / 4)
         y = pad_y + chart_h - (chart_h * i / 4)
-        y_labels += f'''<text x="{pad_x - 8}" y="{y + 4}" text-anchor="end"
-            fill="{COLORS['text_muted']}" font-size="10"
+        y_labels.append(f'''<text x="{pad_x - 8}" y="{y + 4}" text-anchor="end"
+            fill="{_TEXT_MUTED}" font-size="10"
             font-family="system-ui, sans-serif">{_fmt_number(val)}</text>
         <line x1="{pad_x}" y1="{y}" x2="{pad_x + chart_w}" y2="{y}"
-              stroke="{COLORS['card_border']}" stroke-width="0.5" stroke-dasharray="4"/>\n'''
+              stroke="{_CARD_BORDER}" stroke-width="0.5" stroke-dasharray="4"/>\n''')
 
     return f'''<svg width="100%" viewBox="0 0 {width} {height}"
          xmlns="http://www.w3.org/2000/svg" role="img"
@@ -595,12 +838,12 @@ def _svg_line_chart(
                 <stop offset="100%" stop-color="{color}" stop-opacity="0.02"/>
             </linearGradient>
         </defs>
-        {y_labels}
+        {''.join(y_labels)}
         <polygon points="{fill_pts}" fill="url(#lineGrad_{uid})"/>
         <polyline points="{polyline}" fill="none" stroke="{color}"
                   stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round"/>
-        {dots}
-        {x_labels}
+        {''.join(dots)}
+        {''.join(x_labels)}
     </svg>'''
 
 
@@ -608,10 +851,10 @@ def _no_data_svg(width: int = 400, height: int = 100) -> str:
     """Placeholder SVG when no data is available."""
     return f'''<svg width="100%" viewBox="0 0 {width} {height}"
          xmlns="http://www.w3.org/2000/svg">
-        <rect width="{width}" height="{height}" fill="{COLORS['surface2']}"
+        <rect width="{width}" height="{height}" fill="{_SURFACE2}"
               rx="12" opacity="0.5"/>
         <text x="{width / 2}" y="{height / 2 + 5}" text-anchor="middle"
-              fill="{COLORS['text_muted']}" font-size="14"
+              fill="{_TEXT_MUTED}" font-size="14"
               font-family="system-ui, sans-serif">No data available</text>
     </svg>'''
 
@@ -631,10 +874,29 @@ def _stat_card(
     metric_key: str = "",
 ) -> str:
     """Metric KPI card with optional sparkline and clickable navigation (#40)."""
+    card = _stat_card_cached(
+        title, value, subtitle, icon, color,
+        tuple(sparkline_values) if sparkline_values else None,
+        nav_page, metric_key)
+    return _fill_spark_uid(card) if sparkline_values else card
+
+
+# Headline cards recur across sections with identical arguments
+@lru_cache(maxsize=512)
+def _stat_card_cached(
+    title: str,
+    value: str,
+    subtitle: str,
+    icon: str,
+    color: str,
+    sparkline_values: Optional[Tuple[float, ...]],
+    nav_page: str,
+    metric_key: str,
+) -> str:
     spark_html = ""
     if sparkline_values and len(sparkline_values) >= 2:
         spark_html = f'''<div style="margin-top:6px">
-            {_svg_sparkline(sparkline_values, 130, 28, color)}
+            {_svg_sparkline_cached(sparkline_values, 130, 28, color, True)}
         </div>'''
 
     icon_html = ""
@@ -646,16 +908,16 @@ def _stat_card(
             border:1px solid {color}33">{icon}</div>'''
 
     nav_attr = f' data-nav-page="{nav_page}"' if nav_page else ""
-    nav_hint = f' title="Click to view {title}"' if nav_page else ""
+    nav_hint = f' title="Click to view {_esc(title)}"' if nav_page else ""
     metric_attr = f' data-metric="{metric_key}"' if metric_key else ""
 
     return f'''<div class="stat-card" style="--accent:{color}"{nav_attr}{nav_hint}{metric_attr}>
         {icon_html}
-        <div style="font-size:10px;color:{COLORS['text_muted']};text-transform:uppercase;
+        <div style="font-size:10px;color:{_TEXT_MUTED};text-transform:uppercase;
                     letter-spacing:0.05em;margin-bottom:1px">{_esc(title)}</div>
-        <div data-role="stat-value" style="font-size:17px;font-weight:800;color:{COLORS['text']};
+        <div data-role="stat-value" style="font-size:17px;font-weight:800;color:{_TEXT};
                     line-height:1.1;margin-bottom:1px">{_esc(value)}</div>
-        <div data-role="stat-subtitle" style="font-size:11px;color:{COLORS['text_muted']}">{_esc(subtitle)}</div>
+        <div data-role="stat-subtitle" style="font-size:11px;color:{_TEXT_MUTED}">{_esc(subtitle)}</div>
         {spark_html}
     </div>'''
 
@@ -668,11 +930,11 @@ def _data_table(
 ) -> str:
     """Sortable data table component."""
     if not rows:
-        return f'''<div style="text-align:center;padding:32px;color:{COLORS['text_muted']};
+        return f'''<div style="text-align:center;padding:32px;color:{_TEXT_MUTED};
                     font-size:14px">No data available</div>'''
 
     display_rows = rows[:max_rows]
-    tid = table_id or f"tbl_{abs(hash(str(headers))) % 100000}"
+    tid = table_id or f"tbl_{next(_uid_counter)}"
 
     header_cells = ''.join(
         f'<th onclick="sortTable(\'{tid}\', {i})" '
@@ -681,15 +943,19 @@ def _data_table(
         for i, h in enumerate(headers)
     )
 
-    body_rows = ""
-    for row in display_rows:
-        cells = ''.join(f'<td>{cell}</td>' for cell in row)
-        body_rows += f'<tr>{cells}</tr>\n'
+    # Cells arrive as ready-made HTML; a row matching the header width is
+    # filled into one precomputed template, ragged rows are joined cell by cell
+    row_tpl = "<tr>" + "<td>%s</td>" * len(headers) + "</tr>\n"
+    body_rows = ''.join(
+        row_tpl % tuple(row) if len(row) == len(headers)
+        else f"<tr>{''.join(f'<td>{cell}</td>' for cell in row)}</tr>\n"
+        for row in display_rows
+    )
 
     truncated = ""
     if len(rows) > max_rows:
         truncated = f'''<div style="text-align:center;padding:8px;font-size:12px;
-            color:{COLORS['text_muted']}">Showing {max_rows} of {len(rows)} rows</div>'''
+            color:{_TEXT_MUTED}">Showing {max_rows} of {len(rows)} rows</div>'''
 
     return f'''<div class="table-wrapper">
         <table id="{tid}" class="data-table">
@@ -711,15 +977,15 @@ def _progress_bar(
     pct = min((value / max_val) * 100, 100) if max_val else 0
     value_text = ""
     if show_values:
-        value_text = f'''<span style="font-weight:600;color:{COLORS['text']}">
+        value_text = f'''<span style="font-weight:600;color:{_TEXT}">
             {_fmt_number(value)} / {_fmt_number(max_val)}</span>'''
 
     return f'''<div style="margin-bottom:8px">
         <div style="display:flex;justify-content:space-between;margin-bottom:4px;font-size:13px">
-            <span style="color:{COLORS['text_muted']}">{_esc(label)}</span>
+            <span style="color:{_TEXT_MUTED}">{_esc(label)}</span>
             {value_text}
         </div>
-        <div style="height:10px;background:{COLORS['card_border']};border-radius:5px;overflow:hidden">
+        <div style="height:10px;background:{_CARD_BORDER};border-radius:5px;overflow:hidden">
             <div class="progress-fill" style="height:100%;width:{pct:.1f}%;
                 background:linear-gradient(90deg,{color},{color}cc);border-radius:5px"></div>
         </div>
@@ -737,6 +1003,107 @@ def _section_header(section_id: str, title: str, subtitle: str = "", icon: str =
         </div>'''
 
 
+# ---------------------------------------------------------------------------
+# Static section fragments
+# ---------------------------------------------------------------------------
+# Blocks whose markup depends only on the palette are built once at import.
+# The dynamic-* containers are filled client-side by the period filter.
+# Short literal tags ('<div class="glass-card">', '</div>') stay inline:
+# they are already shared code constants, so names for them gain nothing.
+
+_EXEC_TREND_CHARTS = '''<div style="display:grid;grid-template-columns:repeat(4,1fr);gap:8px;margin-top:8px">
+        <div class="glass-card" style="padding:10px 12px">
+            <div class="card-title" style="font-size:10px;margin-bottom:4px">Leads (6mo)</div>
+            <div id="dynamic-leads-barchart"></div>
+        </div>
+        <div class="glass-card" style="padding:10px 12px">
+            <div class="card-title" style="font-size:10px;margin-bottom:4px">Revenue (6mo)</div>
+            <div id="dynamic-revenue-barchart"></div>
+        </div>
+        <div class="glass-card" style="padding:10px 12px">
+            <div class="card-title" style="font-size:10px;margin-bottom:4px">Deals Created (6mo)</div>
+            <div id="dynamic-deals-barchart"></div>
+        </div>
+        <div class="glass-card" style="padding:10px 12px">
+            <div class="card-title" style="font-size:10px;margin-bottom:4px">Activity (6mo)</div>
+            <div id="dynamic-activity-barchart"></div>
+        </div>
+    </div>'''
+
+_ACTIVITY_BREAKDOWN_CARD = f'''<div class="glass-card">
+        <h3 class="card-title">Activity Breakdown <span style="font-size:11px;font-weight:400;color:{_TEXT_MUTED}">(filtered by period)</span></h3>
+        <div id="dynamic-activity-breakdown"></div>
+    </div>'''
+
+# (icon, colour) per lower-cased HubSpot activity type
+_ACTIVITY_TYPE_STYLES = {
+    "calls": ("\U0001F4DE", COLORS["accent"]),
+    "emails": ("\u2709\uFE0F", COLORS["accent2"]),
+    "meetings": ("\U0001F91D", COLORS["accent3"]),
+    "tasks": ("\u2705", COLORS["accent4"]),
+    "notes": ("\U0001F4DD", COLORS["accent5"]),
+}
+_ACTIVITY_TYPE_DEFAULT = ("\U0001F4CB", COLORS["info"])
+
+_MONDAY_FILTER_BAR = f'''<div class="glass-card" style="margin-top:8px;padding:12px 16px">
+        <div style="display:flex;flex-wrap:wrap;gap:10px;align-items:center">
+            <input type="text" id="monday-search" placeholder="Search projects, owners, boards..."
+                style="flex:1;min-width:200px;padding:8px 12px;border:1px solid {_CARD_BORDER};
+                border-radius:8px;background:{_BG};color:{_TEXT};font-size:13px;
+                outline:none" oninput="filterMonday()">
+            <select id="monday-filter-owner" onchange="filterMonday()"
+                style="padding:8px 12px;border:1px solid {_CARD_BORDER};border-radius:8px;
+                background:{_BG};color:{_TEXT};font-size:13px">
+                <option value="">All Owners</option>
+            </select>
+            <select id="monday-filter-stage" onchange="filterMonday()"
+                style="padding:8px 12px;border:1px solid {_CARD_BORDER};border-radius:8px;
+                background:{_BG};color:{_TEXT};font-size:13px">
+                <option value="">All Stages</option>
+            </select>
+            <label style="display:flex;align-items:center;gap:4px;font-size:12px;color:{_TEXT_MUTED};cursor:pointer">
+                <input type="checkbox" id="monday-hide-unassigned" onchange="filterMonday()"> Hide unassigned
+            </label>
+        </div>
+    </div>'''
+
+# Insights win/loss reason list: headers are fixed, rows take %-args
+_REASONS_WON_HEADER = f'<h4 style="font-size:11px;color:{COLORS["accent4"]};margin:6px 0 2px;text-transform:uppercase">Won</h4>'
+_REASONS_LOST_HEADER = f'<h4 style="font-size:11px;color:{COLORS["danger"]};margin:6px 0 2px;text-transform:uppercase">Lost</h4>'
+_REASON_COUNT_ROW_TPL = f'<div style="font-size:12px;padding:2px 0;color:{_TEXT_MUTED}">%s: <strong style="color:{_TEXT}">%s</strong></div>'
+_REASON_ROW_TPL = f'<div style="font-size:12px;padding:2px 0;color:{_TEXT_MUTED}">%s</div>'
+
+# Leaderboard rank labels by 0-based position: medals for the top three, then "#n"
+_RANK_LABELS = ("\U0001F947", "\U0001F948", "\U0001F949") + tuple(f"#{n}" for n in range(4, 257))
+
+# Repeated rows of the funnel and revenue target sections, compiled once
+# with the palette (including the 22-alpha border) baked in; rows fill only
+# their values.
+_FUNNEL_RATE_ROW_TPL = f'''<div style="display:flex;justify-content:space-between;padding:5px 0;border-bottom:1px solid {_CARD_BORDER}22;font-size:13px">
+                        <span style="color:{_TEXT_MUTED}">{{label}}</span>
+                        <span style="color:{{color}};font-weight:700">{{rate}}</span>
+                    </div>'''
+
+_TARGET_CHAIN_ITEM_TPL = f'''<div style="text-align:center;padding:8px">
+            <div style="font-size:10px;text-transform:uppercase;letter-spacing:0.04em;color:{_TEXT_MUTED};margin-bottom:4px">{{label}}</div>
+            <div style="font-size:20px;font-weight:800;color:{{color}}">{{required}}</div>
+            <div style="font-size:11px;color:{_TEXT_MUTED}">required</div>
+            <div style="font-size:14px;font-weight:700;color:{_TEXT};margin-top:4px">{{actual}}</div>
+            <div style="font-size:11px;color:{{gap_color}};font-weight:600">{{gap}} gap</div>
+        </div>'''
+
+_TARGET_GAP_ROW_TPL = f'''<div style="display:flex;justify-content:space-between;
+                        padding:4px 0;border-bottom:1px solid {_CARD_BORDER}22;font-size:12px">
+                        <span style="color:{_TEXT_MUTED}">{{label}}</span>
+                        <span style="color:{{color}};font-weight:600">{{value}}</span>
+                    </div>'''
+
+_TARGET_REQ_ROW_TPL = f'''<div style="display:flex;justify-content:space-between;padding:3px 0;font-size:12px;border-bottom:1px solid {_CARD_BORDER}22">
+                        <span style="color:{_TEXT_MUTED}">{{label}}</span>
+                        <span style="color:{_TEXT};font-weight:600">{{value}}</span>
+                    </div>'''
+
+
 # ---------------------------------------------------------------------------
 # Dashboard sections
 # ---------------------------------------------------------------------------
@@ -810,39 +1177,47 @@ def _build_anna_page(data: dict) -> str:
 
 def _build_executive_summary(data: dict) -> str:
     """Dashboard Overview — compact KPI strip + 4-pillar AI-driven snapshots."""
-    pipeline = _safe_get(data, "pipeline_metrics", default={})
-    activity = _safe_get(data, "activity_metrics", default={})
-    leads = _safe_get(data, "lead_metrics", default={})
-    contacts = _safe_get(data, "contact_metrics", default={})
-    counts = _safe_get(data, "record_counts", default={})
-    rev_eng = _safe_get(data, "reverse_engineering", default={})
-    insights = _safe_get(data, "insights", default={})
-    forecast = _safe_get(insights, "revenue_forecast", default={})
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
+    accent3 = COLORS["accent3"]
+    accent4 = COLORS["accent4"]
+    accent5 = COLORS["accent5"]
+    warning = COLORS["warning"]
+    pipeline = data.get("pipeline_metrics") or {}
+    activity = data.get("activity_metrics") or {}
+    leads = data.get("lead_metrics") or {}
+    contacts = data.get("contact_metrics") or {}
+    counts = data.get("record_counts") or {}
+    rev_eng = data.get("reverse_engineering") or {}
+    insights = data.get("insights") or {}
+    forecast = insights.get("revenue_forecast") or {}
     monday = data.get("monday", {})
     ma_data = monday.get("ma_metrics", {}) if monday else {}
 
-    html = _section_header("executive", "Dashboard",
-                           "Live business intelligence overview",
-                           "\U0001F4CA")
+    parts = [_section_header("executive", "Dashboard",
+                             "Live business intelligence overview",
+                             "\U0001F4CA")]
 
     # ── Compact KPI strip (all 8 in one row) ──
+    open_deals = pipeline.get("open_deals_count", 0)
     kpis = [
-        ("Pipeline", _fmt_currency(pipeline.get("total_pipeline_value", 0)), COLORS['accent']),
-        ("Weighted", _fmt_currency(pipeline.get("weighted_pipeline_value", 0)), COLORS['accent2']),
-        ("Win Rate", _fmt_pct(pipeline.get("win_rate", 0)), COLORS['accent4']),
-        ("Open Deals", _fmt_number(pipeline.get("open_deals_count", 0)), COLORS['accent3']),
+        ("Pipeline", _fmt_currency(pipeline.get("total_pipeline_value", 0)), accent),
+        ("Weighted", _fmt_currency(pipeline.get("weighted_pipeline_value", 0)), accent2),
+        ("Win Rate", _fmt_pct(pipeline.get("win_rate", 0)), accent4),
+        ("Open Deals", _fmt_number(open_deals), accent3),
         ("Avg Size", _fmt_currency(pipeline.get("avg_deal_size", 0)), COLORS['accent6']),
         ("Leads", _fmt_number(leads.get("total_leads", 0)), COLORS['info']),
-        ("Activities", _fmt_number(activity.get("total_activities", 0)), COLORS['accent5']),
-        ("30d Forecast", _fmt_currency(forecast.get("days_30", 0)), COLORS['warning']),
+        ("Activities", _fmt_number(activity.get("total_activities", 0)), accent5),
+        ("30d Forecast", _fmt_currency(forecast.get("days_30", 0)), warning),
     ]
-    kpi_html = ""
-    for label, val, color in kpis:
-        kpi_html += f'''<div class="exec-kpi">
+    kpi_html = "".join(
+        f'''<div class="exec-kpi">
             <div class="exec-kpi-val" style="color:{color}">{val}</div>
             <div class="exec-kpi-label">{label}</div>
         </div>'''
-    html += f'<div class="exec-kpi-strip">{kpi_html}</div>'
+        for label, val, color in kpis
+    )
+    parts.append(f'<div class="exec-kpi-strip">{kpi_html}</div>')
 
     # ── 4-Pillar Snapshots ──
     # Each pillar: icon, title, 3-4 bullet-point insights
@@ -857,13 +1232,13 @@ def _build_executive_summary(data: dict) -> str:
 
     # Build sales pillar points
     sales_points = []
-    sales_points.append(f'<strong>{_fmt_currency(pipeline.get("total_pipeline_value", 0))}</strong> total pipeline ({_fmt_number(pipeline.get("open_deals_count", 0))} open deals)')
+    sales_points.append(f'<strong>{_fmt_currency(pipeline.get("total_pipeline_value", 0))}</strong> total pipeline ({_fmt_number(open_deals)} open deals)')
     if won or lost:
         sales_points.append(f'<strong>{won}</strong> deals won vs <strong>{lost}</strong> lost &mdash; {_fmt_pct(pipeline.get("win_rate", 0))} win rate')
     if cycle_days:
         sales_points.append(f'Average sales cycle: <strong>{_fmt_number(cycle_days)} days</strong>')
     if stale_deals:
-        sales_points.append(f'<span style="color:{COLORS["warning"]}">&#9888; {len(stale_deals)} stale deals</span> sitting in stage &gt;30 days')
+        sales_points.append(f'<span style="color:{warning}">&#9888; {len(stale_deals)} stale deals</span> sitting in stage &gt;30 days')
     if top_rep:
         sales_points.append(f'Top pipeline holder: <strong>{_esc(top_rep)}</strong>')
 
@@ -891,11 +1266,11 @@ def _build_executive_summary(data: dict) -> str:
     stage_dist = ma_data.get("stage_distribution", {})
     ma_points.append(f'<strong>{active_ma}</strong> active projects out of {total_ma} total')
     if stage_dist:
-        top_stages = sorted(stage_dist.items(), key=lambda x: x[1], reverse=True)[:3]
+        top_stages = heapq.nlargest(3, stage_dist.items(), key=itemgetter(1))
         stage_str = ", ".join(f'{s}: {c}' for s, c in top_stages)
         ma_points.append(f'Top stages: {stage_str}')
     if stale_ma:
-        ma_points.append(f'<span style="color:{COLORS["warning"]}">&#9888; {len(stale_ma)} stale projects</span> need follow-up')
+        ma_points.append(f'<span style="color:{warning}">&#9888; {len(stale_ma)} stale projects</span> need follow-up')
     ic_data = monday.get("ic_metrics", {}) if monday else {}
     ic_pending = len([i for i in ic_data.get("items", []) if not i.get("decisions")])
     if ic_pending:
@@ -917,80 +1292,66 @@ def _build_executive_summary(data: dict) -> str:
     if ai_total:
         ops_points.append(f'<strong>{ai_total}</strong> items on AI roadmap')
     # Queue
-    queue_file_path = BASE_DIR / "data" / "processed" / "inbound_queue.json"
     critical_count = 0
-    if queue_file_path.exists():
-        try:
-            with open(queue_file_path, "r", encoding="utf-8") as qf:
-                q_data = json.load(qf)
+    try:
+        q_data = _load_processed("inbound_queue.json")
+        if q_data is not None:
             critical_count = q_data.get("priority_breakdown", q_data.get("summary", {})).get("critical", 0)
-        except Exception:
-            pass
+    except Exception:
+        pass
     if critical_count:
         ops_points.append(f'<span style="color:{COLORS["danger"]}">&#9888; {critical_count} critical</span> items in inbound queue')
 
     pillars = [
-        ("Sales & Pipeline", COLORS['accent'], "&#9733;", sales_points, "pipeline"),
-        ("Leads & Conversion", COLORS['accent2'], "&#10024;", leads_points, "leads"),
-        ("M&A", COLORS['accent3'], "&#128188;", ma_points, "monday-pipeline"),
-        ("Activity & Operations", COLORS['accent5'], "&#9889;", ops_points, "activities"),
+        ("Sales & Pipeline", accent, "&#9733;", sales_points, "pipeline"),
+        ("Leads & Conversion", accent2, "&#10024;", leads_points, "leads"),
+        ("M&A", accent3, "&#128188;", ma_points, "monday-pipeline"),
+        ("Activity & Operations", accent5, "&#9889;", ops_points, "activities"),
     ]
 
-    html += '<div class="exec-pillars">'
+    parts.append('<div class="exec-pillars">')
     for title, color, icon, points, nav in pillars:
         pts = "".join(f'<li>{p}</li>' for p in points[:5])
-        html += f'''<div class="exec-pillar" onclick="showPage('{nav}')" style="cursor:pointer">
+        parts.append(f'''<div class="exec-pillar" onclick="showPage('{nav}')" style="cursor:pointer">
             <div class="exec-pillar-header">
                 <span class="exec-pillar-icon" style="background:{color}15;color:{color}">{icon}</span>
                 <span class="exec-pillar-title">{title}</span>
                 <span class="exec-pillar-arrow" style="color:{color}">&#8594;</span>
             </div>
             <ul class="exec-pillar-points">{pts}</ul>
-        </div>'''
-    html += '</div>'
+        </div>''')
+    parts.append('</div>')
 
     # ── Compact trend charts ──
-    html += f'''<div style="display:grid;grid-template-columns:repeat(4,1fr);gap:8px;margin-top:8px">
-        <div class="glass-card" style="padding:10px 12px">
-            <div class="card-title" style="font-size:10px;margin-bottom:4px">Leads (6mo)</div>
-            <div id="dynamic-leads-barchart"></div>
-        </div>
-        <div class="glass-card" style="padding:10px 12px">
-            <div class="card-title" style="font-size:10px;margin-bottom:4px">Revenue (6mo)</div>
-            <div id="dynamic-revenue-barchart"></div>
-        </div>
-        <div class="glass-card" style="padding:10px 12px">
-            <div class="card-title" style="font-size:10px;margin-bottom:4px">Deals Created (6mo)</div>
-            <div id="dynamic-deals-barchart"></div>
-        </div>
-        <div class="glass-card" style="padding:10px 12px">
-            <div class="card-title" style="font-size:10px;margin-bottom:4px">Activity (6mo)</div>
-            <div id="dynamic-activity-barchart"></div>
-        </div>
-    </div>'''
+    parts.append(_EXEC_TREND_CHARTS)
 
     # ── Revenue target (compact) ──
-    rev_target = _safe_get(rev_eng, "revenue_target", default={})
+    rev_target = rev_eng.get("revenue_target") or {}
     monthly_target = rev_target.get("monthly", 100000)
     weighted = pipeline.get("weighted_pipeline_value", 0)
-    html += f'''<div class="glass-card" style="margin-top:8px;padding:10px 14px">
+    parts.append(f'''<div class="glass-card" style="margin-top:8px;padding:10px 14px">
         <div style="font-size:10px;color:{COLORS['text_muted']};text-transform:uppercase;
             letter-spacing:0.04em;margin-bottom:4px">Revenue Target Progress</div>
-        {_progress_bar(weighted, monthly_target, COLORS['accent4'],
+        {_progress_bar(weighted, monthly_target, accent4,
                        f"Weighted Pipeline vs Monthly Target ({_fmt_currency(monthly_target)})")}
-    </div>'''
+    </div>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_leads_section(data: dict) -> str:
     """Section 2: Leads & Conversion — department grouping, source analysis, marketing funnel."""
-    leads = _safe_get(data, "lead_metrics", default={})
-    pipeline = _safe_get(data, "pipeline_metrics", default={})
-    html = _section_header("leads", "Leads & Conversion",
-                           "Lead sources, department breakdown, and marketing funnel",
-                           "\U0001F4E5")
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
+    accent3 = COLORS["accent3"]
+    accent4 = COLORS["accent4"]
+    accent5 = COLORS["accent5"]
+    leads = data.get("lead_metrics") or {}
+    pipeline = data.get("pipeline_metrics") or {}
+    parts = [_section_header("leads", "Leads & Conversion",
+                             "Lead sources, department breakdown, and marketing funnel",
+                             "\U0001F4E5")]
 
     DEPT_MAP = {
         "james carberry": "Supply Chain", "rose galbally": "Supply Chain",
@@ -1006,31 +1367,31 @@ def _build_leads_section(data: dict) -> str:
     mql = leads.get("mql_count", 0)
     sql = leads.get("sql_count", 0)
     response_h = leads.get("avg_lead_response_hours", 0)
-    html += '<div class="kpi-grid" style="grid-template-columns:repeat(5,1fr)">'
-    html += _stat_card("Total Leads", _fmt_number(total_leads),
-                       f"New 30d: {_fmt_number(new_30)}", "\U0001F4CA", COLORS['accent'])
-    html += _stat_card("MQLs", _fmt_number(mql),
-                       f"{_fmt_pct(leads.get('lead_to_mql_rate', 0))} conv.",
-                       "\U0001F31F", COLORS['accent2'])
-    html += _stat_card("SQLs", _fmt_number(sql), "", "\U0001F525", COLORS['accent4'])
-    html += _stat_card("Open Deals", _fmt_number(pipeline.get("open_deals_count", 0)),
-                       "", "\U0001F4BC", COLORS['accent3'])
-    html += _stat_card("Avg Response", f"{int(round(response_h))}h" if response_h else "N/A",
-                       "", "\u23F1\uFE0F", COLORS['accent5'])
-    html += '</div>'
+    parts.append('<div class="kpi-grid" style="grid-template-columns:repeat(5,1fr)">')
+    parts.append(_stat_card("Total Leads", _fmt_number(total_leads),
+                            f"New 30d: {_fmt_number(new_30)}", "\U0001F4CA", accent))
+    parts.append(_stat_card("MQLs", _fmt_number(mql),
+                            f"{_fmt_pct(leads.get('lead_to_mql_rate', 0))} conv.",
+                            "\U0001F31F", accent2))
+    parts.append(_stat_card("SQLs", _fmt_number(sql), "", "\U0001F525", accent4))
+    parts.append(_stat_card("Open Deals", _fmt_number(pipeline.get("open_deals_count", 0)),
+                            "", "\U0001F4BC", accent3))
+    parts.append(_stat_card("Avg Response", f"{int(round(response_h))}h" if response_h else "N/A",
+                            "", "\u23F1\uFE0F", accent5))
+    parts.append('</div>')
 
     # ── Source breakdown + leads trend (2-col) ──
     sources = leads.get("leads_by_source", {})
     leads_over_time = leads.get("leads_over_time", {})
-    html += '<div class="grid-2" style="margin-top:8px">'
+    parts.append('<div class="grid-2" style="margin-top:8px">')
     if sources:
-        source_data = sorted(sources.items(), key=lambda x: x[1], reverse=True)[:8]
-        html += f'''<div class="glass-card">
+        source_data = heapq.nlargest(8, sources.items(), key=itemgetter(1))
+        parts.append(f'''<div class="glass-card">
             <h3 class="card-title">Leads by Source</h3>
             {_svg_bar_chart(source_data, 450, max(120, len(source_data) * 26))}
-        </div>'''
+        </div>''')
     else:
-        html += '<div></div>'
+        parts.append('<div></div>')
     if leads_over_time:
         if isinstance(leads_over_time, dict):
             trend_data = [(m, c) for m, c in sorted(leads_over_time.items())]
@@ -1039,15 +1400,15 @@ def _build_leads_section(data: dict) -> str:
         else:
             trend_data = []
         if trend_data:
-            html += f'''<div class="glass-card">
+            parts.append(f'''<div class="glass-card">
                 <h3 class="card-title">Lead Trend (Monthly)</h3>
-                {_svg_line_chart(trend_data[-18:], 450, 140, COLORS['accent'])}
-            </div>'''
+                {_svg_line_chart(trend_data[-18:], 450, 140, accent)}
+            </div>''')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
     else:
-        html += '<div></div>'
-    html += '</div>'
+        parts.append('<div></div>')
+    parts.append('</div>')
 
     # ── Lead status + source effectiveness (2-col) ──
     status_dist = leads.get("lead_status_distribution", {})
@@ -1055,41 +1416,41 @@ def _build_leads_section(data: dict) -> str:
     has_status = bool(status_dist)
     has_eff = bool(effectiveness)
     if has_status or has_eff:
-        html += '<div class="grid-2" style="margin-top:8px">'
+        parts.append('<div class="grid-2" style="margin-top:8px">')
         if has_status:
             named_status = {k: v for k, v in status_dist.items() if not k.strip().isdigit()}
             if named_status:
-                html += f'''<div class="glass-card">
-                    <h3 class="card-title">Lead Status</h3>'''
+                parts.append(f'''<div class="glass-card">
+                    <h3 class="card-title">Lead Status</h3>''')
                 max_s = max(named_status.values()) if named_status else 1
-                for status, count in sorted(named_status.items(), key=lambda x: x[1], reverse=True)[:6]:
-                    html += _svg_horizontal_bar(status, count, max_s, COLORS['accent2'])
-                html += '</div>'
+                for status, count in heapq.nlargest(6, named_status.items(), key=itemgetter(1)):
+                    parts.append(_svg_horizontal_bar(status, count, max_s, accent2))
+                parts.append('</div>')
             else:
-                html += '<div></div>'
+                parts.append('<div></div>')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
         if has_eff:
             eff_rows = []
             if isinstance(effectiveness, dict):
                 for src, info in sorted(effectiveness.items(), key=lambda x: x[1].get("total", 0) if isinstance(x[1], dict) else 0, reverse=True):
                     if isinstance(info, dict):
-                        eff_rows.append([_esc(src), _fmt_number(info.get("total", 0)),
+                        eff_rows.append([_esc_str(src), _fmt_number(info.get("total", 0)),
                                          _fmt_number(info.get("mqls", 0)), _fmt_pct(info.get("conversion_rate", 0))])
             elif isinstance(effectiveness, list):
                 for item in effectiveness:
                     eff_rows.append([_esc(item.get("source", "")), _fmt_number(item.get("lead_count", item.get("total", 0))),
                                      _fmt_number(item.get("mql_count", item.get("mqls", 0))), _fmt_pct(item.get("conversion_rate", 0))])
             if eff_rows:
-                html += f'''<div class="glass-card">
+                parts.append(f'''<div class="glass-card">
                     <h3 class="card-title">Source Effectiveness</h3>
                     {_data_table(["Source", "Leads", "MQLs", "Conv."], eff_rows, "source_eff")}
-                </div>'''
+                </div>''')
             else:
-                html += '<div></div>'
+                parts.append('<div></div>')
         else:
-            html += '<div></div>'
-        html += '</div>'
+            parts.append('<div></div>')
+        parts.append('</div>')
 
     # ── Department Pipeline Summary ──
     by_owner = pipeline.get("pipeline_by_owner", {})
@@ -1108,44 +1469,51 @@ def _build_leads_section(data: dict) -> str:
             dept_data[dept]["value"] += info.get("total_value", 0)
             dept_data[dept]["reps"].append(name.split()[0])
         if dept_data:
-            dept_colors = {"Supply Chain": COLORS['accent'], "Delivery": COLORS['accent2'],
-                           "CDD": COLORS['accent3'], "Management": COLORS['accent5'],
-                           "Operations": COLORS['accent4'], "Other": COLORS['info']}
-            html += f'''<div class="glass-card" style="margin-top:8px">
+            dept_colors = {"Supply Chain": accent, "Delivery": accent2,
+                           "CDD": accent3, "Management": accent5,
+                           "Operations": accent4, "Other": COLORS['info']}
+            parts.append(f'''<div class="glass-card" style="margin-top:8px">
                 <h3 class="card-title">Pipeline by Department</h3>
-                <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(140px,1fr));gap:8px">'''
+                <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(140px,1fr));gap:8px">''')
             for dept, dinfo in sorted(dept_data.items(), key=lambda x: x[1]["value"], reverse=True):
                 dc = dept_colors.get(dept, COLORS['info'])
                 reps_str = ", ".join(dinfo["reps"])
-                html += f'''<div style="background:{dc}11;border:1px solid {dc}33;border-radius:8px;padding:10px 12px">
-                    <div style="font-size:10px;text-transform:uppercase;letter-spacing:0.04em;color:{dc};font-weight:700;margin-bottom:4px">{_esc(dept)}</div>
+                parts.append(f'''<div style="background:{dc}11;border:1px solid {dc}33;border-radius:8px;padding:10px 12px">
+                    <div style="font-size:10px;text-transform:uppercase;letter-spacing:0.04em;color:{dc};font-weight:700;margin-bottom:4px">{_esc_str(dept)}</div>
                     <div style="font-size:18px;font-weight:800;color:{COLORS['text']}">{_fmt_currency(dinfo["value"])}</div>
-                    <div style="font-size:11px;color:{COLORS['text_muted']}">{dinfo["deals"]} deals &middot; {_esc(reps_str)}</div>
-                </div>'''
-            html += '</div></div>'
+                    <div style="font-size:11px;color:{COLORS['text_muted']}">{dinfo["deals"]} deals &middot; {_esc_str(reps_str)}</div>
+                </div>''')
+            parts.append('</div></div>')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_funnel_section(data: dict) -> str:
     """Section 3: Deal Stage Flow — funnel based on actual deal stages."""
-    leads = _safe_get(data, "lead_metrics", default={})
-    pipeline = _safe_get(data, "pipeline_metrics", default={})
+    text_muted = COLORS["text_muted"]
+    card_border = COLORS["card_border"]
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
+    accent3 = COLORS["accent3"]
+    accent4 = COLORS["accent4"]
+    accent5 = COLORS["accent5"]
+    leads = data.get("lead_metrics") or {}
+    pipeline = data.get("pipeline_metrics") or {}
 
     # No separate section header — merged into leads page
-    html = ''
+    parts = ['']
 
     # ── Deal stage funnel (from real data) ──
     deals_by_stage = pipeline.get("deals_by_stage", {})
     funnel_flow = [
-        ("Inbound Leads", ["Inbound Lead"], COLORS['accent']),
-        ("First Meetings", ["First Meeting Booked"], COLORS['accent2']),
-        ("Second Meetings", ["Second Meeting Booked"], COLORS['accent3']),
+        ("Inbound Leads", ["Inbound Lead"], accent),
+        ("First Meetings", ["First Meeting Booked"], accent2),
+        ("Second Meetings", ["Second Meeting Booked"], accent3),
         ("Engaged", ["Engaged"], COLORS['info']),
-        ("Proposals", ["Proposal Shared"], COLORS['accent5']),
+        ("Proposals", ["Proposal Shared"], accent5),
         ("Decision Maker", ["Decision Maker Bought-In"], COLORS['warning']),
-        ("Contracts", ["Contract Sent"], COLORS['accent4']),
+        ("Contracts", ["Contract Sent"], accent4),
         ("Won", ["Closed Won"], COLORS['success']),
     ]
 
@@ -1158,82 +1526,88 @@ def _build_funnel_section(data: dict) -> str:
                 active_stages.append((label, count, value, color))
         if active_stages:
             max_count = max(s[1] for s in active_stages) or 1
-            html += f'''<div class="glass-card" style="margin-top:8px">
+            parts.append(f'''<div class="glass-card" style="margin-top:8px">
                 <h3 class="card-title">Deal Stage Flow</h3>
-                <div style="max-width:700px;margin:0 auto">'''
+                <div style="max-width:700px;margin:0 auto">''')
             for label, count, value, color in active_stages:
                 pct_w = max(15, (count / max_count) * 100)
-                html += f'''<div style="display:flex;align-items:center;gap:10px;margin-bottom:6px">
-                    <div style="width:120px;text-align:right;font-size:12px;color:{COLORS['text_muted']};flex-shrink:0">{_esc(label)}</div>
-                    <div style="flex:1;height:28px;background:{COLORS['card_border']};border-radius:6px;overflow:hidden;position:relative">
+                parts.append(f'''<div style="display:flex;align-items:center;gap:10px;margin-bottom:6px">
+                    <div style="width:120px;text-align:right;font-size:12px;color:{text_muted};flex-shrink:0">{_esc_str(label)}</div>
+                    <div style="flex:1;height:28px;background:{card_border};border-radius:6px;overflow:hidden;position:relative">
                         <div style="height:100%;width:{pct_w:.0f}%;background:linear-gradient(90deg,{color},{color}88);border-radius:6px"></div>
                         <span style="position:absolute;right:8px;top:50%;transform:translateY(-50%);font-size:11px;font-weight:600;color:{COLORS['text']}">{count} deals &middot; {_fmt_currency(value)}</span>
                     </div>
-                </div>'''
-            html += '</div></div>'
+                </div>''')
+            parts.append('</div></div>')
 
     # ── Conversion rates + time in stage (2-col) ──
     conversion_rates = leads.get("conversion_rates", {})
     time_in_stage = leads.get("time_in_stage", {})
     if conversion_rates or time_in_stage:
-        html += '<div class="grid-2" style="margin-top:8px">'
+        parts.append('<div class="grid-2" style="margin-top:8px">')
         if conversion_rates:
-            html += f'''<div class="glass-card">
-                <h3 class="card-title">Stage Conversion Rates</h3>'''
+            parts.append(f'''<div class="glass-card">
+                <h3 class="card-title">Stage Conversion Rates</h3>''')
             rate_items = [
-                ("lead_to_mql", "Lead \u2192 MQL", COLORS['accent']),
-                ("mql_to_sql", "MQL \u2192 SQL", COLORS['accent2']),
-                ("sql_to_opp", "SQL \u2192 Opp", COLORS['accent3']),
-                ("opp_to_won", "Opp \u2192 Won", COLORS['accent4']),
-                ("lead_to_customer", "Lead \u2192 Customer", COLORS['accent5']),
+                ("lead_to_mql", "Lead \u2192 MQL", accent),
+                ("mql_to_sql", "MQL \u2192 SQL", accent2),
+                ("sql_to_opp", "SQL \u2192 Opp", accent3),
+                ("opp_to_won", "Opp \u2192 Won", accent4),
+                ("lead_to_customer", "Lead \u2192 Customer", accent5),
             ]
             for key, label, color in rate_items:
                 val = conversion_rates.get(key)
                 if val is not None:
-                    html += f'''<div style="display:flex;justify-content:space-between;padding:5px 0;border-bottom:1px solid {COLORS['card_border']}22;font-size:13px">
-                        <span style="color:{COLORS['text_muted']}">{label}</span>
-                        <span style="color:{color};font-weight:700">{_fmt_pct(val)}</span>
-                    </div>'''
-            html += '</div>'
+                    parts.append(_FUNNEL_RATE_ROW_TPL.format(
+                        label=label, color=color, rate=_fmt_pct(val)))
+            parts.append('</div>')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
         if time_in_stage:
-            safe_vals = [v for v in time_in_stage.values() if v is not None and v > 0]
-            if safe_vals:
-                max_days = max(safe_vals)
-                html += f'''<div class="glass-card">
-                    <h3 class="card-title">Avg Time in Stage (days)</h3>'''
-                for stage, days in sorted(time_in_stage.items(), key=lambda x: (x[1] or 0), reverse=True):
-                    if days is not None and days > 0:
-                        html += _svg_horizontal_bar(stage, int(round(days)), int(round(max_days)), COLORS['accent3'], show_pct=False)
-                html += '</div>'
+            # Drop null and zero stages once so the sort key is a plain itemgetter
+            stage_days = [(k, v) for k, v in time_in_stage.items() if v is not None and v > 0]
+            if stage_days:
+                stage_days.sort(key=itemgetter(1), reverse=True)
+                max_days = int(round(stage_days[0][1]))
+                parts.append(f'''<div class="glass-card">
+                    <h3 class="card-title">Avg Time in Stage (days)</h3>''')
+                for stage, days in stage_days:
+                    parts.append(_svg_horizontal_bar(stage, int(round(days)), max_days, accent3, show_pct=False))
+                parts.append('</div>')
             else:
-                html += '<div></div>'
+                parts.append('<div></div>')
         else:
-            html += '<div></div>'
-        html += '</div>'
+            parts.append('<div></div>')
+        parts.append('</div>')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_target_section(data: dict) -> str:
     """Section 4: Targets & Reverse Engineering — volume funnel, gap analysis, requirements."""
-    rev_eng = _safe_get(data, "reverse_engineering", default={})
-    pipeline = _safe_get(data, "pipeline_metrics", default={})
-    leads = _safe_get(data, "lead_metrics", default={})
+    text_muted = COLORS["text_muted"]
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
+    accent3 = COLORS["accent3"]
+    accent4 = COLORS["accent4"]
+    success = COLORS["success"]
+    danger = COLORS["danger"]
+    rev_eng = data.get("reverse_engineering") or {}
+    pipeline = data.get("pipeline_metrics") or {}
+    leads = data.get("lead_metrics") or {}
 
     if not rev_eng:
-        html = _section_header("targets", "Targets & Reverse Engineering",
-                               "Revenue targets and required volumes", "\U0001F4C8")
-        html += f'''<div class="glass-card"><p style="color:{COLORS['text_muted']};
-            text-align:center;padding:32px">No reverse engineering data available</p></div>'''
-        html += '</section>'
-        return html
+        parts = [_section_header("targets", "Targets & Reverse Engineering",
+                                 "Revenue targets and required volumes", "\U0001F4C8")]
+        parts.append(f'''<div class="glass-card"><p style="color:{text_muted};
+            text-align:center;padding:32px">No reverse engineering data available</p></div>''')
+        parts.append('</section>')
+        return ''.join(parts)
 
-    html = _section_header("targets", "Targets & Reverse Engineering",
-                           "Revenue targets, required volumes, and gap analysis",
-                           "\U0001F4C8")
+    parts = [_section_header("targets", "Targets & Reverse Engineering",
+                             "Revenue targets, required volumes, and gap analysis",
+                             "\U0001F4C8")]
 
     # ── Revenue targets + current actuals (5 in one row) ──
     rev_target = rev_eng.get("revenue_target", {})
@@ -1242,44 +1616,44 @@ def _build_target_section(data: dict) -> str:
     if isinstance(deals_by_stage, dict):
         cw = deals_by_stage.get("Closed Won", {})
         won_value = cw.get("total_value", 0) if isinstance(cw, dict) else 0
-    html += '<div class="kpi-grid" style="grid-template-columns:repeat(5,1fr)">'
-    html += _stat_card("Monthly Target", _fmt_currency(rev_target.get("monthly", 0)),
-                       "", "\U0001F4B7", COLORS['accent'])
-    html += _stat_card("Quarterly Target", _fmt_currency(rev_target.get("quarterly", 0)),
-                       "", "\U0001F4C5", COLORS['accent2'])
-    html += _stat_card("Annual Target", _fmt_currency(rev_target.get("annual", 0)),
-                       "", "\U0001F3C6", COLORS['accent4'])
-    html += _stat_card("Won to Date", _fmt_currency(won_value),
-                       f"{pipeline.get('won_deals_count', 0)} deals", "\u2705", COLORS['success'])
-    html += _stat_card("Pipeline", _fmt_currency(pipeline.get("total_pipeline_value", 0)),
-                       f"{pipeline.get('open_deals_count', 0)} open", "\U0001F4CA", COLORS['accent3'])
-    html += '</div>'
+    won_count = pipeline.get("won_deals_count", 0)
+    open_count = pipeline.get("open_deals_count", 0)
+    parts.append('<div class="kpi-grid" style="grid-template-columns:repeat(5,1fr)">')
+    parts.append(_stat_card("Monthly Target", _fmt_currency(rev_target.get("monthly", 0)),
+                            "", "\U0001F4B7", accent))
+    parts.append(_stat_card("Quarterly Target", _fmt_currency(rev_target.get("quarterly", 0)),
+                            "", "\U0001F4C5", accent2))
+    parts.append(_stat_card("Annual Target", _fmt_currency(rev_target.get("annual", 0)),
+                            "", "\U0001F3C6", accent4))
+    parts.append(_stat_card("Won to Date", _fmt_currency(won_value),
+                            f"{won_count} deals", "\u2705", success))
+    parts.append(_stat_card("Pipeline", _fmt_currency(pipeline.get("total_pipeline_value", 0)),
+                            f"{open_count} open", "\U0001F4CA", accent3))
+    parts.append('</div>')
 
     # ── Required Volume Funnel (visual flow) ──
+    opp_total = open_count + won_count + pipeline.get("lost_deals_count", 0)
     chain_items = [
-        ("Leads", rev_eng.get("required_leads", 0), leads.get("total_leads", 0), COLORS['accent']),
-        ("MQLs", rev_eng.get("required_mqls", 0), leads.get("mql_count", 0), COLORS['accent2']),
-        ("SQLs", rev_eng.get("required_sqls", 0), leads.get("sql_count", 0), COLORS['accent3']),
-        ("Opps", rev_eng.get("required_opps", 0), pipeline.get("open_deals_count", 0) + pipeline.get("won_deals_count", 0) + pipeline.get("lost_deals_count", 0), COLORS['accent5']),
-        ("Deals", rev_eng.get("required_deals", 0), pipeline.get("won_deals_count", 0), COLORS['accent4']),
+        ("Leads", rev_eng.get("required_leads", 0), leads.get("total_leads", 0), accent),
+        ("MQLs", rev_eng.get("required_mqls", 0), leads.get("mql_count", 0), accent2),
+        ("SQLs", rev_eng.get("required_sqls", 0), leads.get("sql_count", 0), accent3),
+        ("Opps", rev_eng.get("required_opps", 0), opp_total, COLORS['accent5']),
+        ("Deals", rev_eng.get("required_deals", 0), won_count, accent4),
     ]
-    html += f'''<div class="glass-card" style="margin-top:8px">
+    parts.append(f'''<div class="glass-card" style="margin-top:8px">
         <h3 class="card-title">Required vs Actual (Monthly)</h3>
-        <div style="display:grid;grid-template-columns:repeat(5,1fr);gap:8px">'''
+        <div style="display:grid;grid-template-columns:repeat(5,1fr);gap:8px">''')
     for label, required, actual, color in chain_items:
         req_int = int(round(required)) if required else 0
         act_int = int(round(actual)) if actual else 0
         gap_val = act_int - req_int
-        gap_color = COLORS['success'] if gap_val >= 0 else COLORS['danger']
+        gap_color = success if gap_val >= 0 else danger
         gap_prefix = "+" if gap_val > 0 else ""
-        html += f'''<div style="text-align:center;padding:8px">
-            <div style="font-size:10px;text-transform:uppercase;letter-spacing:0.04em;color:{COLORS['text_muted']};margin-bottom:4px">{_esc(label)}</div>
-            <div style="font-size:20px;font-weight:800;color:{color}">{_fmt_number(req_int)}</div>
-            <div style="font-size:11px;color:{COLORS['text_muted']}">required</div>
-            <div style="font-size:14px;font-weight:700;color:{COLORS['text']};margin-top:4px">{_fmt_number(act_int)}</div>
-            <div style="font-size:11px;color:{gap_color};font-weight:600">{gap_prefix}{_fmt_number(gap_val)} gap</div>
-        </div>'''
-    html += '</div></div>'
+        parts.append(_TARGET_CHAIN_ITEM_TPL.format(
+            label=_esc_str(label), color=color, required=_fmt_number(req_int),
+            actual=_fmt_number(act_int), gap_color=gap_color,
+            gap=gap_prefix + _fmt_number(gap_val)))
+    parts.append('</div></div>')
 
     # ── Gap analysis + Requirements + What-if (3-col) ──
     gap = rev_eng.get("gap_analysis", {})
@@ -1288,44 +1662,37 @@ def _build_target_section(data: dict) -> str:
     scenarios = rev_eng.get("what_if_scenarios", [])
 
     if gap or daily or weekly or scenarios:
-        html += '<div class="grid-3" style="margin-top:8px">'
+        parts.append('<div class="grid-3" style="margin-top:8px">')
         if gap:
-            html += f'''<div class="glass-card">
-                <h3 class="card-title">Gap Analysis</h3>'''
+            parts.append(f'''<div class="glass-card">
+                <h3 class="card-title">Gap Analysis</h3>''')
             for key, val in gap.items():
                 label = key.replace("_", " ").title()
                 if isinstance(val, (int, float)):
-                    gcolor = COLORS['success'] if val >= 0 else COLORS['danger']
+                    gcolor = success if val >= 0 else danger
                     display = _fmt_number(int(round(val))) if abs(val) < 1000 else _fmt_currency(val)
                     prefix = "+" if val > 0 else ""
-                    html += f'''<div style="display:flex;justify-content:space-between;
-                        padding:4px 0;border-bottom:1px solid {COLORS['card_border']}22;font-size:12px">
-                        <span style="color:{COLORS['text_muted']}">{_esc(label)}</span>
-                        <span style="color:{gcolor};font-weight:600">{prefix}{display}</span>
-                    </div>'''
-            html += '</div>'
+                    parts.append(_TARGET_GAP_ROW_TPL.format(
+                        label=_esc_str(label), color=gcolor, value=prefix + display))
+            parts.append('</div>')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
         if daily or weekly:
-            html += f'''<div class="glass-card">
-                <h3 class="card-title">Daily / Weekly Requirements</h3>'''
+            parts.append(f'''<div class="glass-card">
+                <h3 class="card-title">Daily / Weekly Requirements</h3>''')
             if daily:
                 for key, val in list(daily.items())[:4]:
                     label = key.replace("_", " ").title()
-                    html += f'''<div style="display:flex;justify-content:space-between;padding:3px 0;font-size:12px;border-bottom:1px solid {COLORS['card_border']}22">
-                        <span style="color:{COLORS['text_muted']}">Daily {_esc(label)}</span>
-                        <span style="color:{COLORS['text']};font-weight:600">{_fmt_number(val)}</span>
-                    </div>'''
+                    parts.append(_TARGET_REQ_ROW_TPL.format(
+                        label="Daily " + _esc_str(label), value=_fmt_number(val)))
             if weekly:
                 for key, val in list(weekly.items())[:4]:
                     label = key.replace("_", " ").title()
-                    html += f'''<div style="display:flex;justify-content:space-between;padding:3px 0;font-size:12px;border-bottom:1px solid {COLORS['card_border']}22">
-                        <span style="color:{COLORS['text_muted']}">Weekly {_esc(label)}</span>
-                        <span style="color:{COLORS['text']};font-weight:600">{_fmt_number(val)}</span>
-                    </div>'''
-            html += '</div>'
+                    parts.append(_TARGET_REQ_ROW_TPL.format(
+                        label="Weekly " + _esc_str(label), value=_fmt_number(val)))
+            parts.append('</div>')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
         if scenarios:
             rows = []
             for s in scenarios:
@@ -1340,26 +1707,28 @@ def _build_target_section(data: dict) -> str:
                     _fmt_number(int(round(req_leads))) if req_leads else "0",
                     _fmt_number(int(round(saved))) if saved else "0",
                 ])
-            html += f'''<div class="glass-card">
+            parts.append(f'''<div class="glass-card">
                 <h3 class="card-title">What-If Scenarios</h3>
-                <p style="font-size:11px;color:{COLORS['text_muted']};margin-bottom:6px">
+                <p style="font-size:11px;color:{text_muted};margin-bottom:6px">
                     Lead-to-MQL improvements</p>
                 {_data_table(["Imp.", "New Rate", "Leads", "Saved"], rows, "whatif")}
-            </div>'''
+            </div>''')
         else:
-            html += '<div></div>'
-        html += '</div>'
+            parts.append('<div></div>')
+        parts.append('</div>')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_pipeline_section(data: dict) -> str:
     """Section 5: Pipeline View."""
-    pipeline = _safe_get(data, "pipeline_metrics", default={})
-    html = _section_header("pipeline", "Pipeline View",
-                           "Deal stages, rep performance, and velocity",
-                           "\U0001F4B0")
+    accent2 = COLORS["accent2"]
+    warning = COLORS["warning"]
+    pipeline = data.get("pipeline_metrics") or {}
+    parts = [_section_header("pipeline", "Pipeline View",
+                             "Deal stages, rep performance, and velocity",
+                             "\U0001F4B0")]
 
     # --- KPIs (5 cards: Total Pipeline, Coverage, Avg Sales Cycle, Win Rate, Velocity) ---
     velocity_raw = pipeline.get("pipeline_velocity", 0)
@@ -1371,59 +1740,60 @@ def _build_pipeline_section(data: dict) -> str:
     except (ValueError, TypeError):
         avg_cycle_int = 0
 
-    html += f'<div style="display:grid;grid-template-columns:repeat(5,1fr);gap:16px;margin-bottom:16px">'
-    html += _stat_card("Total Pipeline", _fmt_currency(pipeline.get("total_pipeline_value", 0)),
-                       f"Weighted: {_fmt_currency(pipeline.get('weighted_pipeline_value', 0))}",
-                       "\U0001F4B0", COLORS['accent'])
-    html += _stat_card("Pipeline Coverage", f"{_fmt_number(pipeline.get('pipeline_coverage', 0))}x",
-                       "vs revenue target", "\U0001F6E1", COLORS['accent2'])
-    html += _stat_card("Avg Sales Cycle", f"{avg_cycle_int}d",
-                       f"Avg deal: {_fmt_currency(pipeline.get('avg_deal_size', 0))}",
-                       "\u23F1", COLORS['accent3'])
-    html += _stat_card("Win Rate", _fmt_pct(pipeline.get("win_rate", 0)),
-                       f"Won {pipeline.get('won_deals_count', 0)} | Lost {pipeline.get('lost_deals_count', 0)}",
-                       "\U0001F3AF", COLORS['accent4'])
-    html += _stat_card("Pipeline Velocity", _fmt_currency(velocity_val),
-                       "value per day", "\U0001F680", COLORS['accent5'])
-    html += '</div>'
+    parts.append(f'<div style="display:grid;grid-template-columns:repeat(5,1fr);gap:16px;margin-bottom:16px">')
+    parts.append(_stat_card("Total Pipeline", _fmt_currency(pipeline.get("total_pipeline_value", 0)),
+                            f"Weighted: {_fmt_currency(pipeline.get('weighted_pipeline_value', 0))}",
+                            "\U0001F4B0", COLORS['accent']))
+    parts.append(_stat_card("Pipeline Coverage", f"{_fmt_number(pipeline.get('pipeline_coverage', 0))}x",
+                            "vs revenue target", "\U0001F6E1", accent2))
+    parts.append(_stat_card("Avg Sales Cycle", f"{avg_cycle_int}d",
+                            f"Avg deal: {_fmt_currency(pipeline.get('avg_deal_size', 0))}",
+                            "\u23F1", COLORS['accent3']))
+    parts.append(_stat_card("Win Rate", _fmt_pct(pipeline.get("win_rate", 0)),
+                            f"Won {pipeline.get('won_deals_count', 0)} | Lost {pipeline.get('lost_deals_count', 0)}",
+                            "\U0001F3AF", COLORS['accent4']))
+    parts.append(_stat_card("Pipeline Velocity", _fmt_currency(velocity_val),
+                            "value per day", "\U0001F680", COLORS['accent5']))
+    parts.append('</div>')
 
     # --- Deals by Stage (2-col: table left, bars right) ---
     deals_by_stage = pipeline.get("deals_by_stage", {})
     if isinstance(deals_by_stage, dict) and deals_by_stage:
+        # One pass builds the table rows and tracks the bar scale; stages
+        # with no deals are dropped as they are read.
         stage_rows = []
+        table_rows = []
+        max_stage_val = 0
         for stage_name, info in sorted(deals_by_stage.items(),
                                         key=lambda x: x[1].get("total_value", 0) if isinstance(x[1], dict) else 0,
                                         reverse=True):
-            if isinstance(info, dict):
-                count = info.get("count", 0)
-                value = info.get("total_value", 0)
-                prob = info.get("probability", 0)
-                weighted = value * prob
-                stage_rows.append([stage_name, count, value, weighted, prob])
-        # Only show stages with count > 0
-        stage_rows = [r for r in stage_rows if r[1] > 0]
+            if not isinstance(info, dict):
+                continue
+            count = info.get("count", 0)
+            if count <= 0:
+                continue
+            value = info.get("total_value", 0)
+            prob = info.get("probability", 0)
+            weighted = value * prob
+            stage_rows.append((stage_name, value))
+            table_rows.append([
+                _esc_str(stage_name),
+                _fmt_number(count),
+                _fmt_currency(value),
+                _fmt_currency(weighted),
+                _fmt_pct(prob),
+            ])
+            if value > max_stage_val:
+                max_stage_val = value
 
         if stage_rows:
-            # Table rows formatted for display
-            table_rows = []
-            for r in stage_rows:
-                table_rows.append([
-                    _esc(r[0]),
-                    _fmt_number(r[1]),
-                    _fmt_currency(r[2]),
-                    _fmt_currency(r[3]),
-                    _fmt_pct(r[4]),
-                ])
-
-            # Bar data
-            max_stage_val = max((r[2] for r in stage_rows), default=1) or 1
-            bars_html = ""
-            for i, r in enumerate(stage_rows):
-                bars_html += _svg_horizontal_bar(
-                    r[0], r[2], max_stage_val, _color_at(i), show_pct=False,
-                )
+            max_stage_val = max_stage_val or 1
+            bars_html = "".join(
+                _svg_horizontal_bar(name, value, max_stage_val, c, show_pct=False)
+                for (name, value), c in zip(stage_rows, cycle(CHART_PALETTE))
+            )
 
-            html += f'''<div style="display:grid;grid-template-columns:1fr 1fr;gap:16px;margin-bottom:16px">
+            parts.append(f'''<div style="display:grid;grid-template-columns:1fr 1fr;gap:16px;margin-bottom:16px">
                 <div class="glass-card">
                     <h3 class="card-title">Deals by Stage</h3>
                     {_data_table(["Stage", "Deals", "Value", "Weighted", "Probability"],
@@ -1433,7 +1803,7 @@ def _build_pipeline_section(data: dict) -> str:
                     <h3 class="card-title">Stage Value Distribution</h3>
                     {bars_html}
                 </div>
-            </div>'''
+            </div>''')
 
     # --- Pipeline by Rep (grouped by department) ---
     _dept_map = {
@@ -1474,15 +1844,15 @@ def _build_pipeline_section(data: dict) -> str:
                     dept_groups[dept] = []
                 dept_groups[dept].append(row)
 
-            html += '<div class="glass-card" style="margin-bottom:16px">'
-            html += '<h3 class="card-title">Pipeline by Rep</h3>'
+            parts.append('<div class="glass-card" style="margin-bottom:16px">')
+            parts.append('<h3 class="card-title">Pipeline by Rep</h3>')
 
             for dept_name, members in sorted(dept_groups.items()):
-                html += f'''<div style="margin-bottom:12px">
-                    <div style="font-size:12px;font-weight:700;color:{COLORS['accent2']};
+                parts.append(f'''<div style="margin-bottom:12px">
+                    <div style="font-size:12px;font-weight:700;color:{accent2};
                         text-transform:uppercase;letter-spacing:0.05em;
                         margin-bottom:6px;padding-bottom:4px;
-                        border-bottom:1px solid {COLORS['card_border']}">{_esc(dept_name)}</div>'''
+                        border-bottom:1px solid {COLORS['card_border']}">{_esc_str(dept_name)}</div>''')
 
                 dept_table_rows = []
                 for m in members:
@@ -1492,10 +1862,10 @@ def _build_pipeline_section(data: dict) -> str:
                         _fmt_currency(m["value"]),
                         _fmt_currency(m["weighted"]),
                     ])
-                html += _data_table(["Name", "Deals", "Total Value", "Weighted"],
-                                    dept_table_rows, f"rep_{dept_name.lower().replace(' ', '_')}")
-                html += '</div>'
-            html += '</div>'
+                parts.append(_data_table(["Name", "Deals", "Total Value", "Weighted"],
+                                         dept_table_rows, f"rep_{dept_name.lower().replace(' ', '_')}"))
+                parts.append('</div>')
+            parts.append('</div>')
 
     # --- Bottom row: Stale Deals + Close Date Distribution (2-col) ---
     stale = pipeline.get("stale_deals", [])
@@ -1504,15 +1874,15 @@ def _build_pipeline_section(data: dict) -> str:
     has_close = isinstance(close_dist, dict) and len(close_dist) > 0
 
     if has_stale or has_close:
-        html += '<div style="display:grid;grid-template-columns:1fr 1fr;gap:16px;margin-bottom:16px">'
+        parts.append('<div style="display:grid;grid-template-columns:1fr 1fr;gap:16px;margin-bottom:16px">')
 
         # Stale deals
         if has_stale:
-            html += f'''<div class="glass-card alert-card" style="border-color:{COLORS['warning']}44">
-                <h3 class="card-title" style="color:{COLORS['warning']}">
+            parts.append(f'''<div class="glass-card alert-card" style="border-color:{warning}44">
+                <h3 class="card-title" style="color:{warning}">
                     \u26A0 Stale Deals ({len(stale)})</h3>
                 <p style="font-size:12px;color:{COLORS['text_muted']};margin-bottom:8px">
-                    Deals with no activity beyond threshold</p>'''
+                    Deals with no activity beyond threshold</p>''')
             stale_rows = []
             for d in stale[:20]:
                 days_val = d.get("days_since_update", 0)
@@ -1527,11 +1897,11 @@ def _build_pipeline_section(data: dict) -> str:
                     days_display,
                     _esc(d.get("owner", "")),
                 ])
-            html += _data_table(["Deal", "Value", "Stage", "Days Stale", "Owner"],
-                                stale_rows, "stale_deals")
-            html += '</div>'
+            parts.append(_data_table(["Deal", "Value", "Stage", "Days Stale", "Owner"],
+                                     stale_rows, "stale_deals"))
+            parts.append('</div>')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
 
         # Close date distribution
         if has_close:
@@ -1544,83 +1914,69 @@ def _build_pipeline_section(data: dict) -> str:
                     label = month_str
                 dist_data.append((label, count))
 
-            html += f'''<div class="glass-card">
+            parts.append(f'''<div class="glass-card">
                 <h3 class="card-title">Expected Close Date Distribution</h3>
                 {_svg_bar_chart(dist_data, 500, 180)}
-            </div>'''
+            </div>''')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
 
-        html += '</div>'
+        parts.append('</div>')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_activity_section(data: dict) -> str:
     """Section 6: Activity Tracking."""
-    activity = _safe_get(data, "activity_metrics", default={})
-    html = _section_header("activities", "Activity Tracking",
-                           "Sales activities, rep engagement, and trends",
-                           "\u26A1")
+    text_muted = COLORS["text_muted"]
+    card_border = COLORS["card_border"]
+    accent2 = COLORS["accent2"]
+    activity = data.get("activity_metrics") or {}
+    parts = [_section_header("activities", "Activity Tracking",
+                             "Sales activities, rep engagement, and trends",
+                             "\u26A1")]
 
     # Activity type KPIs -- all on ONE row (6 columns: Total + up to 5 types)
     by_type = activity.get("by_type", {})
-    icon_map = {
-        "calls": "\U0001F4DE",
-        "emails": "\u2709\uFE0F",
-        "meetings": "\U0001F91D",
-        "tasks": "\u2705",
-        "notes": "\U0001F4DD",
-    }
-    color_map = {
-        "calls": COLORS['accent'],
-        "emails": COLORS['accent2'],
-        "meetings": COLORS['accent3'],
-        "tasks": COLORS['accent4'],
-        "notes": COLORS['accent5'],
-    }
-
-    sorted_types = sorted(by_type.items(), key=lambda x: x[1], reverse=True)[:5]
+    # One ranking feeds both the KPI cards and the donut
+    ranked_types = sorted(by_type.items(), key=itemgetter(1), reverse=True)
+    sorted_types = ranked_types[:5]
     num_cols = 1 + len(sorted_types)  # Total card + one per type
-    html += f'<div class="kpi-grid" style="grid-template-columns:repeat({num_cols}, 1fr)">'
-    html += _stat_card("Total Activities", _fmt_number(activity.get("total_activities", 0)),
-                       f"{len(by_type)} types", "\u26A1", COLORS['accent6'])
+    parts.append(f'<div class="kpi-grid" style="grid-template-columns:repeat({num_cols}, 1fr)">')
+    parts.append(_stat_card("Total Activities", _fmt_number(activity.get("total_activities", 0)),
+                            f"{len(by_type)} types", "\u26A1", COLORS['accent6']))
     for act_type, count in sorted_types:
-        icon = icon_map.get(act_type.lower(), "\U0001F4CB")
-        color = color_map.get(act_type.lower(), COLORS['info'])
-        html += _stat_card(act_type.title(), _fmt_number(count), "", icon, color)
-    html += '</div>'
+        icon, color = _ACTIVITY_TYPE_STYLES.get(act_type.lower(), _ACTIVITY_TYPE_DEFAULT)
+        parts.append(_stat_card(act_type.title(), _fmt_number(count), "", icon, color))
+    parts.append('</div>')
 
     # Activity Breakdown + Distribution donut + Trend -- 3-column row
     daily_trend = activity.get("daily_trend", [])
     by_rep = activity.get("by_rep", [])
 
-    html += '<div style="display:grid;grid-template-columns:1fr auto 1fr;gap:16px;margin-top:8px">'
-    html += f'''<div class="glass-card">
-        <h3 class="card-title">Activity Breakdown <span style="font-size:11px;font-weight:400;color:{COLORS['text_muted']}">(filtered by period)</span></h3>
-        <div id="dynamic-activity-breakdown"></div>
-    </div>'''
+    parts.append('<div style="display:grid;grid-template-columns:1fr auto 1fr;gap:16px;margin-top:8px">')
+    parts.append(_ACTIVITY_BREAKDOWN_CARD)
     if by_type:
-        type_segments = [(k.title(), v) for k, v in sorted(by_type.items(), key=lambda x: x[1], reverse=True)]
-        html += f'''<div class="glass-card" style="min-width:180px">
+        type_segments = [(k.title(), v) for k, v in ranked_types]
+        parts.append(f'''<div class="glass-card" style="min-width:180px">
             <h3 class="card-title">Distribution</h3>
             {_svg_donut(type_segments, 130)}
-        </div>'''
+        </div>''')
     else:
-        html += '<div></div>'
+        parts.append('<div></div>')
     if daily_trend:
         trend_data = [(item.get("date", ""), item.get("count", 0)) for item in daily_trend]
-        html += f'''<div class="glass-card">
-            <h3 class="card-title">Daily Trend <span style="font-size:11px;font-weight:400;color:{COLORS['text_muted']}">(30d)</span></h3>
-            {_svg_line_chart(trend_data[-30:], 400, 140, COLORS['accent2'])}
-        </div>'''
+        parts.append(f'''<div class="glass-card">
+            <h3 class="card-title">Daily Trend <span style="font-size:11px;font-weight:400;color:{text_muted}">(30d)</span></h3>
+            {_svg_line_chart(trend_data[-30:], 400, 140, accent2)}
+        </div>''')
     else:
-        html += f'''<div class="glass-card">
+        parts.append(f'''<div class="glass-card">
             <h3 class="card-title">Daily Trend</h3>
-            <div style="text-align:center;padding:32px;color:{COLORS['text_muted']};font-size:14px">No trend data</div>
-        </div>'''
-    html += '</div>'
+            <div style="text-align:center;padding:32px;color:{text_muted};font-size:14px">No trend data</div>
+        </div>''')
+    parts.append('</div>')
 
     # Activity by Rep -- full-width
     # Filter: only keep reps with actual names (not numeric IDs), exclude unassigned
@@ -1629,13 +1985,12 @@ def _build_activity_section(data: dict) -> str:
                   and r.get("owner_name", "").strip().lower() != "unassigned"]
     REP_LIMIT = 10
     if named_reps:
-        rep_rows_html = ""
-        for i, rep in enumerate(named_reps):
-            hidden_style = ' style="display:none"' if i >= REP_LIMIT else ''
-            extra_cls = ' activity-rep-extra' if i >= REP_LIMIT else ''
-            rep_rows_html += (
-                f'<tr class="{extra_cls.strip()}"{hidden_style}>'
-                f'<td>{_esc(rep.get("owner_name", "Unknown"))}</td>'
+        # Rows past the limit start hidden behind the show-more button
+        rep_rows_html = "".join(
+            (
+                ('<tr class="activity-rep-extra" style="display:none">' if i >= REP_LIMIT
+                 else '<tr class="">')
+                + f'<td>{_esc(rep.get("owner_name", "Unknown"))}</td>'
                 f'<td>{_fmt_number(rep.get("calls", 0))}</td>'
                 f'<td>{_fmt_number(rep.get("emails", 0))}</td>'
                 f'<td>{_fmt_number(rep.get("meetings", 0))}</td>'
@@ -1644,14 +1999,16 @@ def _build_activity_section(data: dict) -> str:
                 f'<td><strong>{_fmt_number(rep.get("total", 0))}</strong></td>'
                 f'</tr>\n'
             )
+            for i, rep in enumerate(named_reps)
+        )
         rep_show_more = ""
         if len(named_reps) > REP_LIMIT:
             remaining = len(named_reps) - REP_LIMIT
             rep_show_more = (
-                f'<div style="text-align:center;padding:10px;border-top:1px solid {COLORS["card_border"]}">'
+                f'<div style="text-align:center;padding:10px;border-top:1px solid {card_border}">'
                 f'<button id="act-rep-show-more" onclick="toggleExpandList(\'activity-rep-extra\',\'act-rep-show-more\',{len(named_reps)},{REP_LIMIT})"'
-                f' style="background:none;border:1px solid {COLORS["card_border"]};border-radius:8px;'
-                f'padding:6px 20px;color:{COLORS["accent2"]};font-size:12px;font-weight:600;'
+                f' style="background:none;border:1px solid {card_border};border-radius:8px;'
+                f'padding:6px 20px;color:{accent2};font-size:12px;font-weight:600;'
                 f'cursor:pointer">Show all {len(named_reps)} ({remaining} more)</button>'
                 f'</div>'
             )
@@ -1659,7 +2016,7 @@ def _build_activity_section(data: dict) -> str:
             f'<th style="cursor:pointer;user-select:none">{h}</th>'
             for h in ["Rep", "Calls", "Emails", "Meetings", "Tasks", "Notes", "Total"]
         )
-        html += f'''<div class="glass-card" style="padding-bottom:0;margin-top:8px">
+        parts.append(f'''<div class="glass-card" style="padding-bottom:0;margin-top:8px">
             <h3 class="card-title">Activity by Rep</h3>
             <div class="table-wrapper">
                 <table id="activity_reps" class="data-table">
@@ -1668,84 +2025,88 @@ def _build_activity_section(data: dict) -> str:
                 </table>
             </div>
             {rep_show_more}
-        </div>'''
+        </div>''')
     else:
-        html += f'''<div class="glass-card" style="margin-top:8px">
+        parts.append(f'''<div class="glass-card" style="margin-top:8px">
             <h3 class="card-title">Activity by Rep</h3>
-            <div style="text-align:center;padding:32px;color:{COLORS['text_muted']};font-size:14px">No named reps found</div>
-        </div>'''
+            <div style="text-align:center;padding:32px;color:{text_muted};font-size:14px">No named reps found</div>
+        </div>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_contacts_section(data: dict) -> str:
     """Section 7: Contacts & Companies."""
-    contacts = _safe_get(data, "contact_metrics", default={})
-    counts = _safe_get(data, "record_counts", default={})
-    html = _section_header("contacts", "Contacts & Companies",
-                           "Lifecycle stages, engagement, and company overview",
-                           "\U0001F465")
+    card_border = COLORS["card_border"]
+    accent2 = COLORS["accent2"]
+    accent3 = COLORS["accent3"]
+    contacts = data.get("contact_metrics") or {}
+    counts = data.get("record_counts") or {}
+    parts = [_section_header("contacts", "Contacts & Companies",
+                             "Lifecycle stages, engagement, and company overview",
+                             "\U0001F465")]
 
     # KPIs (3-column row -- kept as-is)
-    html += '<div class="kpi-grid kpi-grid-3">'
-    html += _stat_card("Total Contacts", _fmt_number(counts.get("contacts", 0)),
-                       f"New 30d: {_fmt_number(contacts.get('new_contacts_30d', 0))}",
-                       "\U0001F465", COLORS['accent'])
-    html += _stat_card("Companies", _fmt_number(counts.get("companies", 0)),
-                       "", "\U0001F3E2", COLORS['accent2'])
-    html += _stat_card("Owners/Reps", _fmt_number(counts.get("owners", 0)),
-                       "", "\U0001F464", COLORS['accent3'])
-    html += '</div>'
+    parts.append('<div class="kpi-grid kpi-grid-3">')
+    parts.append(_stat_card("Total Contacts", _fmt_number(counts.get("contacts", 0)),
+                            f"New 30d: {_fmt_number(contacts.get('new_contacts_30d', 0))}",
+                            "\U0001F465", COLORS['accent']))
+    parts.append(_stat_card("Companies", _fmt_number(counts.get("companies", 0)),
+                            "", "\U0001F3E2", accent2))
+    parts.append(_stat_card("Owners/Reps", _fmt_number(counts.get("owners", 0)),
+                            "", "\U0001F464", accent3))
+    parts.append('</div>')
 
     # Lifecycle distribution -- filter out numeric-only keys, merged donut + bars
     lifecycle = contacts.get("by_lifecycle", {})
     named_lifecycle = {k: v for k, v in lifecycle.items() if not k.strip().isdigit()}
     if named_lifecycle:
-        lc_segments = sorted(named_lifecycle.items(), key=lambda x: x[1], reverse=True)
+        lc_segments = sorted(named_lifecycle.items(), key=itemgetter(1), reverse=True)
         max_lc = max(named_lifecycle.values()) if named_lifecycle else 1
-        bars_html = ""
-        for stage, count in lc_segments:
-            bars_html += _svg_horizontal_bar(stage, count, max_lc, COLORS['accent2'], show_pct=False)
-        html += f'''<div class="glass-card" style="margin-top:8px">
+        bars_html = "".join(
+            _svg_horizontal_bar(stage, count, max_lc, accent2, show_pct=False)
+            for stage, count in lc_segments
+        )
+        parts.append(f'''<div class="glass-card" style="margin-top:8px">
             <h3 class="card-title">Lifecycle Distribution</h3>
             <div style="display:flex;gap:24px;align-items:flex-start">
                 <div style="flex-shrink:0">{_svg_donut(lc_segments, 120)}</div>
                 <div style="flex:1;min-width:0">{bars_html}</div>
             </div>
-        </div>'''
+        </div>''')
     else:
-        html += f'''<div class="glass-card" style="margin-top:8px">
+        parts.append(f'''<div class="glass-card" style="margin-top:8px">
             <h3 class="card-title">Lifecycle Distribution</h3>
             <div style="text-align:center;padding:32px;color:{COLORS['text_muted']};font-size:14px">
                 No lifecycle data with named stages</div>
-        </div>'''
+        </div>''')
 
     # Top engaged contacts -- first 5 visible, rest collapsible
     engaged = contacts.get("top_engaged", [])
     if engaged:
         CONTACT_LIMIT = 5
-        contact_rows_html = ""
-        for i, c in enumerate(engaged):
-            hidden_style = ' style="display:none"' if i >= CONTACT_LIMIT else ''
-            extra_cls = ' contacts-extra-row' if i >= CONTACT_LIMIT else ''
-            contact_rows_html += (
-                f'<tr class="{extra_cls.strip()}"{hidden_style}>'
-                f'<td>{_esc(c.get("name", ""))}</td>'
+        contact_rows_html = "".join(
+            (
+                ('<tr class="contacts-extra-row" style="display:none">' if i >= CONTACT_LIMIT
+                 else '<tr class="">')
+                + f'<td>{_esc(c.get("name", ""))}</td>'
                 f'<td>{_esc(c.get("email", ""))}</td>'
                 f'<td>{_fmt_number(c.get("page_views", 0))}</td>'
                 f'<td>{_fmt_number(c.get("visits", 0))}</td>'
                 f'<td>{_fmt_number(c.get("events", 0))}</td>'
                 f'</tr>\n'
             )
+            for i, c in enumerate(engaged)
+        )
         contact_show_more = ""
         if len(engaged) > CONTACT_LIMIT:
             remaining = len(engaged) - CONTACT_LIMIT
             contact_show_more = (
-                f'<div style="text-align:center;padding:10px;border-top:1px solid {COLORS["card_border"]}">'
+                f'<div style="text-align:center;padding:10px;border-top:1px solid {card_border}">'
                 f'<button id="engaged-show-more" onclick="toggleExpandList(\'contacts-extra-row\',\'engaged-show-more\',{len(engaged)},{CONTACT_LIMIT})"'
-                f' style="background:none;border:1px solid {COLORS["card_border"]};border-radius:8px;'
-                f'padding:6px 20px;color:{COLORS["accent2"]};font-size:12px;font-weight:600;'
+                f' style="background:none;border:1px solid {card_border};border-radius:8px;'
+                f'padding:6px 20px;color:{accent2};font-size:12px;font-weight:600;'
                 f'cursor:pointer">Show all {len(engaged)} ({remaining} more)</button>'
                 f'</div>'
             )
@@ -1753,7 +2114,7 @@ def _build_contacts_section(data: dict) -> str:
             f'<th style="cursor:pointer;user-select:none">{h}</th>'
             for h in ["Name", "Email", "Page Views", "Visits", "Events"]
         )
-        html += f'''<div class="glass-card" style="margin-top:8px;padding-bottom:0">
+        parts.append(f'''<div class="glass-card" style="margin-top:8px;padding-bottom:0">
             <h3 class="card-title">Top Engaged Contacts</h3>
             <div class="table-wrapper">
                 <table id="top_engaged" class="data-table">
@@ -1762,23 +2123,23 @@ def _build_contacts_section(data: dict) -> str:
                 </table>
             </div>
             {contact_show_more}
-        </div>'''
+        </div>''')
 
     # Companies summary (compact)
     companies = contacts.get("companies_summary", {})
     if companies:
         if isinstance(companies, dict):
             # Summary object format: {total, with_deals, by_industry, by_size}
-            html += f'''<div class="glass-card" style="margin-top:8px;padding:10px 14px">
+            parts.append(f'''<div class="glass-card" style="margin-top:8px;padding:10px 14px">
                 <h3 class="card-title" style="margin-bottom:6px">Companies Overview</h3>
-                <div class="kpi-grid kpi-grid-3" style="gap:8px">'''
-            html += _stat_card("Total", _fmt_number(companies.get("total", 0)), "", "", COLORS['accent2'])
-            html += _stat_card("With Deals", _fmt_number(companies.get("with_deals", 0)), "", "", COLORS['accent3'])
+                <div class="kpi-grid kpi-grid-3" style="gap:8px">''')
+            parts.append(_stat_card("Total", _fmt_number(companies.get("total", 0)), "", "", accent2))
+            parts.append(_stat_card("With Deals", _fmt_number(companies.get("with_deals", 0)), "", "", accent3))
             by_industry = companies.get("by_industry", {})
             if isinstance(by_industry, dict):
                 top_industry = max(by_industry, key=by_industry.get, default="N/A") if by_industry else "N/A"
-                html += _stat_card("Top Industry", _esc(str(top_industry)), "", "", COLORS['accent4'])
-            html += '</div></div>'
+                parts.append(_stat_card("Top Industry", _esc(str(top_industry)), "", "", COLORS['accent4']))
+            parts.append('</div></div>')
         elif isinstance(companies, list):
             rows = []
             for co in companies[:15]:
@@ -1789,34 +2150,37 @@ def _build_contacts_section(data: dict) -> str:
                     _fmt_number(co.get("deals", 0)),
                     _fmt_currency(co.get("revenue", 0)),
                 ])
-            html += f'''<div class="glass-card" style="margin-top:8px;padding:10px 14px">
+            parts.append(f'''<div class="glass-card" style="margin-top:8px;padding:10px 14px">
                 <h3 class="card-title" style="margin-bottom:6px">Companies Summary</h3>
                 {_data_table(["Company", "Domain", "Contacts", "Deals", "Revenue"],
                              rows, "companies")}
-            </div>'''
+            </div>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_insights_section(data: dict) -> str:
     """Section 8: Insights & Forecast."""
-    insights = _safe_get(data, "insights", default={})
-    html = _section_header("insights", "Insights & Forecast",
-                           "Win/loss analysis, forecasts, and performance",
-                           "\U0001F52E")
+    text = COLORS["text"]
+    text_muted = COLORS["text_muted"]
+    accent4 = COLORS["accent4"]
+    insights = data.get("insights") or {}
+    parts = [_section_header("insights", "Insights & Forecast",
+                             "Win/loss analysis, forecasts, and performance",
+                             "\U0001F52E")]
 
     # Revenue forecast
     forecast = insights.get("revenue_forecast", {})
     if forecast:
-        html += '<div class="kpi-grid kpi-grid-3">'
-        html += _stat_card("30-Day Forecast", _fmt_currency(forecast.get("days_30", 0)),
-                           "", "\U0001F4C5", COLORS['accent'])
-        html += _stat_card("60-Day Forecast", _fmt_currency(forecast.get("days_60", 0)),
-                           "", "\U0001F4C6", COLORS['accent2'])
-        html += _stat_card("90-Day Forecast", _fmt_currency(forecast.get("days_90", 0)),
-                           "", "\U0001F4C8", COLORS['accent4'])
-        html += '</div>'
+        parts.append('<div class="kpi-grid kpi-grid-3">')
+        parts.append(_stat_card("30-Day Forecast", _fmt_currency(forecast.get("days_30", 0)),
+                                "", "\U0001F4C5", COLORS['accent']))
+        parts.append(_stat_card("60-Day Forecast", _fmt_currency(forecast.get("days_60", 0)),
+                                "", "\U0001F4C6", COLORS['accent2']))
+        parts.append(_stat_card("90-Day Forecast", _fmt_currency(forecast.get("days_90", 0)),
+                                "", "\U0001F4C8", accent4))
+        parts.append('</div>')
 
     # Win/Loss + Cycle Trend + Deal Size — 3-column row
     wl = insights.get("win_loss_analysis", {})
@@ -1836,69 +2200,68 @@ def _build_insights_section(data: dict) -> str:
         size_data = []
 
     if wl or trend_data or size_data:
-        html += '<div class="grid-3" style="margin-top:8px">'
+        parts.append('<div class="grid-3" style="margin-top:8px">')
         # Win/Loss (donut + reasons merged)
         if wl:
-            reasons_html = ""
-            won_reasons = wl.get("won_reasons", {})
-            lost_reasons = wl.get("lost_reasons", {})
-            if won_reasons:
-                reasons_html += f'<h4 style="font-size:11px;color:{COLORS["accent4"]};margin:6px 0 2px;text-transform:uppercase">Won</h4>'
-                if isinstance(won_reasons, dict):
-                    for reason, count in sorted(won_reasons.items(), key=lambda x: x[1], reverse=True)[:3]:
-                        reasons_html += f'<div style="font-size:12px;padding:2px 0;color:{COLORS["text_muted"]}">{_esc(reason)}: <strong style="color:{COLORS["text"]}">{_fmt_number(count)}</strong></div>'
-                elif isinstance(won_reasons, list):
-                    for item in won_reasons[:3]:
-                        reasons_html += f'<div style="font-size:12px;padding:2px 0;color:{COLORS["text_muted"]}">{_esc(str(item))}</div>'
-            if lost_reasons:
-                reasons_html += f'<h4 style="font-size:11px;color:{COLORS["danger"]};margin:6px 0 2px;text-transform:uppercase">Lost</h4>'
-                if isinstance(lost_reasons, dict):
-                    for reason, count in sorted(lost_reasons.items(), key=lambda x: x[1], reverse=True)[:3]:
-                        reasons_html += f'<div style="font-size:12px;padding:2px 0;color:{COLORS["text_muted"]}">{_esc(reason)}: <strong style="color:{COLORS["text"]}">{_fmt_number(count)}</strong></div>'
-                elif isinstance(lost_reasons, list):
-                    for item in lost_reasons[:3]:
-                        reasons_html += f'<div style="font-size:12px;padding:2px 0;color:{COLORS["text_muted"]}">{_esc(str(item))}</div>'
-            html += f'''<div class="glass-card">
+            reasons = []
+            # (reason, count) pairs, already ranked by _normalize_metrics
+            for header, field in ((_REASONS_WON_HEADER, "won_reasons"),
+                                  (_REASONS_LOST_HEADER, "lost_reasons")):
+                ranked = wl.get(field)
+                if ranked:
+                    reasons.append(header)
+                    for reason, count in ranked[:3]:
+                        if count is None:
+                            reasons.append(_REASON_ROW_TPL % _esc(reason))
+                        else:
+                            reasons.append(_REASON_COUNT_ROW_TPL % (_esc_str(reason), _fmt_number(count)))
+            parts.append(f'''<div class="glass-card">
                 <h3 class="card-title">Win/Loss Analysis</h3>
                 <div style="display:flex;gap:16px;align-items:flex-start">
                     <div style="flex-shrink:0">
                         {_svg_donut([("Won", wl.get("won_count", 0)), ("Lost", wl.get("lost_count", 0))], 100)}
-                        <div style="text-align:center;margin-top:4px;font-size:13px;color:{COLORS['text']}">
-                            Win Rate: <strong style="color:{COLORS['accent4']}">{_fmt_pct(wl.get("win_rate", 0))}</strong>
+                        <div style="text-align:center;margin-top:4px;font-size:13px;color:{text}">
+                            Win Rate: <strong style="color:{accent4}">{_fmt_pct(wl.get("win_rate", 0))}</strong>
                         </div>
                     </div>
-                    <div style="flex:1;min-width:0">{reasons_html}</div>
+                    <div style="flex:1;min-width:0">{"".join(reasons)}</div>
                 </div>
-            </div>'''
+            </div>''')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
         # Sales Cycle Trend
         if trend_data:
-            html += f'''<div class="glass-card">
+            parts.append(f'''<div class="glass-card">
                 <h3 class="card-title">Sales Cycle Trend (Days)</h3>
                 {_svg_line_chart(trend_data, 400, 140, COLORS['accent3'])}
-            </div>'''
+            </div>''')
         else:
-            html += '<div></div>'
+            parts.append('<div></div>')
         # Deal Size Distribution
         if size_data:
-            html += f'''<div class="glass-card">
+            parts.append(f'''<div class="glass-card">
                 <h3 class="card-title">Deal Size Distribution</h3>
                 {_svg_bar_chart(size_data, 400, max(130, len(size_data) * 26))}
-            </div>'''
+            </div>''')
         else:
-            html += '<div></div>'
-        html += '</div>'
+            parts.append('<div></div>')
+        parts.append('</div>')
 
     # Rep performance leaderboard
     rep_perf = insights.get("rep_performance", [])
     if rep_perf:
-        # Filter out reps whose name is numeric (e.g. owner IDs without names)
-        named_reps = [r for r in rep_perf if r.get("name", "").strip() and not r.get("name", "").strip().replace("-", "").isdigit()]
+        # Filter out reps whose name is numeric (e.g. owner IDs without names);
+        # the revenue used for ranking is read once and reused in the row
+        named_reps = []
+        for r in rep_perf:
+            name = r.get("name", "").strip()
+            if name and not name.replace("-", "").isdigit():
+                named_reps.append((r.get("total_won_value", 0), r))
         if named_reps:
+            named_reps.sort(key=itemgetter(0), reverse=True)
             rows = []
-            for i, rep in enumerate(sorted(named_reps, key=lambda x: x.get("total_won_value", 0), reverse=True)):
-                medal = ["\U0001F947", "\U0001F948", "\U0001F949"][i] if i < 3 else f"#{i+1}"
+            for i, (won_value, rep) in enumerate(named_reps):
+                medal = _RANK_LABELS[i] if i < len(_RANK_LABELS) else f"#{i+1}"
                 raw_cycle = rep.get("avg_cycle_days")
                 if raw_cycle is not None and raw_cycle != "":
                     try:
@@ -1911,16 +2274,16 @@ def _build_insights_section(data: dict) -> str:
                     f"{medal} {_esc(rep.get('name', 'Unknown'))}",
                     _fmt_number(rep.get("deals_won", 0)),
                     _fmt_number(rep.get("deals_lost", 0)),
-                    _fmt_currency(rep.get("total_won_value", 0)),
+                    _fmt_currency(won_value),
                     _fmt_currency(rep.get("total_pipeline_value", 0)),
                     _fmt_pct(rep.get("win_rate", 0)),
                     cycle_str,
                 ])
-            html += f'''<div class="glass-card" style="margin-top:8px">
+            parts.append(f'''<div class="glass-card" style="margin-top:8px">
                 <h3 class="card-title">Rep Performance Leaderboard</h3>
                 {_data_table(["Rep", "Won", "Lost", "Revenue", "Pipeline", "Win Rate", "Avg Cycle (Days)"],
                              rows, "rep_perf")}
-            </div>'''
+            </div>''')
 
     # Cohort analysis
     cohorts = insights.get("cohort_analysis", [])
@@ -1935,14 +2298,14 @@ def _build_insights_section(data: dict) -> str:
                 _fmt_number(c.get("became_customer", 0)),
                 _fmt_pct(c.get("conversion_rate", 0)),
             ])
-        html += f'''<div class="glass-card" style="margin-top:8px">
+        parts.append(f'''<div class="glass-card" style="margin-top:8px">
             <h3 class="card-title">Cohort Analysis</h3>
             {_data_table(["Cohort", "Leads", "MQL", "SQL", "Customer", "Conv. Rate"],
                          rows, "cohorts")}
-        </div>'''
+        </div>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 # ---------------------------------------------------------------------------
@@ -2024,6 +2387,12 @@ def _classify_ic_stage(status_text: str) -> str:
 
 def _build_monday_pipeline(data: dict) -> str:
     """M&A Pipeline page — KPIs, deal funnel, board-style project table, stale warnings, owner summary."""
+    text = COLORS["text"]
+    text_muted = COLORS["text_muted"]
+    card_border = COLORS["card_border"]
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
+    info = COLORS["info"]
     monday = data.get("monday", {})
     if not monday:
         return '<section class="dashboard-section"><div class="glass-card" style="padding:40px;text-align:center;color:#6b7280"><p>No Monday.com data available. Run fetch_monday.py and monday_analyzer.py first.</p></div></section>'
@@ -2031,11 +2400,11 @@ def _build_monday_pipeline(data: dict) -> str:
     ma = monday.get("ma_metrics", {})
     overview = monday.get("board_overview", {})
 
-    html = _section_header(
+    parts = [_section_header(
         "monday-pipeline", "M&A Pipeline",
         "Monday.com project tracking — active deals, pipeline stages, and owner workloads (dormant items hidden)",
         "\U0001F4BC",
-    )
+    )]
 
     # ── Deal Flow Navigation ──
     deal_flow_stages = [
@@ -2054,7 +2423,7 @@ def _build_monday_pipeline(data: dict) -> str:
         ("Completed", "#22c55e"),
     ]
     flow_html = '<div class="glass-card" style="margin-bottom:10px;padding:10px 14px">'
-    flow_html += f'<div style="font-size:11px;font-weight:700;text-transform:uppercase;letter-spacing:0.06em;color:{COLORS["text_muted"]};margin-bottom:10px">Deal Flow — Order of Events</div>'
+    flow_html += f'<div style="font-size:11px;font-weight:700;text-transform:uppercase;letter-spacing:0.06em;color:{text_muted};margin-bottom:10px">Deal Flow — Order of Events</div>'
     flow_html += '<div class="deal-flow-nav">'
     for i, (stage_name, stage_color) in enumerate(deal_flow_stages):
         flow_html += f'''<div class="deal-flow-step">
@@ -2064,7 +2433,7 @@ def _build_monday_pipeline(data: dict) -> str:
             flow_html += '<span class="step-arrow">&#8594;</span>'
         flow_html += '</div>'
     flow_html += '</div></div>'
-    html += flow_html
+    parts.append(flow_html)
 
     # ── Filter out dormant projects and sort by recency ──
     MA_OWNERS = {"josh elliott", "josie greenwood"}
@@ -2084,39 +2453,19 @@ def _build_monday_pipeline(data: dict) -> str:
     total_value = sum(p.get("value", 0) for p in active_list)
     avg_stale = ma.get("avg_days_since_update", 0)
 
-    html += '<div class="kpi-grid kpi-grid-3">'
-    html += _stat_card("Active Projects", _fmt_number(active_projects),
-                       f"{total_projects} total ({dormant_count} dormant hidden)", "\U0001F4C1", MONDAY_PURPLE)
-    html += _stat_card("Pipeline Value", _fmt_currency(total_value),
-                       f"Across {active_projects} active deals", "\U0001F4B0", MONDAY_GREEN)
-    html += _stat_card("Avg Days Since Update", _fmt_number(avg_stale),
-                       "Active projects",
-                       "\u23F1\uFE0F",
-                       MONDAY_YELLOW if avg_stale < 7 else MONDAY_RED)
-    html += '</div>'
+    parts.append('<div class="kpi-grid kpi-grid-3">')
+    parts.append(_stat_card("Active Projects", _fmt_number(active_projects),
+                            f"{total_projects} total ({dormant_count} dormant hidden)", "\U0001F4C1", MONDAY_PURPLE))
+    parts.append(_stat_card("Pipeline Value", _fmt_currency(total_value),
+                            f"Across {active_projects} active deals", "\U0001F4B0", MONDAY_GREEN))
+    parts.append(_stat_card("Avg Days Since Update", _fmt_number(avg_stale),
+                            "Active projects",
+                            "\u23F1\uFE0F",
+                            MONDAY_YELLOW if avg_stale < 7 else MONDAY_RED))
+    parts.append('</div>')
 
     # ── Search & Filter Bar ──
-    html += f'''<div class="glass-card" style="margin-top:8px;padding:12px 16px">
-        <div style="display:flex;flex-wrap:wrap;gap:10px;align-items:center">
-            <input type="text" id="monday-search" placeholder="Search projects, owners, boards..."
-                style="flex:1;min-width:200px;padding:8px 12px;border:1px solid {COLORS['card_border']};
-                border-radius:8px;background:{COLORS['bg']};color:{COLORS['text']};font-size:13px;
-                outline:none" oninput="filterMonday()">
-            <select id="monday-filter-owner" onchange="filterMonday()"
-                style="padding:8px 12px;border:1px solid {COLORS['card_border']};border-radius:8px;
-                background:{COLORS['bg']};color:{COLORS['text']};font-size:13px">
-                <option value="">All Owners</option>
-            </select>
-            <select id="monday-filter-stage" onchange="filterMonday()"
-                style="padding:8px 12px;border:1px solid {COLORS['card_border']};border-radius:8px;
-                background:{COLORS['bg']};color:{COLORS['text']};font-size:13px">
-                <option value="">All Stages</option>
-            </select>
-            <label style="display:flex;align-items:center;gap:4px;font-size:12px;color:{COLORS['text_muted']};cursor:pointer">
-                <input type="checkbox" id="monday-hide-unassigned" onchange="filterMonday()"> Hide unassigned
-            </label>
-        </div>
-    </div>'''
+    parts.append(_MONDAY_FILTER_BAR)
 
     # ── M&A Pipeline Funnel ──
     funnel = ma.get("funnel", [])
@@ -2125,9 +2474,9 @@ def _build_monday_pipeline(data: dict) -> str:
         if active_funnel:
             max_count = max(s.get("count", 0) for s in active_funnel) or 1
             funnel_html = ""
-            stage_colors = [MONDAY_PURPLE, "#7B61FF", "#9B8AFF", COLORS['accent2'],
-                            COLORS['info'], MONDAY_GREEN, COLORS['accent4'],
-                            COLORS['accent'], MONDAY_YELLOW]
+            stage_colors = [MONDAY_PURPLE, "#7B61FF", "#9B8AFF", accent2,
+                            info, MONDAY_GREEN, COLORS['accent4'],
+                            accent, MONDAY_YELLOW]
             for i, stage in enumerate(active_funnel):
                 name = stage.get("stage", "").replace("_", " ").title()
                 count = stage.get("count", 0)
@@ -2136,29 +2485,29 @@ def _build_monday_pipeline(data: dict) -> str:
                 color = stage_colors[i % len(stage_colors)]
                 funnel_html += f'''<div style="margin-bottom:10px">
                     <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:4px">
-                        <span style="font-size:13px;color:{COLORS['text_muted']};text-transform:capitalize">{_esc(name)}</span>
-                        <span style="font-size:13px;font-weight:600;color:{COLORS['text']}">{_fmt_number(count)} deals &middot; {_fmt_currency(value)}</span>
+                        <span style="font-size:13px;color:{text_muted};text-transform:capitalize">{_esc(name)}</span>
+                        <span style="font-size:13px;font-weight:600;color:{text}">{_fmt_number(count)} deals &middot; {_fmt_currency(value)}</span>
                     </div>
-                    <div style="height:24px;background:{COLORS['card_border']};border-radius:6px;overflow:hidden">
+                    <div style="height:24px;background:{card_border};border-radius:6px;overflow:hidden">
                         <div class="progress-fill" style="height:100%;width:{pct:.1f}%;
                             background:linear-gradient(90deg,{color},{color}88);border-radius:6px"></div>
                     </div>
                 </div>'''
 
-            html += f'''<div class="glass-card" style="margin-top:8px">
+            parts.append(f'''<div class="glass-card" style="margin-top:8px">
                 <h3 class="card-title" style="display:flex;align-items:center;gap:8px">
                     <span style="color:{MONDAY_PURPLE}">\U0001F3E2</span> Deal Pipeline by Stage
                 </h3>
                 {funnel_html}
-            </div>'''
+            </div>''')
 
     # ── Board-style Active Projects (sorted by recency, show 10) ──
     if active_list:
         # Stage color mapping
         stage_color_map = {
             "ic_review": MONDAY_PURPLE,
-            "due_diligence": COLORS['accent2'],
-            "negotiation": COLORS['info'],
+            "due_diligence": accent2,
+            "negotiation": info,
             "approved": MONDAY_GREEN,
             "closing": MONDAY_GREEN,
             "completed": "#22c55e",
@@ -2191,20 +2540,20 @@ def _build_monday_pipeline(data: dict) -> str:
             si_count = p.get("subitems_count", 0)
             si_done = p.get("subitems_complete", 0)
             has_owner = "1" if p.get("has_owner") else "0"
-            group_color = stage_color_map.get(stage, COLORS['accent'])
+            group_color = stage_color_map.get(stage, accent)
 
             initials = "".join(w[0] for w in owner.split()[:2]).upper() if owner != "Unassigned" else "?"
             av_color = avatar_colors[hash(owner) % len(avatar_colors)]
 
             if si_count > 0:
                 pct = min(100, (si_done / si_count) * 100)
-                prog_color = MONDAY_GREEN if pct >= 75 else (MONDAY_YELLOW if pct >= 40 else COLORS['text_muted'])
+                prog_color = MONDAY_GREEN if pct >= 75 else (MONDAY_YELLOW if pct >= 40 else text_muted)
                 progress_html = f'''<div class="progress-mini">
                     <div class="bar"><div class="bar-fill" style="width:{pct:.0f}%;background:{prog_color}"></div></div>
                     <span class="pct">{si_done}/{si_count}</span>
                 </div>'''
             else:
-                progress_html = f'<span style="color:{COLORS["text_muted"]};font-size:11px">-</span>'
+                progress_html = f'<span style="color:{text_muted};font-size:11px">-</span>'
 
             # Hide items beyond the first 10
             hidden = ' style="display:none"' if idx >= SHOW_LIMIT else ''
@@ -2215,15 +2564,15 @@ def _build_monday_pipeline(data: dict) -> str:
                 f'data-name="{name}" data-ws="{ws}" data-has-owner="{has_owner}"{hidden}>'
                 f'<div style="display:flex;align-items:center;gap:8px">'
                 f'<div style="width:4px;height:24px;border-radius:2px;background:{group_color};flex-shrink:0"></div>'
-                f'<span style="font-weight:500;color:{COLORS["text"]}">{name}</span></div>'
+                f'<span style="font-weight:500;color:{text}">{name}</span></div>'
                 f'<div>{_monday_stage_badge(stage)}</div>'
                 f'<div style="font-weight:600">{value}</div>'
                 f'<div class="person-avatar">'
                 f'<span class="avatar-circle" style="background:{av_color}">{initials}</span>'
                 f'<span>{owner}</span></div>'
-                f'<div style="font-size:12px;color:{COLORS["text_muted"]}">{ws}</div>'
+                f'<div style="font-size:12px;color:{text_muted}">{ws}</div>'
                 f'<div>{progress_html}</div>'
-                f'<div style="font-size:12px;color:{COLORS["text_muted"]}">{updated}</div>'
+                f'<div style="font-size:12px;color:{text_muted}">{updated}</div>'
                 f'</div>'
             )
 
@@ -2233,27 +2582,27 @@ def _build_monday_pipeline(data: dict) -> str:
         show_more_btn = ""
         if len(active_list) > SHOW_LIMIT:
             remaining = len(active_list) - SHOW_LIMIT
-            show_more_btn = f'''<div style="text-align:center;padding:12px;border-top:1px solid {COLORS['card_border']}">
+            show_more_btn = f'''<div style="text-align:center;padding:12px;border-top:1px solid {card_border}">
                 <button id="pipeline-show-more" onclick="toggleExpandList('pipeline-extra-row','pipeline-show-more',{len(active_list)},{SHOW_LIMIT})"
-                    style="background:none;border:1px solid {COLORS['card_border']};border-radius:8px;
-                    padding:8px 24px;color:{COLORS['accent2']};font-size:13px;font-weight:600;
+                    style="background:none;border:1px solid {card_border};border-radius:8px;
+                    padding:8px 24px;color:{accent2};font-size:13px;font-weight:600;
                     cursor:pointer;transition:all 0.2s ease">
                     Show all {len(active_list)} projects ({remaining} more)
                 </button>
             </div>'''
 
-        html += f'''<div class="glass-card" style="margin-top:8px;padding:0;overflow:hidden">
-            <div style="padding:10px 14px;border-bottom:1px solid {COLORS['card_border']}">
+        parts.append(f'''<div class="glass-card" style="margin-top:8px;padding:0;overflow:hidden">
+            <div style="padding:10px 14px;border-bottom:1px solid {card_border}">
                 <h3 class="card-title" style="margin-bottom:0">\U0001F3AF Active M&A Projects
-                    <span id="monday-count" style="font-size:13px;font-weight:400;color:{COLORS['text_muted']}">
+                    <span id="monday-count" style="font-size:13px;font-weight:400;color:{text_muted}">
                         ({len(active_list)} — showing {min(SHOW_LIMIT, len(active_list))})
                     </span>
                 </h3>
-                <p style="font-size:11px;color:{COLORS['text_muted']};margin-top:4px">Sorted by most recently updated &middot; {dormant_count} dormant items hidden</p>
+                <p style="font-size:11px;color:{text_muted};margin-top:4px">Sorted by most recently updated &middot; {dormant_count} dormant items hidden</p>
             </div>
             {board_html}
             {show_more_btn}
-        </div>'''
+        </div>''')
 
     # ── Previous Projects (closed/completed/unsuccessful) ──
     stale = ma.get("stale_projects", [])
@@ -2269,10 +2618,10 @@ def _build_monday_pipeline(data: dict) -> str:
             extra_cls = ' stale-extra-row' if i >= STALE_LIMIT else ''
             stale_html += f'''<div class="stale-item{extra_cls}" {hidden if i >= STALE_LIMIT else ''}>
                 <div style="display:flex;justify-content:space-between;align-items:center;
-                    padding:8px 12px;border-bottom:1px solid {COLORS['card_border']}">
+                    padding:8px 12px;border-bottom:1px solid {card_border}">
                     <div>
-                        <span style="font-size:12px;color:{COLORS['text']};font-weight:500">{_esc(sp.get("name", ""))}</span>
-                        <span style="font-size:10px;color:{COLORS['text_muted']};margin-left:8px">{_esc(sp.get("stage", "").title())}</span>
+                        <span style="font-size:12px;color:{text};font-weight:500">{_esc(sp.get("name", ""))}</span>
+                        <span style="font-size:10px;color:{text_muted};margin-left:8px">{_esc(sp.get("stage", "").title())}</span>
                     </div>
                     <span style="font-size:11px;font-weight:600;color:{urgency_color}">{days}d</span>
                 </div>
@@ -2282,19 +2631,19 @@ def _build_monday_pipeline(data: dict) -> str:
             remaining = len(stale) - STALE_LIMIT
             stale_more = f'''<div style="text-align:center;padding:8px">
                 <button id="stale-show-more" onclick="toggleExpandList('stale-extra-row','stale-show-more',{len(stale)},{STALE_LIMIT})"
-                    style="background:none;border:1px solid {COLORS['card_border']};border-radius:8px;
-                    padding:5px 16px;color:{COLORS['text_muted']};font-size:11px;font-weight:600;
+                    style="background:none;border:1px solid {card_border};border-radius:8px;
+                    padding:5px 16px;color:{text_muted};font-size:11px;font-weight:600;
                     cursor:pointer">Show all {len(stale)} ({remaining} more)</button>
             </div>'''
-        html += f'''<div class="glass-card" style="margin-top:8px">
+        parts.append(f'''<div class="glass-card" style="margin-top:8px">
             <h3 class="card-title">Previous Projects ({len(stale)})</h3>
-            <p style="font-size:11px;color:{COLORS['text_muted']};margin-bottom:6px">Closed, completed, or inactive — no updates in 14+ days</p>
+            <p style="font-size:11px;color:{text_muted};margin-bottom:6px">Closed, completed, or inactive — no updates in 14+ days</p>
             {stale_html}
             {stale_more}
-        </div>'''
+        </div>''')
 
     # ── Filter and board toggle JavaScript ──
-    html += '''<script>
+    parts.append('''<script>
     (function(){
         var rows = document.querySelectorAll('.monday-row');
         var owners = new Set(), stages = new Set();
@@ -2375,25 +2724,31 @@ def _build_monday_pipeline(data: dict) -> str:
             btn.setAttribute('data-expanded', '1');
         }
     };
-    </script>'''
+    </script>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_monday_ic(data: dict) -> str:
     """IC Scorecards page — Gate score breakdowns, category scores, trend, decision distribution."""
+    text = COLORS["text"]
+    text_muted = COLORS["text_muted"]
+    card = COLORS["card"]
+    card_border = COLORS["card_border"]
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
     monday = data.get("monday", {})
     if not monday:
         return '<section class="dashboard-section"><div class="glass-card" style="padding:40px;text-align:center;color:#6b7280"><p>No Monday.com data available.</p></div></section>'
 
     ic = monday.get("ic_metrics", {})
 
-    html = _section_header(
+    parts = [_section_header(
         "monday-ic", "IC Scorecards",
         "Investment Committee scoring — gate scores, trends, and decision tracking (dormant items hidden)",
         "\U0001F4CB",
-    )
+    )]
 
     # ── IC Deal Flow Filter Buttons ──
     ic_flow_stages = [
@@ -2412,7 +2767,7 @@ def _build_monday_ic(data: dict) -> str:
     ic_flow_html = f'<div class="glass-card" style="margin-bottom:10px;padding:10px 14px">'
     ic_flow_html += f'<div style="display:flex;justify-content:space-between;align-items:flex-start;flex-wrap:wrap;gap:12px">'
     ic_flow_html += '<div style="flex:1;min-width:300px">'
-    ic_flow_html += f'<div style="font-size:11px;font-weight:700;text-transform:uppercase;letter-spacing:0.06em;color:{COLORS["text_muted"]};margin-bottom:10px">IC Gate Progression — Click to Filter</div>'
+    ic_flow_html += f'<div style="font-size:11px;font-weight:700;text-transform:uppercase;letter-spacing:0.06em;color:{text_muted};margin-bottom:10px">IC Gate Progression — Click to Filter</div>'
     ic_flow_html += '<div style="display:flex;flex-wrap:wrap;gap:6px;align-items:center">'
     for i, (stage_key, stage_label, stage_color) in enumerate(ic_flow_stages):
         is_all = stage_key == "all"
@@ -2423,7 +2778,7 @@ def _build_monday_ic(data: dict) -> str:
             f'style="display:inline-flex;align-items:center;gap:5px;padding:6px 14px;'
             f'border-radius:20px;font-size:12px;font-weight:600;cursor:pointer;'
             f'transition:all 0.2s ease;font-family:inherit;white-space:nowrap;'
-            f'border:1px solid {COLORS["card_border"]};background:{COLORS["card"]};color:{COLORS["text_muted"]}">'
+            f'border:1px solid {card_border};background:{card};color:{text_muted}">'
         )
         if not is_all:
             ic_flow_html += (
@@ -2441,15 +2796,15 @@ def _build_monday_ic(data: dict) -> str:
             ic_flow_html += f'<span style="color:#d1d5db;font-size:12px;margin:0 2px">|</span>'
     ic_flow_html += '</div></div>'
     # IC Scorecard data source info
-    ic_flow_html += f'''<div style="text-align:right;font-size:11px;color:{COLORS["text_muted"]};flex-shrink:0">
+    ic_flow_html += f'''<div style="text-align:right;font-size:11px;color:{text_muted};flex-shrink:0">
         <div style="font-weight:600;margin-bottom:2px">IC Scorecard Data</div>
         <div>Source: Monday.com M&amp;A Boards</div>
         <div>Metrics: <a href="javascript:void(0)" onclick="window.open('data/processed/monday_metrics.json','_blank')"
-            style="color:{COLORS["accent"]};text-decoration:none">monday_metrics.json</a></div>
-        <div id="ic-filter-status" style="margin-top:6px;font-weight:600;color:{COLORS["accent"]}"></div>
+            style="color:{accent};text-decoration:none">monday_metrics.json</a></div>
+        <div id="ic-filter-status" style="margin-top:6px;font-weight:600;color:{accent}"></div>
     </div>'''
     ic_flow_html += '</div></div>'
-    html += ic_flow_html
+    parts.append(ic_flow_html)
 
     # ── Filter & sort IC items ──
     top_scored = ic.get("top_scored", [])
@@ -2468,14 +2823,14 @@ def _build_monday_ic(data: dict) -> str:
     decisions = ic.get("decision_distribution", {})
     total_decisions = sum(decisions.values()) if decisions else 0
 
-    html += '<div class="kpi-grid kpi-grid-3">'
-    html += _stat_card("IC Scored Items", _fmt_number(len(top_scored)),
-                       f"Avg: {ic_avg:.1f} | {dormant_ic} dormant hidden", "\U0001F4CB", MONDAY_PURPLE)
-    html += _stat_card("Average IC Score", f"{ic_avg:.1f}",
-                       f"Range: {ic_min:.1f} — {ic_max:.1f}", "\U0001F4CA", COLORS['accent2'])
-    html += _stat_card("IC Decisions", _fmt_number(total_decisions),
-                       f"{len(decisions)} outcome types", "\U0001F3DB\uFE0F", COLORS['accent4'])
-    html += '</div>'
+    parts.append('<div class="kpi-grid kpi-grid-3">')
+    parts.append(_stat_card("IC Scored Items", _fmt_number(len(top_scored)),
+                            f"Avg: {ic_avg:.1f} | {dormant_ic} dormant hidden", "\U0001F4CB", MONDAY_PURPLE))
+    parts.append(_stat_card("Average IC Score", f"{ic_avg:.1f}",
+                            f"Range: {ic_min:.1f} — {ic_max:.1f}", "\U0001F4CA", accent2))
+    parts.append(_stat_card("IC Decisions", _fmt_number(total_decisions),
+                            f"{len(decisions)} outcome types", "\U0001F3DB\uFE0F", COLORS['accent4']))
+    parts.append('</div>')
 
     # ── IC Scorecard with Gate Breakdown + Expandable Project Detail ──
     if top_scored:
@@ -2524,7 +2879,7 @@ def _build_monday_ic(data: dict) -> str:
 
             bar_html = f'''<div style="display:flex;align-items:center;gap:4px">
                 <span style="font-weight:700;color:{score_color};font-size:13px">{total:.1f}</span>
-                <div style="flex:1;height:4px;background:{COLORS['card_border']};border-radius:2px;overflow:hidden;max-width:36px">
+                <div style="flex:1;height:4px;background:{card_border};border-radius:2px;overflow:hidden;max-width:36px">
                     <div style="height:100%;width:{pct:.0f}%;background:{score_color};border-radius:2px"></div>
                 </div>
             </div>'''
@@ -2536,13 +2891,13 @@ def _build_monday_ic(data: dict) -> str:
                 f'onclick="toggleICDetail(\'{detail_id}\')" '
                 f'style="grid-template-columns:2fr 70px 110px 1fr 90px 70px 20px'
                 f'{";display:none" if idx >= IC_LIMIT else ""}">'
-                f'<div style="font-weight:500;color:{COLORS["text"]}">'
-                f'{name}<span style="font-size:10px;color:{COLORS["text_muted"]};margin-left:6px">(avg {avg:.1f})</span></div>'
+                f'<div style="font-weight:500;color:{text}">'
+                f'{name}<span style="font-size:10px;color:{text_muted};margin-left:6px">(avg {avg:.1f})</span></div>'
                 f'<div>{bar_html}</div>'
                 f'<div>{_monday_stage_badge(status) if status else "<span style=\'color:#64748b\'>—</span>"}</div>'
                 f'<div style="display:flex;flex-wrap:wrap;gap:2px">{gate_html}</div>'
-                f'<div style="font-size:11px;color:{COLORS["text_muted"]}">{owner}</div>'
-                f'<div style="font-size:10px;color:{COLORS["text_muted"]}">{updated_short}</div>'
+                f'<div style="font-size:11px;color:{text_muted}">{owner}</div>'
+                f'<div style="font-size:10px;color:{text_muted}">{updated_short}</div>'
                 f'<div class="ic-expand-arrow" id="{detail_id}_arrow">&#9654;</div>'
                 f'</div>'
             )
@@ -2596,12 +2951,12 @@ def _build_monday_ic(data: dict) -> str:
                     body = u.get("body", "")[:300]
                     creator = u.get("creator", "")
                     udate = (u.get("created_at") or "")[:10]
-                    notes_html += f'''<div style="padding:4px 0;border-bottom:1px solid {COLORS['card_border']}">
-                        <div style="font-size:10px;color:{COLORS['text_muted']}">{_esc(creator)} &middot; {udate}</div>
-                        <div style="font-size:12px;color:{COLORS['text']};margin-top:2px">{_esc(body)}</div>
+                    notes_html += f'''<div style="padding:4px 0;border-bottom:1px solid {card_border}">
+                        <div style="font-size:10px;color:{text_muted}">{_esc(creator)} &middot; {udate}</div>
+                        <div style="font-size:12px;color:{text};margin-top:2px">{_esc(body)}</div>
                     </div>'''
             else:
-                notes_html = f'<div style="font-size:11px;color:{COLORS["text_muted"]};font-style:italic">No notes or updates recorded</div>'
+                notes_html = f'<div style="font-size:11px;color:{text_muted};font-style:italic">No notes or updates recorded</div>'
 
             # Subitems / Tasks
             tasks_html = ""
@@ -2612,11 +2967,11 @@ def _build_monday_ic(data: dict) -> str:
                     check_icon = "&#10003;" if done else ""
                     tasks_html += f'''<div class="ic-task-item">
                         <span class="{check_cls}">{check_icon}</span>
-                        <span style="color:{COLORS['text'] if not done else COLORS['text_muted']};{'text-decoration:line-through' if done else ''}">{_esc(si.get("name", ""))}</span>
-                        {f'<span style="font-size:10px;color:{COLORS["text_muted"]};margin-left:auto">{_esc(si.get("status", ""))}</span>' if si.get("status") else ""}
+                        <span style="color:{text if not done else text_muted};{'text-decoration:line-through' if done else ''}">{_esc(si.get("name", ""))}</span>
+                        {f'<span style="font-size:10px;color:{text_muted};margin-left:auto">{_esc(si.get("status", ""))}</span>' if si.get("status") else ""}
                     </div>'''
             else:
-                tasks_html = f'<div style="font-size:11px;color:{COLORS["text_muted"]};font-style:italic">No sub-tasks defined</div>'
+                tasks_html = f'<div style="font-size:11px;color:{text_muted};font-style:italic">No sub-tasks defined</div>'
 
             # Gap Flags — flag missing information
             gaps = []
@@ -2712,25 +3067,25 @@ def _build_monday_ic(data: dict) -> str:
         ic_more = ""
         if len(top_scored) > IC_LIMIT:
             remaining = len(top_scored) - IC_LIMIT
-            ic_more = f'''<div style="text-align:center;padding:10px;border-top:1px solid {COLORS['card_border']}">
+            ic_more = f'''<div style="text-align:center;padding:10px;border-top:1px solid {card_border}">
                 <button id="ic-show-more" onclick="toggleExpandList('ic-extra-row','ic-show-more',{len(top_scored)},{IC_LIMIT})"
-                    style="background:none;border:1px solid {COLORS['card_border']};border-radius:8px;
-                    padding:6px 20px;color:{COLORS['accent2']};font-size:12px;font-weight:600;
+                    style="background:none;border:1px solid {card_border};border-radius:8px;
+                    padding:6px 20px;color:{accent2};font-size:12px;font-weight:600;
                     cursor:pointer;transition:all 0.2s ease">
                     Show all {len(top_scored)} items ({remaining} more)
                 </button>
             </div>'''
 
-        html += f'''<div class="glass-card" style="margin-top:8px;padding:0;overflow:hidden;border-top:3px solid {MONDAY_PURPLE}">
-            <div style="padding:10px 16px;border-bottom:1px solid {COLORS['card_border']}">
+        parts.append(f'''<div class="glass-card" style="margin-top:8px;padding:0;overflow:hidden;border-top:3px solid {MONDAY_PURPLE}">
+            <div style="padding:10px 16px;border-bottom:1px solid {card_border}">
                 <h3 class="card-title" style="margin-bottom:0;display:flex;align-items:center;gap:6px;font-size:13px">
                     <span style="color:{MONDAY_PURPLE}">\U0001F4CB</span> IC Scorecard — Click a project to expand details
                 </h3>
-                <p style="font-size:10px;color:{COLORS['text_muted']};margin-top:2px">Sorted by most recently updated &middot; {len(top_scored)} projects &middot; click row for context, notes, next steps &amp; gaps</p>
+                <p style="font-size:10px;color:{text_muted};margin-top:2px">Sorted by most recently updated &middot; {len(top_scored)} projects &middot; click row for context, notes, next steps &amp; gaps</p>
             </div>
             {board_html}
             {ic_more}
-        </div>'''
+        </div>''')
 
     # ── IC Category Scores ──
     cat_scores = ic.get("category_scores", {})
@@ -2739,35 +3094,35 @@ def _build_monday_ic(data: dict) -> str:
                     for name, stats in sorted(cat_scores.items(),
                                               key=lambda x: x[1].get("avg", 0), reverse=True)]
         if cat_data:
-            html += f'''<div class="glass-card" style="margin-top:8px">
+            parts.append(f'''<div class="glass-card" style="margin-top:8px">
                 <h3 class="card-title">\U0001F4CA IC Score by Category (Averages)</h3>
                 {_svg_bar_chart(cat_data, 650, max(140, len(cat_data) * 28), MONDAY_PURPLE)}
-            </div>'''
+            </div>''')
 
     # ── Charts row: Trend + Decision Distribution ──
     score_trend = ic.get("score_trend", {})
     if score_trend or decisions:
-        html += '<div class="grid-2" style="margin-top:8px">'
+        parts.append('<div class="grid-2" style="margin-top:8px">')
         if score_trend:
             trend_data = [(month, stats.get("avg_score", 0))
                           for month, stats in sorted(score_trend.items())]
             if trend_data:
-                html += f'''<div class="glass-card">
+                parts.append(f'''<div class="glass-card">
                     <h3 class="card-title">\U0001F4C8 IC Score Trend (Monthly Avg)</h3>
                     {_svg_line_chart(trend_data, 500, 150, MONDAY_PURPLE)}
-                </div>'''
+                </div>''')
         if decisions:
             decision_data = [(k, v) for k, v in sorted(decisions.items(),
-                                                        key=lambda x: x[1], reverse=True)]
-            html += f'''<div class="glass-card">
+                                                        key=itemgetter(1), reverse=True)]
+            parts.append(f'''<div class="glass-card">
                 <h3 class="card-title">\U0001F3DB\uFE0F IC Decision Distribution</h3>
                 {_svg_donut(decision_data, 150)}
-            </div>'''
-        html += '</div>'
+            </div>''')
+        parts.append('</div>')
 
     # ── IC Detail Toggle + Stage Filter JavaScript ──
-    ic_stage_counts_json = json.dumps(ic_stage_counts if top_scored else {})
-    html += f'''<script>
+    ic_stage_counts_json = _json_embed(ic_stage_counts if top_scored else {})
+    parts.append(f'''<script>
     // Toggle IC project detail panel
     window.toggleICDetail = function(id) {{
         var el = document.getElementById(id);
@@ -2851,15 +3206,15 @@ def _build_monday_ic(data: dict) -> str:
                 var btnStage = btn.getAttribute('data-ic-filter');
                 if (btnStage === stage) {{
                     btn.classList.add('ic-stage-active');
-                    btn.style.background = '{COLORS["accent"]}';
+                    btn.style.background = '{accent}';
                     btn.style.color = '#fff';
-                    btn.style.borderColor = '{COLORS["accent"]}';
+                    btn.style.borderColor = '{accent}';
                     btn.style.boxShadow = '0 2px 8px rgba(60,180,173,0.25)';
                 }} else {{
                     btn.classList.remove('ic-stage-active');
-                    btn.style.background = '{COLORS["card"]}';
-                    btn.style.color = '{COLORS["text_muted"]}';
-                    btn.style.borderColor = '{COLORS["card_border"]}';
+                    btn.style.background = '{card}';
+                    btn.style.color = '{text_muted}';
+                    btn.style.borderColor = '{card_border}';
                     btn.style.boxShadow = 'none';
                 }}
             }});
@@ -2879,31 +3234,35 @@ def _build_monday_ic(data: dict) -> str:
         // Initial: set "All" as active on page load
         var allBtn = document.querySelector('.ic-stage-btn.ic-stage-active');
         if (allBtn) {{
-            allBtn.style.background = '{COLORS["accent"]}';
+            allBtn.style.background = '{accent}';
             allBtn.style.color = '#fff';
-            allBtn.style.borderColor = '{COLORS["accent"]}';
+            allBtn.style.borderColor = '{accent}';
             allBtn.style.boxShadow = '0 2px 8px rgba(60,180,173,0.25)';
         }}
     }})();
-    </script>'''
+    </script>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 def _build_monday_workspaces(data: dict) -> str:
     """Workspaces page — board overview by workspace with collapsible groups, dormant filtered."""
+    text_muted = COLORS["text_muted"]
+    card_border = COLORS["card_border"]
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
     monday = data.get("monday", {})
     if not monday:
         return '<section class="dashboard-section"><div class="glass-card" style="padding:40px;text-align:center;color:#6b7280"><p>No Monday.com data available.</p></div></section>'
 
     overview = monday.get("board_overview", {})
 
-    html = _section_header(
+    parts = [_section_header(
         "monday-workspaces", "Workspaces",
         "Monday.com workspace and board overview — sorted by activity, dormant workspaces hidden",
         "\U0001F3E2",
-    )
+    )]
 
     # ── Filter dormant workspaces (all items inactive for 5+ months) ──
     workspaces_raw = overview.get("workspaces", [])
@@ -2918,21 +3277,21 @@ def _build_monday_workspaces(data: dict) -> str:
     total_items = sum(ws.get("total_items", 0) for ws in active_workspaces)
     total_active = sum(ws.get("active_items", 0) for ws in active_workspaces)
 
-    html += '<div class="kpi-grid kpi-grid-3">'
-    html += _stat_card("Active Workspaces", _fmt_number(ws_count),
-                       f"{dormant_ws} dormant hidden", "\U0001F3E2", COLORS['accent2'])
-    html += _stat_card("Total Items", _fmt_number(total_items),
-                       f"{_fmt_number(total_active)} active", "\U0001F4CA", COLORS['accent'])
-    html += _stat_card("Filtered Out", _fmt_number(filtered_out),
-                       "Sub-item boards removed", "\U0001F50D", COLORS['text_muted'])
-    html += '</div>'
+    parts.append('<div class="kpi-grid kpi-grid-3">')
+    parts.append(_stat_card("Active Workspaces", _fmt_number(ws_count),
+                            f"{dormant_ws} dormant hidden", "\U0001F3E2", accent2))
+    parts.append(_stat_card("Total Items", _fmt_number(total_items),
+                            f"{_fmt_number(total_active)} active", "\U0001F4CA", accent))
+    parts.append(_stat_card("Filtered Out", _fmt_number(filtered_out),
+                            "Sub-item boards removed", "\U0001F50D", text_muted))
+    parts.append('</div>')
 
     # ── Workspace board-style listing (show 10 with expand) ──
     if active_workspaces:
         # Sort workspaces by active items desc (most active first)
         active_workspaces.sort(key=lambda ws: ws.get("active_items", 0), reverse=True)
 
-        ws_colors = [MONDAY_PURPLE, COLORS['accent2'], MONDAY_GREEN, COLORS['accent'],
+        ws_colors = [MONDAY_PURPLE, accent2, MONDAY_GREEN, accent,
                      MONDAY_YELLOW, COLORS['accent3'], COLORS['info'], COLORS['accent4'],
                      "#E2445C", "#FF642E", "#579BFC", "#CAB641"]
 
@@ -2977,7 +3336,7 @@ def _build_monday_workspaces(data: dict) -> str:
                     b_items = b.get("item_count", 0)
                     b_active = b.get("active_items", 0)
                     active_pct = (b_active / b_items * 100) if b_items > 0 else 0
-                    bar_color = MONDAY_GREEN if active_pct >= 50 else (MONDAY_YELLOW if active_pct >= 20 else COLORS['text_muted'])
+                    bar_color = MONDAY_GREEN if active_pct >= 50 else (MONDAY_YELLOW if active_pct >= 20 else text_muted)
 
                     board_html += f'''<div class="board-row" style="grid-template-columns:2fr 100px 100px">
                         <div style="font-weight:500;color:{COLORS['text']}">{b_name}</div>
@@ -2997,32 +3356,32 @@ def _build_monday_workspaces(data: dict) -> str:
         ws_more = ""
         if len(active_workspaces) > WS_LIMIT:
             remaining = len(active_workspaces) - WS_LIMIT
-            ws_more = f'''<div style="text-align:center;padding:12px;border-top:1px solid {COLORS['card_border']}">
+            ws_more = f'''<div style="text-align:center;padding:12px;border-top:1px solid {card_border}">
                 <button id="ws-show-more" onclick="toggleExpandList('ws-extra-group','ws-show-more',{len(active_workspaces)},{WS_LIMIT})"
-                    style="background:none;border:1px solid {COLORS['card_border']};border-radius:8px;
-                    padding:8px 24px;color:{COLORS['accent2']};font-size:13px;font-weight:600;
+                    style="background:none;border:1px solid {card_border};border-radius:8px;
+                    padding:8px 24px;color:{accent2};font-size:13px;font-weight:600;
                     cursor:pointer;transition:all 0.2s ease">
                     Show all {len(active_workspaces)} workspaces ({remaining} more)
                 </button>
             </div>'''
 
-        html += f'''<div class="glass-card" style="margin-top:8px;padding:0;overflow:hidden">
-            <div style="padding:10px 14px;border-bottom:1px solid {COLORS['card_border']}">
+        parts.append(f'''<div class="glass-card" style="margin-top:8px;padding:0;overflow:hidden">
+            <div style="padding:10px 14px;border-bottom:1px solid {card_border}">
                 <h3 class="card-title" style="margin-bottom:0">\U0001F3E2 Active Workspaces
-                    <span style="font-size:13px;font-weight:400;color:{COLORS['text_muted']}">
+                    <span style="font-size:13px;font-weight:400;color:{text_muted}">
                         ({len(active_workspaces)} active, {dormant_ws} dormant hidden)
                     </span>
                 </h3>
-                <p style="font-size:11px;color:{COLORS['text_muted']};margin-top:4px">
+                <p style="font-size:11px;color:{text_muted};margin-top:4px">
                     Sorted by most active &middot; Click to expand &middot; Showing {min(WS_LIMIT, len(active_workspaces))} of {len(active_workspaces)}
                 </p>
             </div>
             {board_html}
             {ws_more}
-        </div>'''
+        </div>''')
 
     # ── toggleBoardGroup JS (shared) ──
-    html += '''<script>
+    parts.append('''<script>
     if(!window.toggleBoardGroup) {
         window.toggleBoardGroup = function(id){
             var el = document.getElementById(id);
@@ -3055,10 +3414,10 @@ def _build_monday_workspaces(data: dict) -> str:
             }
         };
     }
-    </script>'''
+    </script>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 # ---------------------------------------------------------------------------
@@ -3082,16 +3441,19 @@ AI_CATEGORY_LABELS = {
 
 def _build_ai_section(data: dict) -> str:
     """AI Roadmap & Tasks page — eComplete AI workspace boards."""
+    text = COLORS["text"]
+    text_muted = COLORS["text_muted"]
+    card_border = COLORS["card_border"]
     monday = data.get("monday", {})
     ai = monday.get("ai_metrics", {})
     if not ai or not ai.get("total_items"):
         return '''<section class="dashboard-section"><div class="glass-card" style="padding:30px;text-align:center;color:#6b7280"><p>No AI workspace data available. Ensure the eComplete AI workspace exists in Monday.com.</p></div></section>'''
 
-    html = _section_header(
+    parts = [_section_header(
         "ai-roadmap", "AI Roadmap & Tasks",
         "eComplete AI Committee — initiatives, tools, knowledge, meetings, and project tracking",
         "\U0001F916",
-    )
+    )]
 
     total_items = ai.get("total_items", 0)
     boards = ai.get("boards", [])
@@ -3099,26 +3461,26 @@ def _build_ai_section(data: dict) -> str:
     status_dist = ai.get("status_distribution", {})
 
     # ── KPI row ──
-    html += '<div class="kpi-grid">'
-    html += _stat_card("AI Items", _fmt_number(total_items),
-                       f"Across {len(boards)} boards", "\U0001F916", AI_TEAL)
-    html += _stat_card("Initiatives", _fmt_number(len(categories.get("initiatives", {}).get("items", []))),
-                       "", "\U0001F680", AI_BLUE)
-    html += _stat_card("Tools Tracked", _fmt_number(len(categories.get("tools", {}).get("items", []))),
-                       "", "\U0001F6E0\uFE0F", "#a78bfa")
-    html += _stat_card("Active Projects", _fmt_number(len(categories.get("active_projects", {}).get("items", []))),
-                       "", "\u2699\uFE0F", "#22c55e")
-    html += '</div>'
+    parts.append('<div class="kpi-grid">')
+    parts.append(_stat_card("AI Items", _fmt_number(total_items),
+                            f"Across {len(boards)} boards", "\U0001F916", AI_TEAL))
+    parts.append(_stat_card("Initiatives", _fmt_number(len(categories.get("initiatives", {}).get("items", []))),
+                            "", "\U0001F680", AI_BLUE))
+    parts.append(_stat_card("Tools Tracked", _fmt_number(len(categories.get("tools", {}).get("items", []))),
+                            "", "\U0001F6E0\uFE0F", "#a78bfa"))
+    parts.append(_stat_card("Active Projects", _fmt_number(len(categories.get("active_projects", {}).get("items", []))),
+                            "", "\u2699\uFE0F", "#22c55e"))
+    parts.append('</div>')
 
     # ── Status distribution ──
     if status_dist:
-        status_items = sorted(status_dist.items(), key=lambda x: x[1], reverse=True)
+        status_items = heapq.nlargest(10, status_dist.items(), key=itemgetter(1))
         max_status = max(status_dist.values()) if status_dist else 1
-        html += f'''<div class="glass-card" style="margin-top:10px">
-            <h3 class="card-title">Status Distribution</h3>'''
-        for s_name, s_count in status_items[:10]:
-            html += _svg_horizontal_bar(s_name, s_count, max_status, AI_TEAL, show_pct=False)
-        html += '</div>'
+        parts.append(f'''<div class="glass-card" style="margin-top:10px">
+            <h3 class="card-title">Status Distribution</h3>''')
+        for s_name, s_count in status_items:
+            parts.append(_svg_horizontal_bar(s_name, s_count, max_status, AI_TEAL, show_pct=False))
+        parts.append('</div>')
 
     # ── Category boards with expandable items ──
     ai_detail_idx = 0
@@ -3140,10 +3502,10 @@ def _build_ai_section(data: dict) -> str:
             status_bg = f"{cat_color}22"
             items_html += (
                 f'<div class="ai-item-row" onclick="toggleAIDetail(\'{detail_id}\')">'
-                f'<div style="font-weight:500;color:{COLORS["text"]}">{i_name}</div>'
+                f'<div style="font-weight:500;color:{text}">{i_name}</div>'
                 f'<div><span class="status-pill" style="background:{status_bg};color:{cat_color};padding:2px 8px;min-width:auto;font-size:10px">{i_status or "—"}</span></div>'
-                f'<div style="font-size:11px;color:{COLORS["text_muted"]}">{i_owner}</div>'
-                f'<div style="font-size:11px;color:{COLORS["text_muted"]}">{i_updated}</div>'
+                f'<div style="font-size:11px;color:{text_muted}">{i_owner}</div>'
+                f'<div style="font-size:11px;color:{text_muted}">{i_updated}</div>'
                 f'</div>'
             )
 
@@ -3164,12 +3526,12 @@ def _build_ai_section(data: dict) -> str:
             det_notes = ""
             if updates:
                 for u in updates[:3]:
-                    det_notes += f'''<div style="padding:3px 0;border-bottom:1px solid {COLORS['card_border']}">
-                        <div style="font-size:10px;color:{COLORS['text_muted']}">{_esc(u.get("creator",""))} &middot; {(u.get("created_at","") or "")[:10]}</div>
-                        <div style="font-size:12px;color:{COLORS['text']};margin-top:1px">{_esc(u.get("body","")[:200])}</div>
+                    det_notes += f'''<div style="padding:3px 0;border-bottom:1px solid {card_border}">
+                        <div style="font-size:10px;color:{text_muted}">{_esc(u.get("creator",""))} &middot; {(u.get("created_at","") or "")[:10]}</div>
+                        <div style="font-size:12px;color:{text};margin-top:1px">{_esc(u.get("body","")[:200])}</div>
                     </div>'''
             else:
-                det_notes = f'<span style="font-size:11px;color:{COLORS["text_muted"]};font-style:italic">No updates</span>'
+                det_notes = f'<span style="font-size:11px;color:{text_muted};font-style:italic">No updates</span>'
 
             det_tasks = ""
             if subitems:
@@ -3181,12 +3543,12 @@ def _build_ai_section(data: dict) -> str:
                         <span>{_esc(si.get("name",""))}</span>
                     </div>'''
             else:
-                det_tasks = f'<span style="font-size:11px;color:{COLORS["text_muted"]};font-style:italic">No sub-tasks</span>'
+                det_tasks = f'<span style="font-size:11px;color:{text_muted};font-style:italic">No sub-tasks</span>'
 
             items_html += f'''<div class="ai-item-detail" id="{detail_id}">
                 <div class="ic-detail-grid">
                     <div class="ic-detail-section">
-                        <h4>Details</h4>{det_cols if det_cols else f'<span style="font-size:11px;color:{COLORS["text_muted"]}">No additional data</span>'}
+                        <h4>Details</h4>{det_cols if det_cols else f'<span style="font-size:11px;color:{text_muted}">No additional data</span>'}
                     </div>
                     <div>
                         <div class="ic-detail-section">
@@ -3197,19 +3559,19 @@ def _build_ai_section(data: dict) -> str:
                 </div>
             </div>'''
 
-        html += f'''<div class="glass-card" style="margin-top:10px;padding:0;overflow:hidden;border-left:3px solid {cat_color}">
-            <div style="padding:10px 14px;border-bottom:1px solid {COLORS['card_border']};display:flex;justify-content:space-between;align-items:center">
+        parts.append(f'''<div class="glass-card" style="margin-top:10px;padding:0;overflow:hidden;border-left:3px solid {cat_color}">
+            <div style="padding:10px 14px;border-bottom:1px solid {card_border};display:flex;justify-content:space-between;align-items:center">
                 <h3 class="card-title" style="margin-bottom:0;font-size:13px">{cat_icon} {cat_label}
-                    <span style="font-size:11px;font-weight:400;color:{COLORS['text_muted']}">({len(cat_items)} items)</span>
+                    <span style="font-size:11px;font-weight:400;color:{text_muted}">({len(cat_items)} items)</span>
                 </h3>
             </div>
             <div class="board-container" style="border:none;border-radius:0">
-                <div style="display:grid;grid-template-columns:2fr 120px 100px 120px;padding:4px 12px;font-size:10px;font-weight:600;color:{COLORS['text_muted']};text-transform:uppercase;letter-spacing:0.04em;background:{COLORS['surface2']};border-bottom:1px solid {COLORS['card_border']}">
+                <div style="display:grid;grid-template-columns:2fr 120px 100px 120px;padding:4px 12px;font-size:10px;font-weight:600;color:{text_muted};text-transform:uppercase;letter-spacing:0.04em;background:{COLORS['surface2']};border-bottom:1px solid {card_border}">
                     <div>Item</div><div>Status</div><div>Owner</div><div>Updated</div>
                 </div>
                 {items_html}
             </div>
-        </div>'''
+        </div>''')
 
     # ── Board overview list ──
     if boards:
@@ -3220,25 +3582,25 @@ def _build_ai_section(data: dict) -> str:
             b_label, b_color, _ = AI_CATEGORY_LABELS.get(b_cat, ("Other", "#6b7280", ""))
             b_count = b.get("item_count", 0)
             b_owners = ", ".join(b.get("owners", [])[:3]) or "—"
-            board_rows += f'''<div style="display:flex;justify-content:space-between;align-items:center;padding:6px 0;border-bottom:1px solid {COLORS['card_border']}">
+            board_rows += f'''<div style="display:flex;justify-content:space-between;align-items:center;padding:6px 0;border-bottom:1px solid {card_border}">
                 <div>
                     <span style="display:inline-block;width:8px;height:8px;border-radius:50%;background:{b_color};margin-right:6px"></span>
-                    <span style="font-size:12px;font-weight:500;color:{COLORS['text']}">{b_name}</span>
-                    <span style="font-size:10px;color:{COLORS['text_muted']};margin-left:6px">{b_label}</span>
+                    <span style="font-size:12px;font-weight:500;color:{text}">{b_name}</span>
+                    <span style="font-size:10px;color:{text_muted};margin-left:6px">{b_label}</span>
                 </div>
                 <div style="text-align:right">
-                    <span style="font-size:12px;font-weight:600;color:{COLORS['text']}">{b_count}</span>
-                    <span style="font-size:10px;color:{COLORS['text_muted']};margin-left:8px">{_esc(b_owners)}</span>
+                    <span style="font-size:12px;font-weight:600;color:{text}">{b_count}</span>
+                    <span style="font-size:10px;color:{text_muted};margin-left:8px">{_esc(b_owners)}</span>
                 </div>
             </div>'''
 
-        html += f'''<div class="glass-card" style="margin-top:10px">
+        parts.append(f'''<div class="glass-card" style="margin-top:10px">
             <h3 class="card-title">AI Boards Overview</h3>
             {board_rows}
-        </div>'''
+        </div>''')
 
     # ── AI Detail toggle JS ──
-    html += '''<script>
+    parts.append('''<script>
     window.toggleAIDetail = function(id) {
         var el = document.getElementById(id);
         if (!el) return;
@@ -3248,18 +3610,22 @@ def _build_ai_section(data: dict) -> str:
         });
         el.classList.toggle('open');
     };
-    </script>'''
+    </script>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 # ---------------------------------------------------------------------------
 # CSS stylesheet
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=1)
 def _build_css() -> str:
-    """Build the complete CSS for the dashboard — eComplete light theme."""
+    """Build the complete CSS for the dashboard — eComplete light theme.
+
+    Depends only on COLORS, so it is formatted once per process.
+    """
     return f'''
     <style>
         /* ============================================================
@@ -5688,14 +6054,20 @@ def _build_supabase_js() -> str:
 
 def _build_inbound_queue(data: dict) -> str:
     """Build the Inbound Queue page — prioritised action inbox from all sources."""
-    queue_file = BASE_DIR / "data" / "processed" / "inbound_queue.json"
+    text = COLORS["text"]
+    text_muted = COLORS["text_muted"]
+    card_border = COLORS["card_border"]
+    surface2 = COLORS["surface2"]
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
+    accent4 = COLORS["accent4"]
+    danger = COLORS["danger"]
+    warning = COLORS["warning"]
     queue: dict = {}
-    if queue_file.exists():
-        try:
-            with open(queue_file, "r", encoding="utf-8") as f:
-                queue = json.load(f)
-        except Exception:
-            pass
+    try:
+        queue = _load_processed("inbound_queue.json") or {}
+    except Exception:
+        pass
 
     items = queue.get("items", [])
     summary = queue.get("summary", {})
@@ -5703,107 +6075,107 @@ def _build_inbound_queue(data: dict) -> str:
     by_category = summary.get("by_category", {})
     by_source = summary.get("by_source", {})
 
-    h = '<section class="dashboard-section">'
-    h += f'''<div class="section-header">
+    parts = ['<section class="dashboard-section">']
+    parts.append(f'''<div class="section-header">
         <h2 class="section-title">Inbound Queue</h2>
         <p class="section-subtitle">Prioritised action inbox — {summary.get("total", 0)} signals from HubSpot, Monday.com &amp; system alerts</p>
-    </div>'''
+    </div>''')
 
     # KPI row
     critical = by_priority.get("critical", 0)
     high = by_priority.get("high", 0)
     medium = by_priority.get("medium", 0)
     low = by_priority.get("low", 0)
-    h += '<div class="kpi-grid" style="grid-template-columns:repeat(4,1fr)">'
-    h += _stat_card("Critical", str(critical), "need immediate action", "&#9888;", COLORS["danger"])
-    h += _stat_card("High", str(high), "action today", "&#9650;", COLORS["warning"])
-    h += _stat_card("Medium", str(medium), "this week", "&#9679;", COLORS["accent"])
-    h += _stat_card("Low", str(low), "when convenient", "&#9660;", COLORS["accent4"])
-    h += '</div>'
+    parts.append('<div class="kpi-grid" style="grid-template-columns:repeat(4,1fr)">')
+    parts.append(_stat_card("Critical", str(critical), "need immediate action", "&#9888;", danger))
+    parts.append(_stat_card("High", str(high), "action today", "&#9650;", warning))
+    parts.append(_stat_card("Medium", str(medium), "this week", "&#9679;", accent))
+    parts.append(_stat_card("Low", str(low), "when convenient", "&#9660;", accent4))
+    parts.append('</div>')
 
     # Category breakdown
-    h += f'<div class="glass-card"><div class="card-title">Signal Categories</div>'
-    h += '<div style="display:flex;flex-wrap:wrap;gap:8px;margin-top:6px">'
+    parts.append(f'<div class="glass-card"><div class="card-title">Signal Categories</div>')
+    parts.append('<div style="display:flex;flex-wrap:wrap;gap:8px;margin-top:6px">')
     cat_colors = {
-        "stale_follow_up": COLORS["danger"], "new_lead": COLORS["success"],
-        "deal_update": COLORS["accent2"], "ic_review": COLORS["accent3"],
-        "nda_request": COLORS["accent5"], "web_signal": COLORS["accent"],
-        "alert": COLORS["warning"], "meeting_request": COLORS["info"],
+        "stale_follow_up": danger, "new_lead": COLORS["success"],
+        "deal_update": accent2, "ic_review": COLORS["accent3"],
+        "nda_request": COLORS["accent5"], "web_signal": accent,
+        "alert": warning, "meeting_request": COLORS["info"],
         "follow_up": COLORS["accent6"],
     }
     for cat, count in sorted(by_category.items(), key=lambda x: -x[1]):
-        cc = cat_colors.get(cat, COLORS["text_muted"])
+        cc = cat_colors.get(cat, text_muted)
         label = cat.replace("_", " ").title()
-        h += f'''<span style="font-size:11px;font-weight:600;color:{cc};
+        parts.append(f'''<span style="font-size:11px;font-weight:600;color:{cc};
             background:{cc}12;padding:4px 10px;border-radius:6px;
-            border:1px solid {cc}30">{label}: {count}</span>'''
-    h += '</div></div>'
+            border:1px solid {cc}30">{label}: {count}</span>''')
+    parts.append('</div></div>')
 
     # Source breakdown
-    h += f'<div class="glass-card"><div class="card-title">By Source</div>'
-    h += '<div style="display:flex;gap:16px;margin-top:6px">'
+    parts.append(f'<div class="glass-card"><div class="card-title">By Source</div>')
+    parts.append('<div style="display:flex;gap:16px;margin-top:6px">')
     src_icons = {"hubspot": "&#128200;", "monday": "&#128197;", "email": "&#9993;", "system": "&#9881;", "weekly": "&#128203;"}
     for src, count in sorted(by_source.items(), key=lambda x: -x[1]):
         icon = src_icons.get(src, "&#9679;")
-        h += f'''<div style="text-align:center;padding:10px 16px;background:{COLORS["surface2"]};
+        parts.append(f'''<div style="text-align:center;padding:10px 16px;background:{surface2};
             border-radius:8px;flex:1;min-width:80px">
             <div style="font-size:18px">{icon}</div>
-            <div style="font-size:18px;font-weight:700;color:{COLORS["text"]};margin:4px 0">{count}</div>
-            <div style="font-size:10px;color:{COLORS["text_muted"]};text-transform:capitalize">{src}</div>
-        </div>'''
-    h += '</div></div>'
+            <div style="font-size:18px;font-weight:700;color:{text};margin:4px 0">{count}</div>
+            <div style="font-size:10px;color:{text_muted};text-transform:capitalize">{src}</div>
+        </div>''')
+    parts.append('</div></div>')
 
     # Top items table — show critical + high priority items (max 50)
     top_items = [i for i in items if i.get("priority") in ("critical", "high")][:50]
     if not top_items:
         top_items = items[:30]
 
-    h += f'<div class="glass-card"><div class="card-title">Top Priority Items ({len(top_items)} shown)</div>'
-    h += f'''<div style="overflow-x:auto"><table style="width:100%;border-collapse:collapse;font-size:12px">
-        <thead><tr style="border-bottom:2px solid {COLORS["card_border"]};text-align:left">
-            <th style="padding:8px 6px;color:{COLORS["text_muted"]}">Priority</th>
-            <th style="padding:8px 6px;color:{COLORS["text_muted"]}">Category</th>
-            <th style="padding:8px 6px;color:{COLORS["text_muted"]}">Title</th>
-            <th style="padding:8px 6px;color:{COLORS["text_muted"]}">Entity</th>
-            <th style="padding:8px 6px;color:{COLORS["text_muted"]}">Action</th>
-            <th style="padding:8px 6px;color:{COLORS["text_muted"]}">Source</th>
-        </tr></thead><tbody>'''
-
-    p_colors = {"critical": COLORS["danger"], "high": COLORS["warning"], "medium": COLORS["accent"], "low": COLORS["accent4"]}
+    parts.append(f'<div class="glass-card"><div class="card-title">Top Priority Items ({len(top_items)} shown)</div>')
+    parts.append(f'''<div style="overflow-x:auto"><table style="width:100%;border-collapse:collapse;font-size:12px">
+        <thead><tr style="border-bottom:2px solid {card_border};text-align:left">
+            <th style="padding:8px 6px;color:{text_muted}">Priority</th>
+            <th style="padding:8px 6px;color:{text_muted}">Category</th>
+            <th style="padding:8px 6px;color:{text_muted}">Title</th>
+            <th style="padding:8px 6px;color:{text_muted}">Entity</th>
+            <th style="padding:8px 6px;color:{text_muted}">Action</th>
+            <th style="padding:8px 6px;color:{text_muted}">Source</th>
+        </tr></thead><tbody>''')
+
+    p_colors = {"critical": danger, "high": warning, "medium": accent, "low": accent4}
     for item in top_items:
         pri = item.get("priority", "medium")
-        pc = p_colors.get(pri, COLORS["text_muted"])
+        pc = p_colors.get(pri, text_muted)
         cat = item.get("category", "").replace("_", " ").title()
         title = item.get("title", "")[:60]
         entity = item.get("entity", "")[:30]
         action = item.get("recommended_action", "")[:40]
         source = item.get("source", "")
 
-        h += f'''<tr style="border-bottom:1px solid {COLORS["card_border"]}">
+        parts.append(f'''<tr style="border-bottom:1px solid {card_border}">
             <td style="padding:6px"><span style="font-size:10px;font-weight:700;color:{pc};
                 background:{pc}12;padding:2px 6px;border-radius:3px;text-transform:uppercase">{pri}</span></td>
-            <td style="padding:6px;color:{COLORS["text_muted"]}">{_esc(cat)}</td>
-            <td style="padding:6px;font-weight:500;color:{COLORS["text"]}">{_esc(title)}</td>
-            <td style="padding:6px;color:{COLORS["text_muted"]}">{_esc(entity)}</td>
-            <td style="padding:6px;color:{COLORS["accent2"]};font-size:11px">{_esc(action)}</td>
-            <td style="padding:6px;color:{COLORS["text_muted"]};text-transform:capitalize">{_esc(source)}</td>
-        </tr>'''
+            <td style="padding:6px;color:{text_muted}">{_esc(cat)}</td>
+            <td style="padding:6px;font-weight:500;color:{text}">{_esc(title)}</td>
+            <td style="padding:6px;color:{text_muted}">{_esc(entity)}</td>
+            <td style="padding:6px;color:{accent2};font-size:11px">{_esc(action)}</td>
+            <td style="padding:6px;color:{text_muted};text-transform:capitalize">{_esc(source)}</td>
+        </tr>''')
 
-    h += '</tbody></table></div></div>'
+    parts.append('</tbody></table></div></div>')
 
     # Remaining items by category (collapsed summary)
     remaining = len(items) - len(top_items)
     if remaining > 0:
-        h += f'''<div class="glass-card" style="background:{COLORS["surface2"]}">
-            <div style="font-size:12px;color:{COLORS["text_muted"]};text-align:center">
+        parts.append(f'''<div class="glass-card" style="background:{surface2}">
+            <div style="font-size:12px;color:{text_muted};text-align:center">
                 + {remaining} more items in queue &mdash; run
                 <code style="background:{COLORS["card"]};padding:2px 6px;border-radius:4px">python scripts/inbound_queue.py --top 100</code>
                 for full details
             </div>
-        </div>'''
+        </div>''')
 
-    h += '</section>'
-    return h
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 # ---------------------------------------------------------------------------
@@ -5812,14 +6184,18 @@ def _build_inbound_queue(data: dict) -> str:
 
 def _build_quick_actions(data: dict) -> str:
     """Build the Quick Actions page with email templates and recommended actions."""
-    actions_file = BASE_DIR / "data" / "processed" / "email_actions.json"
+    text = COLORS["text"]
+    text_muted = COLORS["text_muted"]
+    card_border = COLORS["card_border"]
+    accent = COLORS["accent"]
+    accent2 = COLORS["accent2"]
+    accent3 = COLORS["accent3"]
+    accent4 = COLORS["accent4"]
     actions: dict = {}
-    if actions_file.exists():
-        try:
-            with open(actions_file, "r", encoding="utf-8") as f:
-                actions = json.load(f)
-        except Exception:
-            pass
+    try:
+        actions = _load_processed("email_actions.json") or {}
+    except Exception:
+        pass
 
     templates = actions.get("scheduling_templates", [])
     quick_responses = actions.get("quick_responses", [])
@@ -5827,99 +6203,99 @@ def _build_quick_actions(data: dict) -> str:
     constraints = actions.get("scheduling_constraints", {})
     booking_link = actions.get("booking_link", "")
 
-    html = '<section class="dashboard-section">'
-    html += f'''<div class="section-header">
+    parts = ['<section class="dashboard-section">']
+    parts.append(f'''<div class="section-header">
         <h2 class="section-title">Quick Actions</h2>
         <p class="section-subtitle">Email templates, scheduling, and recommended actions</p>
-    </div>'''
+    </div>''')
 
     # KPIs
-    html += '<div class="kpi-grid" style="grid-template-columns:repeat(4,1fr)">'
-    html += _stat_card("Templates", str(len(templates)), "scheduling", "", COLORS["accent"])
-    html += _stat_card("Quick Responses", str(len(quick_responses)), "pre-built", "", COLORS["accent2"])
-    html += _stat_card("Suggested Actions", str(len(suggestions)), "from live data", "", COLORS["accent3"])
+    parts.append('<div class="kpi-grid" style="grid-template-columns:repeat(4,1fr)">')
+    parts.append(_stat_card("Templates", str(len(templates)), "scheduling", "", accent))
+    parts.append(_stat_card("Quick Responses", str(len(quick_responses)), "pre-built", "", accent2))
+    parts.append(_stat_card("Suggested Actions", str(len(suggestions)), "from live data", "", accent3))
     days_str = ", ".join(constraints.get("days", []))
-    html += _stat_card("Meeting Days", days_str or "Not set", f"{constraints.get('earliest', '')}-{constraints.get('latest', '')}", "", COLORS["accent4"])
-    html += '</div>'
+    parts.append(_stat_card("Meeting Days", days_str or "Not set", f"{constraints.get('earliest', '')}-{constraints.get('latest', '')}", "", accent4))
+    parts.append('</div>')
 
     # Suggested Actions (from live data)
     if suggestions:
-        html += f'<div class="glass-card"><div class="card-title">Recommended Actions</div>'
+        parts.append(f'<div class="glass-card"><div class="card-title">Recommended Actions</div>')
         for s in suggestions:
             priority = s.get("priority", "medium")
-            p_color = {"high": COLORS["danger"], "medium": "#f59e0b", "low": COLORS["accent"]}.get(priority, COLORS["text_muted"])
+            p_color = {"high": COLORS["danger"], "medium": "#f59e0b", "low": accent}.get(priority, text_muted)
             p_icon = {"high": "&#9888;", "medium": "&#9679;", "low": "&#10003;"}.get(priority, "&#9679;")
             action_type = s.get("action", "")
             btn_label = {"schedule_call": "Schedule Call", "schedule_meeting": "Book Meeting", "send_email": "Send Email"}.get(action_type, "Take Action")
 
-            html += f'''<div style="display:flex;align-items:center;gap:10px;padding:8px 0;
-                border-bottom:1px solid {COLORS["card_border"]}">
+            parts.append(f'''<div style="display:flex;align-items:center;gap:10px;padding:8px 0;
+                border-bottom:1px solid {card_border}">
                 <span style="color:{p_color};font-size:14px">{p_icon}</span>
                 <div style="flex:1">
-                    <div style="font-size:13px;font-weight:600;color:{COLORS["text"]}">{_esc(s.get("title", ""))}</div>
-                    <div style="font-size:11px;color:{COLORS["text_muted"]}">{_esc(s.get("detail", ""))}</div>
+                    <div style="font-size:13px;font-weight:600;color:{text}">{_esc(s.get("title", ""))}</div>
+                    <div style="font-size:11px;color:{text_muted}">{_esc(s.get("detail", ""))}</div>
                 </div>
                 <span style="font-size:10px;font-weight:600;color:{p_color};
                     text-transform:uppercase;letter-spacing:0.05em;
                     padding:2px 8px;border-radius:4px;
                     background:{p_color}15">{priority}</span>
-            </div>'''
-        html += '</div>'
+            </div>''')
+        parts.append('</div>')
 
     # Scheduling Templates
-    html += f'<div class="glass-card"><div class="card-title">Scheduling Templates</div>'
+    parts.append(f'<div class="glass-card"><div class="card-title">Scheduling Templates</div>')
     if booking_link:
-        html += f'<div style="margin-bottom:10px;padding:8px 12px;background:{COLORS["accent"]}10;border-radius:8px;border:1px solid {COLORS["accent"]}30">'
-        html += f'<span style="font-size:11px;color:{COLORS["text_muted"]}">Booking Link:</span> '
-        html += f'<span style="font-size:12px;font-weight:600;color:{COLORS["accent"]}">{_esc(booking_link)}</span></div>'
+        parts.append(f'<div style="margin-bottom:10px;padding:8px 12px;background:{accent}10;border-radius:8px;border:1px solid {accent}30">')
+        parts.append(f'<span style="font-size:11px;color:{text_muted}">Booking Link:</span> ')
+        parts.append(f'<span style="font-size:12px;font-weight:600;color:{accent}">{_esc(booking_link)}</span></div>')
     else:
-        html += f'<div style="margin-bottom:10px;padding:8px 12px;background:#f59e0b10;border-radius:8px;border:1px solid #f59e0b30">'
-        html += f'<span style="font-size:11px;color:#f59e0b">Set your HubSpot booking link in config/email_templates.json</span></div>'
+        parts.append(f'<div style="margin-bottom:10px;padding:8px 12px;background:#f59e0b10;border-radius:8px;border:1px solid #f59e0b30">')
+        parts.append(f'<span style="font-size:11px;color:#f59e0b">Set your HubSpot booking link in config/email_templates.json</span></div>')
 
     for tmpl in templates:
-        html += f'''<div style="display:flex;align-items:center;gap:10px;padding:8px 0;
-            border-bottom:1px solid {COLORS["card_border"]}">
-            <div style="width:28px;height:28px;border-radius:6px;background:{COLORS["accent"]}15;
+        parts.append(f'''<div style="display:flex;align-items:center;gap:10px;padding:8px 0;
+            border-bottom:1px solid {card_border}">
+            <div style="width:28px;height:28px;border-radius:6px;background:{accent}15;
                 display:flex;align-items:center;justify-content:center;font-size:12px;
-                color:{COLORS["accent"]}">&#9993;</div>
+                color:{accent}">&#9993;</div>
             <div style="flex:1">
-                <div style="font-size:13px;font-weight:600;color:{COLORS["text"]}">{_esc(tmpl.get("name", ""))}</div>
-                <div style="font-size:11px;color:{COLORS["text_muted"]}">{_esc(tmpl.get("use_when", ""))}</div>
+                <div style="font-size:13px;font-weight:600;color:{text}">{_esc(tmpl.get("name", ""))}</div>
+                <div style="font-size:11px;color:{text_muted}">{_esc(tmpl.get("use_when", ""))}</div>
             </div>
-            <span style="font-size:10px;color:{COLORS["accent2"]};background:{COLORS["accent2"]}12;
+            <span style="font-size:10px;color:{accent2};background:{accent2}12;
                 padding:2px 8px;border-radius:4px">{_esc(tmpl.get("key", ""))}</span>
-        </div>'''
-    html += '</div>'
+        </div>''')
+    parts.append('</div>')
 
     # Quick Responses
-    html += f'<div class="glass-card"><div class="card-title">Quick Responses</div>'
+    parts.append(f'<div class="glass-card"><div class="card-title">Quick Responses</div>')
     for qr in quick_responses:
-        html += f'''<div style="display:flex;align-items:center;gap:10px;padding:8px 0;
-            border-bottom:1px solid {COLORS["card_border"]}">
-            <div style="width:28px;height:28px;border-radius:6px;background:{COLORS["accent3"]}15;
+        parts.append(f'''<div style="display:flex;align-items:center;gap:10px;padding:8px 0;
+            border-bottom:1px solid {card_border}">
+            <div style="width:28px;height:28px;border-radius:6px;background:{accent3}15;
                 display:flex;align-items:center;justify-content:center;font-size:12px;
-                color:{COLORS["accent3"]}">&#9889;</div>
+                color:{accent3}">&#9889;</div>
             <div style="flex:1">
-                <div style="font-size:13px;font-weight:600;color:{COLORS["text"]}">{_esc(qr.get("name", ""))}</div>
+                <div style="font-size:13px;font-weight:600;color:{text}">{_esc(qr.get("name", ""))}</div>
             </div>
-            <span style="font-size:10px;color:{COLORS["accent4"]};background:{COLORS["accent4"]}12;
+            <span style="font-size:10px;color:{accent4};background:{accent4}12;
                 padding:2px 8px;border-radius:4px">{_esc(qr.get("key", ""))}</span>
-        </div>'''
-    html += '</div>'
+        </div>''')
+    parts.append('</div>')
 
     # Setup instructions
-    html += f'''<div class="glass-card" style="background:{COLORS["surface2"]}">
+    parts.append(f'''<div class="glass-card" style="background:{COLORS["surface2"]}">
         <div class="card-title">Setup</div>
-        <div style="font-size:12px;color:{COLORS["text_muted"]};line-height:1.6">
+        <div style="font-size:12px;color:{text_muted};line-height:1.6">
             <strong>1.</strong> Set your HubSpot booking link in <code>config/email_templates.json</code><br>
             <strong>2.</strong> Customise templates to match your tone and style<br>
             <strong>3.</strong> Run <code>python scripts/email_actions.py --generate-dashboard</code> to refresh actions<br>
             <strong>4.</strong> Use <code>--template london_meeting --to email@example.com</code> for CLI mailto links
         </div>
-    </div>'''
+    </div>''')
 
-    html += '</section>'
-    return html
+    parts.append('</section>')
+    return ''.join(parts)
 
 
 # ---------------------------------------------------------------------------
@@ -5950,6 +6326,7 @@ def _build_inbound_and_actions(data: dict) -> str:
 # Main assembly
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=1)
 def _build_sidebar() -> str:
     """Build the fixed left-hand navy sidebar with grouped sections, favourites, and AI link.
     Uses MODULES registry as single source of truth."""
@@ -6139,6 +6516,7 @@ def _build_chat_html() -> str:
     </div>'''
 
 
+@lru_cache(maxsize=1)
 def _build_chat_js() -> str:
     """Build the AI chat assistant JavaScript.
 
@@ -6796,8 +7174,33 @@ def _build_chat_js() -> str:
     </script>'''
 
 
+def _build_module_page(mod: dict, data: dict) -> str:
+    """Render one MODULES entry as a dash-page, or an error card if it fails."""
+    page_id = mod["id"]
+    label = mod["label"]
+    builder = _MODULE_BUILDERS.get(page_id)
+    if not builder:
+        logger.warning(f"No builder for module '{page_id}'")
+        return ""
+    try:
+        content = builder(data)
+        return f'<div class="dash-page" id="page-{page_id}">{content}</div>'
+    except Exception as e:
+        logger.warning(f"Section '{label}' failed: {e}")
+        return f'<div class="dash-page" id="page-{page_id}"><section class="dashboard-section"><div class="glass-card" style="padding:40px;text-align:center;color:{COLORS["text_muted"]}"><h3>{_esc(label)}</h3><p>Data unavailable — {_esc(str(e))}</p></div></section></div>'
+
+
 def generate_dashboard(data: dict) -> str:
     """Generate the complete HTML dashboard from metrics data."""
+    return "".join(iter_dashboard(data))
+
+
+def iter_dashboard(data: dict) -> Iterator[str]:
+    """Yield the dashboard HTML in chunks: page head, one per page, tail.
+
+    Lets main() stream the page to disk without holding the whole document
+    (and its encoded copy) in memory at once.
+    """
     _normalize_metrics(data)
     _register_builders()
     timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
@@ -6806,8 +7209,7 @@ def generate_dashboard(data: dict) -> str:
     monday_data_file = BASE_DIR / "data" / "processed" / "monday_metrics.json"
     if monday_data_file.exists():
         try:
-            with open(monday_data_file, "r", encoding="utf-8") as mf:
-                data["monday"] = json.load(mf)
+            data["monday"] = _load_json(monday_data_file)
             logger.info("Loaded Monday.com metrics")
         except Exception as exc:
             logger.warning("Failed to load Monday.com metrics: %s", exc)
@@ -6817,19 +7219,16 @@ def generate_dashboard(data: dict) -> str:
     hs_gen = data.get("generated_at", "")
     if hs_gen:
         freshness["HubSpot"] = str(hs_gen)[:19]
-    monday_gen = _safe_get(data, "monday", "generated_at", default="")
+    monday_gen = (data.get("monday") or {}).get("generated_at")
     if monday_gen:
         freshness["Monday"] = str(monday_gen)[:19]
-    queue_file = BASE_DIR / "data" / "processed" / "inbound_queue.json"
-    if queue_file.exists():
-        try:
-            with open(queue_file, "r", encoding="utf-8") as qf:
-                q_meta = json.load(qf)
-            q_gen = q_meta.get("generated_at", "")
-            if q_gen:
-                freshness["Queue"] = str(q_gen)[:19]
-        except Exception:
-            pass
+    try:
+        q_meta = _load_processed("inbound_queue.json")
+        q_gen = q_meta.get("generated_at", "") if q_meta is not None else ""
+        if q_gen:
+            freshness["Queue"] = str(q_gen)[:19]
+    except Exception:
+        pass
 
     freshness_html = ""
     if freshness:
@@ -6840,31 +7239,20 @@ def generate_dashboard(data: dict) -> str:
         freshness_html = f'<div class="freshness-bar" id="freshness-bar">{pills}</div>'
 
     # --- Build sections from MODULES registry (#56) ---
-    sections = []
-    for mod in MODULES:
-        page_id = mod["id"]
-        label = mod["label"]
-        builder = _MODULE_BUILDERS.get(page_id)
-        if not builder:
-            logger.warning(f"No builder for module '{page_id}'")
-            continue
-        try:
-            content = builder(data)
-            sections.append(f'<div class="dash-page" id="page-{page_id}">{content}</div>')
-        except Exception as e:
-            logger.warning(f"Section '{label}' failed: {e}")
-            sections.append(f'<div class="dash-page" id="page-{page_id}"><section class="dashboard-section"><div class="glass-card" style="padding:40px;text-align:center;color:{COLORS["text_muted"]}"><h3>{_esc(label)}</h3><p>Data unavailable — {_esc(str(e))}</p></div></section></div>')
+    # Built in MODULES order on this thread: element ids come from the shared
+    # _uid_counter and chart caches, so the order keeps the output stable.
+    sections = (_build_module_page(mod, data) for mod in MODULES)
 
-    record_counts = _safe_get(data, "record_counts", default={})
+    record_counts = data.get("record_counts") or {}
     footer_stats = " | ".join([
         f"Contacts: {_fmt_number(record_counts.get('contacts', 0))}",
         f"Companies: {_fmt_number(record_counts.get('companies', 0))}",
         f"Deals: {_fmt_number(record_counts.get('deals', 0))}",
     ])
 
-    # Serialize time_series and yoy_summary for JS embedding
-    ts_data = data.get("time_series", {})
-    yoy_data = data.get("yoy_summary", {})
+    # Serialize time_series and yoy_summary for JS embedding; both are only
+    # read and embedded when there is a time series to filter
+    ts_data = data.get("time_series")
     has_time_series = bool(ts_data)
 
     # Build filter bar HTML
@@ -6887,8 +7275,8 @@ def generate_dashboard(data: dict) -> str:
     # Build the filtering JavaScript
     filter_js = ''
     if has_time_series:
-        ts_json = json.dumps(ts_data, default=str)
-        yoy_json = json.dumps(yoy_data, default=str)
+        ts_json = _json_embed(ts_data)
+        yoy_json = _json_embed(data.get("yoy_summary", {}))
         filter_js = f'''
     <script>
     (function() {{
@@ -7265,7 +7653,7 @@ def generate_dashboard(data: dict) -> str:
     }})();
     </script>'''
 
-    html = f'''<!DOCTYPE html>
+    yield f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -7297,7 +7685,9 @@ def generate_dashboard(data: dict) -> str:
         {filter_bar}
         {freshness_html}
         <main class="main-content">
-            {''.join(sections)}
+            '''
+    yield from sections
+    yield f'''
         </main>
 
         <footer class="dashboard-footer">
@@ -7316,8 +7706,6 @@ def generate_dashboard(data: dict) -> str:
 </body>
 </html>'''
 
-    return html
-
 
 # ---------------------------------------------------------------------------
 # Entry point
@@ -7336,8 +7724,7 @@ def main() -> None:
         sys.exit(1)
 
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _load_metrics()
         logger.info("Loaded metrics data (%d top-level keys)", len(data))
     except json.JSONDecodeError as exc:
         logger.error("Failed to parse JSON: %s", exc)
@@ -7346,19 +7733,25 @@ def main() -> None:
         logger.error("Failed to read metrics file: %s", exc)
         sys.exit(1)
 
-    # Generate HTML
+    # Generate and write HTML
+    # Chunks stream into a temp file, then an atomic swap so the static host
+    # never serves a half-written page
     logger.info("Building dashboard HTML...")
-    html_content = generate_dashboard(data)
-    logger.info("Generated %s characters of HTML", f"{len(html_content):,}")
-
-    # Write output
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = OUTPUT_FILE.with_suffix(".tmp")
     try:
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        n_chars = 0
+        with open(tmp_file, "wb") as fh:
+            for chunk in iter_dashboard(data):
+                fh.write(chunk.encode("utf-8"))
+                n_chars += len(chunk)
+        logger.info("Generated %s characters of HTML", f"{n_chars:,}")
+        os.replace(tmp_file, OUTPUT_FILE)
         logger.info("Dashboard written to %s", OUTPUT_FILE)
     except Exception as exc:
-        logger.error("Failed to write dashboard: %s", exc)
+        logger.error("Failed to build or write dashboard: %s", exc)
+        if tmp_file.exists():
+            tmp_file.unlink()
         sys.exit(1)
 
     logger.info("=== Dashboard generation complete ===")
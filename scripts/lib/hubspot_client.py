@@ -6,31 +6,115 @@ Used by fetch_hubspot.py for both full and incremental fetching.
 """
 
 import logging
+import sys
+import threading
 import time
-import requests
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import orjson
+import httpx
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+from typing import Dict, Iterator, List, Optional, Union
+from urllib.parse import quote, urlencode
+
+from scripts.lib.errors import APIRateLimitError
 
 logger = logging.getLogger(__name__)
 
 HUBSPOT_BASE_URL = "https://api.hubapi.com"
 HUBSPOT_PAGE_LIMIT = 100
+HUBSPOT_SEARCH_LIMIT = 200  # max page size for the CRM search API
+HUBSPOT_SEARCH_WINDOW = 10_000  # search API refuses to page past this offset
 HUBSPOT_RATE_LIMIT = 100
 HUBSPOT_RATE_WINDOW = 10  # seconds
+HUBSPOT_MAX_WORKERS = 8  # concurrent requests sharing the rate budget
+HUBSPOT_POOL_SIZE = 32  # connection cap; HTTP/2 multiplexes requests onto few
+HUBSPOT_MAX_ATTEMPTS = 4  # first try + 3 retries
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+
+def modified_property(object_type: str) -> str:
+    """Last-modified property name: contacts predate the hs_ prefix."""
+    return "lastmodifieddate" if object_type == "contacts" else "hs_lastmodifieddate"
+
+
+def to_epoch_ms(value: Optional[str]) -> Optional[int]:
+    """Parse a HubSpot timestamp (epoch-ms string or ISO 8601) to epoch ms."""
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """429s, 5xx, timeouts and dropped connections are worth retrying."""
+    if isinstance(exc, (APIRateLimitError, httpx.TransportError)):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
+
+
+def _retry_wait(retry_state) -> float:
+    """Honour Retry-After on 429s; exponential backoff with jitter otherwise."""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, APIRateLimitError) and exc.details.get("retry_after"):
+        return float(exc.details["retry_after"])
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state):
+    exc = retry_state.outcome.exception()
+    logger.warning(
+        f"{exc}. Waiting {retry_state.next_action.sleep:.1f}s "
+        f"(retry {retry_state.attempt_number}/{HUBSPOT_MAX_ATTEMPTS - 1})"
+    )
 
 
 class HubSpotClient:
-    """HubSpot API v3 client with pagination, rate limiting, and search."""
+    """HubSpot API v3 client with pagination, rate limiting, and search.
+
+    Safe to share across threads: the rate limiter is lock-protected so
+    concurrent callers draw from the same request budget.
+    """
 
     def __init__(self, api_key: str, base_url: str = HUBSPOT_BASE_URL):
         self.api_key = api_key
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
-        self._request_timestamps: List[float] = []
+        # HTTP/2 lets the worker threads' requests share one TLS connection
+        # instead of each opening its own. Retries live in _request (tenacity).
+        self.session = httpx.Client(
+            http2=True,
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=HUBSPOT_POOL_SIZE,
+                                max_keepalive_connections=HUBSPOT_POOL_SIZE),
+        )
+        self._send_times: deque = deque()
+        self._rate_lock = threading.Lock()
+        self._urls: Dict[str, str] = {}  # endpoint -> absolute URL
         self._hapikey_params = {}
         self._auth_mode = "bearer" if api_key.startswith("pat-") else "auto"
         self._setup_auth()
 
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "HubSpotClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _setup_auth(self):
         if self._auth_mode in ("bearer", "auto"):
             self.session.headers["Authorization"] = f"Bearer {self.api_key}"
@@ -39,116 +123,171 @@ class HubSpotClient:
             self.session.headers.pop("Authorization", None)
             self._hapikey_params = {"hapikey": self.api_key}
 
-    def probe_auth(self):
-        """Probe which auth method works (bearer vs hapikey)."""
-        if self._auth_mode != "auto":
-            return
-        url = f"{self.base_url}/crm/v3/owners/?limit=1"
-        resp = self.session.get(url, timeout=15)
-        if resp.status_code != 401:
-            self._auth_mode = "bearer"
-            logger.info("Authentication: Bearer token accepted")
-            return
-        self.session.headers.pop("Authorization", None)
-        resp = self.session.get(url, params={"hapikey": self.api_key}, timeout=15)
-        if resp.status_code != 401:
+    def _use_hapikey(self):
+        """Switch an "auto" client to legacy hapikey auth after a Bearer 401.
+
+        hapikey auth is deprecated by HubSpot and will be removed here once
+        no legacy keys remain; private-app tokens (pat-*) never take this path.
+        """
+        if self._auth_mode == "auto":
             self._auth_mode = "hapikey"
-            self._hapikey_params = {"hapikey": self.api_key}
-            logger.info("Authentication: hapikey accepted")
-            return
-        logger.error("Authentication failed with both methods.")
-        self._auth_mode = "bearer"
-        self.session.headers["Authorization"] = f"Bearer {self.api_key}"
+            self._setup_auth()
+            logger.info("Authentication: Bearer rejected, falling back to hapikey")
+
+    def _with_hapikey(self, params: Union[dict, str, None]) -> Union[dict, str, None]:
+        """Add legacy hapikey auth to dict or pre-encoded query params."""
+        if not self._hapikey_params:
+            return params
+        if isinstance(params, str):
+            auth = urlencode(self._hapikey_params)
+            return f"{auth}&{params}" if params else auth
+        return {**self._hapikey_params, **(params or {})}
 
     def _rate_limit_wait(self):
-        now = time.time()
-        self._request_timestamps = [
-            t for t in self._request_timestamps if now - t < HUBSPOT_RATE_WINDOW
-        ]
-        if len(self._request_timestamps) >= HUBSPOT_RATE_LIMIT:
-            sleep_time = HUBSPOT_RATE_WINDOW - (now - self._request_timestamps[0]) + 0.1
+        """Sliding-window log matching HubSpot's rolling 10-second limit.
+
+        Each caller reserves a send time no earlier than the request
+        HUBSPOT_RATE_LIMIT places before it plus the window, so no window
+        ever holds more than the limit. Expired entries are popped from the
+        left of the deque, making each call O(1) amortised. The sleep happens
+        outside the lock so concurrent callers queue in reservation order.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            sends = self._send_times
+            while sends and now - sends[0] >= HUBSPOT_RATE_WINDOW:
+                sends.popleft()
+            send_at = now
+            if len(sends) >= HUBSPOT_RATE_LIMIT:
+                send_at = max(now, sends[-HUBSPOT_RATE_LIMIT] + HUBSPOT_RATE_WINDOW)
+            sends.append(send_at)
+        sleep_time = send_at - now
+        if sleep_time > 0:
             logger.debug(f"Rate limit approaching, sleeping {sleep_time:.1f}s")
             time.sleep(sleep_time)
-        self._request_timestamps.append(time.time())
 
-    def get(self, endpoint: str, params: dict = None, _retries: int = 0) -> Optional[dict]:
-        """GET request with rate limiting and retry on 429."""
+    @retry(
+        stop=stop_after_attempt(HUBSPOT_MAX_ATTEMPTS),
+        wait=_retry_wait,
+        retry=retry_if_exception(_is_transient),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
+    def _request(self, method: str, endpoint: str,
+                 params: Union[dict, str, None] = None, body: dict = None) -> dict:
+        """Single rate-limited request; raises on failure so tenacity can retry.
+
+        ``params`` are the caller's raw params: hapikey auth is added here on
+        every attempt, so a retry after the fallback is still authenticated.
+        """
         self._rate_limit_wait()
-        url = f"{self.base_url}{endpoint}"
-        merged = dict(self._hapikey_params)
-        if params:
-            merged.update(params)
+        url = self._urls.get(endpoint)
+        if url is None:
+            url = self._urls.setdefault(endpoint, self.base_url + endpoint)
+        sent_mode = self._auth_mode
+        resp = self.session.request(
+            method, url, params=self._with_hapikey(params), json=body, timeout=30)
+        if sent_mode == "auto":
+            # Legacy key: learn the auth mode from the first real requests
+            # rather than spending a probe round-trip on every run.
+            if resp.status_code == 401:
+                self._use_hapikey()
+                self._rate_limit_wait()
+                resp = self.session.request(
+                    method, url, params=self._with_hapikey(params), json=body, timeout=30)
+            elif self._auth_mode == "auto":
+                self._auth_mode = "bearer"
+        if resp.status_code == 429:
+            raise APIRateLimitError(endpoint, int(resp.headers.get("Retry-After", 10)))
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
+
+    def get(self, endpoint: str,
+            params: Union[dict, str, None] = None) -> Optional[dict]:
+        """GET request with rate limiting and retry on 429/5xx.
+
+        ``params`` may be a dict or an already URL-encoded query string.
+        """
         try:
-            resp = self.session.get(url, params=merged, timeout=30)
-            if resp.status_code == 429:
-                if _retries >= 3:
-                    logger.error(f"GET {endpoint} rate-limited 3 times, giving up")
-                    return None
-                retry_after = int(resp.headers.get("Retry-After", 10))
-                logger.warning(f"Rate limited (429). Waiting {retry_after}s (retry {_retries + 1}/3)")
-                time.sleep(retry_after)
-                return self.get(endpoint, params, _retries + 1)
-            resp.raise_for_status()
-            return resp.json()
-        except requests.RequestException as e:
+            return self._request("GET", endpoint, params=params)
+        except APIRateLimitError:
+            logger.error(f"GET {endpoint} rate-limited {HUBSPOT_MAX_ATTEMPTS} times, giving up")
+            return None
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             logger.error(f"GET {endpoint} failed: {e}")
             return None
 
-    def post(self, endpoint: str, body: dict, _retries: int = 0) -> Optional[dict]:
-        """POST request with rate limiting and retry on 429."""
-        self._rate_limit_wait()
-        url = f"{self.base_url}{endpoint}"
+    def post(self, endpoint: str, body: dict) -> Optional[dict]:
+        """POST request with rate limiting and retry on 429/5xx."""
         try:
-            resp = self.session.post(url, json=body, params=self._hapikey_params, timeout=30)
-            if resp.status_code == 429:
-                if _retries >= 3:
-                    logger.error(f"POST {endpoint} rate-limited 3 times, giving up")
-                    return None
-                retry_after = int(resp.headers.get("Retry-After", 10))
-                logger.warning(f"Rate limited (429). Waiting {retry_after}s (retry {_retries + 1}/3)")
-                time.sleep(retry_after)
-                return self.post(endpoint, body, _retries + 1)
-            resp.raise_for_status()
-            return resp.json()
-        except requests.RequestException as e:
+            return self._request("POST", endpoint, body=body)
+        except APIRateLimitError:
+            logger.error(f"POST {endpoint} rate-limited {HUBSPOT_MAX_ATTEMPTS} times, giving up")
+            return None
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             logger.error(f"POST {endpoint} failed: {e}")
             return None
 
-    def paginate_all(self, endpoint: str, params: dict = None,
-                     results_key: str = "results") -> List[dict]:
-        """Paginate through a list endpoint collecting all results."""
-        all_results = []
+    def iter_pages(self, endpoint: str, params: dict = None,
+                   results_key: str = "results") -> Iterator[List[dict]]:
+        """Yield each page of a list endpoint as soon as it arrives.
+
+        The next page is requested on a background thread before the current
+        one is handed to the caller, so the caller's parsing and writing
+        overlaps the network round-trip. At most one request is in flight
+        ahead of the consumer.
+        """
         params = dict(params or {})
         params["limit"] = HUBSPOT_PAGE_LIMIT
-        after = None
+        params.pop("after", None)
+        # The property list etc. is identical on every page, so encode it
+        # once and only append the cursor per request.
+        query = urlencode(params)
         page = 0
-        while True:
-            page += 1
-            if after:
-                params["after"] = after
-            elif "after" in params:
-                del params["after"]
-            data = self.get(endpoint, params)
-            if not data:
-                break
-            results = data.get(results_key, [])
-            all_results.extend(results)
-            logger.debug(f"Page {page}: {len(results)} records (total: {len(all_results)})")
-            paging = data.get("paging", {})
-            after = paging.get("next", {}).get("after")
-            if not after:
-                break
-        return all_results
+        total = 0
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            future = prefetch.submit(self.get, endpoint, query)
+            while future is not None:
+                data = future.result()
+                if not data:
+                    break
+                page += 1
+                results = data.get(results_key, [])
+                total += len(results)
+                after = data.get("paging", {}).get("next", {}).get("after")
+                future = (prefetch.submit(self.get, endpoint,
+                                          f"{query}&after={quote(str(after), safe='')}")
+                          if after else None)
+                logger.debug(f"Page {page}: {len(results)} records (total: {total})")
+                yield results
+
+    def iter_records(self, endpoint: str, params: dict = None,
+                     results_key: str = "results") -> Iterator[dict]:
+        """Yield records one at a time; memory stays O(page), not O(total)."""
+        for results in self.iter_pages(endpoint, params, results_key):
+            yield from results
+
+    def paginate_all(self, endpoint: str, params: dict = None,
+                     results_key: str = "results") -> List[dict]:
+        """Paginate through a list endpoint collecting all results."""
+        return list(self.iter_records(endpoint, params, results_key))
 
     def search_modified(self, object_type: str, since_ms: int,
                         properties: List[str]) -> List[dict]:
         """Search for records modified since a timestamp (ms).
 
-        Uses the CRM Search API with lastmodifieddate filter.
-        Much faster than paginating all records when few changed.
+        Uses the CRM Search API with a last-modified filter, sorted
+        ascending, at the search API's 200-record page size. The search API
+        stops paging at 10,000 results, so at that point the filter is
+        re-anchored on the last modification time seen and paging restarts.
+        Records sharing that millisecond are read again and dropped by ID,
+        so each record is returned once.
         """
         logger.info(f"Searching {object_type} modified since {since_ms}...")
+        prop = modified_property(object_type)
         all_results = []
+        seen_ids = set()
+        cursor_ms = since_ms
         after = 0
         page = 0
         while True:
@@ -156,45 +295,70 @@ class HubSpotClient:
             body = {
                 "filterGroups": [{
                     "filters": [{
-                        "propertyName": "lastmodifieddate",
+                        "propertyName": prop,
                         "operator": "GTE",
-                        "value": str(since_ms),
+                        "value": str(cursor_ms),
                     }]
                 }],
                 "properties": properties,
-                "limit": HUBSPOT_PAGE_LIMIT,
+                "limit": HUBSPOT_SEARCH_LIMIT,
                 "after": after,
-                "sorts": [{"propertyName": "lastmodifieddate", "direction": "ASCENDING"}],
+                "sorts": [{"propertyName": prop, "direction": "ASCENDING"}],
             }
             data = self.post(f"/crm/v3/objects/{object_type}/search", body)
             if not data:
                 break
             results = data.get("results", [])
-            all_results.extend(results)
+            for record in results:
+                record_id = record.get("id")
+                if record_id not in seen_ids:
+                    seen_ids.add(record_id)
+                    all_results.append(record)
             total = data.get("total", "?")
             logger.debug(f"Search page {page}: {len(results)} (total available: {total})")
             paging = data.get("paging", {})
             after = paging.get("next", {}).get("after")
             if not after:
                 break
+            if int(after) + HUBSPOT_SEARCH_LIMIT > HUBSPOT_SEARCH_WINDOW:
+                last_ms = to_epoch_ms(results[-1].get("updatedAt")) if results else None
+                if last_ms is None or last_ms <= cursor_ms:
+                    logger.warning(
+                        f"{object_type} search hit the {HUBSPOT_SEARCH_WINDOW} result "
+                        f"window without advancing; stopping at {len(all_results)}"
+                    )
+                    break
+                cursor_ms = last_ms
+                after = 0
         logger.info(f"Found {len(all_results)} modified {object_type}")
         return all_results
 
     def fetch_associations(self, from_type: str, to_type: str,
                            object_ids: List[str]) -> Dict[str, List[str]]:
-        """Batch-fetch associations between object types."""
+        """Batch-fetch associations between object types.
+
+        Batches of 100 IDs are posted concurrently; results are merged on
+        the calling thread so the returned dict is never shared. Duplicate
+        IDs are dropped before batching. Target IDs are interned, so a
+        company shared by thousands of contacts is stored once.
+        """
+        object_ids = list(dict.fromkeys(object_ids))
+        endpoint = f"/crm/v4/associations/{from_type}/{to_type}/batch/read"
+        batches = [object_ids[i:i + 100] for i in range(0, len(object_ids), 100)]
         associations: Dict[str, List[str]] = {}
-        for i in range(0, len(object_ids), 100):
-            batch = object_ids[i:i + 100]
-            body = {"inputs": [{"id": oid} for oid in batch]}
-            data = self.post(
-                f"/crm/v4/associations/{from_type}/{to_type}/batch/read", body
-            )
-            if data and "results" in data:
-                for result in data["results"]:
-                    from_id = result.get("from", {}).get("id")
-                    to_ids = [str(t.get("toObjectId")) for t in result.get("to", [])]
-                    if from_id:
-                        associations[str(from_id)] = to_ids
+        with ThreadPoolExecutor(max_workers=HUBSPOT_MAX_WORKERS) as pool:
+            futures = [
+                pool.submit(self.post, endpoint, {"inputs": [{"id": oid} for oid in batch]})
+                for batch in batches
+            ]
+            for future in as_completed(futures):
+                data = future.result()
+                if data and "results" in data:
+                    for result in data["results"]:
+                        from_id = result.get("from", {}).get("id")
+                        to_ids = [sys.intern(str(t.get("toObjectId")))
+                                  for t in result.get("to", [])]
+                        if from_id:
+                            associations[str(from_id)] = to_ids
         logger.info(f"Fetched {len(associations)} {from_type}->{to_type} associations")
         return associations
@@ -0,0 +1,83 @@
+"""
+Monday.com Board Classification
+================================
+Keyword rules that decide which boards feed the M&A, IC and AI analyses.
+Shared by monday_analyzer.py and by fetch_monday.py, which requests the
+full item field set only for boards these analyses read.
+"""
+
+MA_WORKSPACE_KEYWORDS = ["m&a", "merger", "acquisition"]
+
+MA_BOARD_KEYWORDS = [
+    "m&a", "merger", "acquisition", "deal flow", "dealflow",
+    "due diligence", "pipeline", "target", "investment",
+    "status", "deal timetable", "task tracker", "budget",
+]
+
+# Columns that specifically hold IC gate scores (from M&A Status boards)
+IC_GATE_KEYWORDS = [
+    "gate 0", "gate 1", "gate 2", "gate 3",
+    "ic score", "latest ic",
+]
+
+IC_BOARD_KEYWORDS = [
+    "ic", "investment committee", "scorecard", "scoring",
+    "assessment", "evaluation", "rating", "review",
+    "status",  # The M&A "Status" board has IC columns
+]
+
+AI_WORKSPACE_NAMES = ["ecomplete ai", "e-complete ai", "ai committee"]
+
+
+def workspace_name(board: dict) -> str:
+    """Extract workspace name from a board dict, defaulting to 'No Workspace'."""
+    return (board.get("workspace") or {}).get("name", "") or "No Workspace"
+
+
+def _name_or_description_matches(board: dict, keywords: list) -> bool:
+    name = (board.get("name") or "").lower()
+    desc = (board.get("description") or "").lower()
+    return any(kw in name or kw in desc for kw in keywords)
+
+
+def is_ma_workspace(board: dict) -> bool:
+    ws = workspace_name(board).lower()
+    return any(kw in ws for kw in MA_WORKSPACE_KEYWORDS)
+
+
+def is_ma_board(board: dict) -> bool:
+    """A board is M&A if it's in an M&A workspace OR its name matches."""
+    return is_ma_workspace(board) or _name_or_description_matches(board, MA_BOARD_KEYWORDS)
+
+
+def is_ic_board(board: dict) -> bool:
+    """A board is IC-relevant if it's in an M&A workspace or has IC keywords."""
+    return is_ma_workspace(board) or _name_or_description_matches(board, IC_BOARD_KEYWORDS)
+
+
+def board_has_ic_columns(board: dict) -> bool:
+    """Check if a board has IC-specific columns in its definition."""
+    for col in board.get("columns", []):
+        title = (col.get("title") or "").lower()
+        if any(kw in title for kw in IC_GATE_KEYWORDS):
+            return True
+    return False
+
+
+def is_ai_workspace(board: dict) -> bool:
+    ws = workspace_name(board).lower().strip()
+    return any(ws == name or ws.startswith(name) for name in AI_WORKSPACE_NAMES)
+
+
+def board_needs_item_detail(board: dict) -> bool:
+    """True for boards the M&A, IC or AI analyzers read updates/subitems from.
+
+    Used by the fetcher to request the full item field set only where it is
+    consumed; other boards only feed the overview.
+    """
+    return (
+        is_ma_board(board)
+        or board_has_ic_columns(board)
+        or is_ic_board(board)
+        or is_ai_workspace(board)
+    )
@@ -6,17 +6,54 @@ Used by fetch_monday.py for both full and incremental fetching.
 """
 
 import logging
+import threading
 import time
-import requests
+import httpx
+import orjson
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 from typing import Any, Dict, List, Optional
 
+from scripts.lib.errors import APIRateLimitError
+
 logger = logging.getLogger(__name__)
 
 MONDAY_API_URL = "https://api.monday.com/v2"
 MONDAY_RATE_LIMIT = 55  # stay under 60 req/min
 MONDAY_RATE_WINDOW = 60  # seconds
+MONDAY_RATE_BURST = 5  # bucket capacity; burst + refill per window stays at 55
+MONDAY_MAX_WORKERS = 8  # concurrent board syncs sharing the rate budget
+MONDAY_BATCH_BOARDS = 5  # first pages per aliased query (complexity budget)
+MONDAY_MAX_ATTEMPTS = 4  # first try + 3 retries
+
+# Tokens per second as a float (~0.833): the burst is carved out of the
+# 55-request budget, so a full bucket plus one window's refill never exceeds
+# it. Accrual is never rounded, so sub-token credit carries over between
+# calls instead of being dropped.
+_REFILL_PER_SEC = (MONDAY_RATE_LIMIT - MONDAY_RATE_BURST) / MONDAY_RATE_WINDOW
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+ACTIVITY_LOG_FIELDS = "id event data created_at user_id"
+
+# Enough for board overviews: status, owner and state come from column text.
+ITEM_FIELDS_MINIMAL = """
+    id
+    name
+    state
+    created_at
+    updated_at
+    group { id title }
+    column_values { id type text }
+"""
 
-ITEM_FIELDS = """
+# Boards that feed the M&A, IC and AI analyses also need raw values,
+# subitem checklists and recent updates.
+ITEM_FIELDS_FULL = """
     id
     name
     state
@@ -35,59 +72,118 @@ ITEM_FIELDS = """
 """
 
 
+def _is_transient(exc: BaseException) -> bool:
+    """429s, 5xx, timeouts and dropped connections are worth retrying."""
+    if isinstance(exc, (APIRateLimitError, httpx.TransportError)):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500
+
+
+def _retry_wait(retry_state) -> float:
+    """Honour Retry-After on 429s; exponential backoff with jitter otherwise."""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, APIRateLimitError) and exc.details.get("retry_after"):
+        return float(exc.details["retry_after"])
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state):
+    exc = retry_state.outcome.exception()
+    logger.warning(
+        f"{exc}. Waiting {retry_state.next_action.sleep:.1f}s "
+        f"(retry {retry_state.attempt_number}/{MONDAY_MAX_ATTEMPTS - 1})"
+    )
+
+
 class MondayClient:
-    """Monday.com GraphQL API v2 client with pagination and rate limiting."""
+    """Monday.com GraphQL API v2 client with pagination and rate limiting.
+
+    Safe to share across threads: the rate limiter is lock-protected so
+    concurrent callers draw from the same request budget.
+    """
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "Authorization": api_key,
-            "API-Version": "2024-10",
-        })
-        self._request_timestamps: List[float] = []
+        # HTTP/2 multiplexes the board workers' requests over one TLS
+        # connection; the limit only matters if the server falls back to 1.1.
+        self.session = httpx.Client(
+            http2=True,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": api_key,
+                "API-Version": "2024-10",
+            },
+            limits=httpx.Limits(max_connections=MONDAY_MAX_WORKERS,
+                                max_keepalive_connections=MONDAY_MAX_WORKERS),
+            timeout=30,
+        )
+        self._tokens = float(MONDAY_RATE_BURST)
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
+
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "MondayClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def _rate_limit_wait(self):
-        now = time.time()
-        self._request_timestamps = [
-            t for t in self._request_timestamps if now - t < MONDAY_RATE_WINDOW
-        ]
-        if len(self._request_timestamps) >= MONDAY_RATE_LIMIT:
-            sleep_time = MONDAY_RATE_WINDOW - (now - self._request_timestamps[0]) + 0.5
+        """Token bucket refilling at MONDAY_RATE_LIMIT per MONDAY_RATE_WINDOW.
+
+        O(1) per call. Each caller takes a token under the lock; when the
+        bucket is empty the balance goes negative, which reserves the caller
+        a slot behind those already waiting, and the sleep happens outside
+        the lock. Burst plus refill keeps any rolling window at 55.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                MONDAY_RATE_BURST,
+                self._tokens + (now - self._last_refill) * _REFILL_PER_SEC)
+            self._last_refill = now
+            self._tokens -= 1
+            sleep_time = -self._tokens / _REFILL_PER_SEC if self._tokens < 0 else 0.0
+        if sleep_time > 0:
             logger.debug(f"Rate limit approaching, sleeping {sleep_time:.1f}s")
             time.sleep(sleep_time)
-        self._request_timestamps.append(time.time())
 
-    def query(self, gql: str, variables: Optional[dict] = None,
-              _retries: int = 0) -> Optional[dict]:
-        """Execute a GraphQL query with rate limiting and retry."""
+    @retry(
+        stop=stop_after_attempt(MONDAY_MAX_ATTEMPTS),
+        wait=_retry_wait,
+        retry=retry_if_exception(_is_transient),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
+    def _post(self, body: dict) -> dict:
+        """Single rate-limited POST; raises on failure so tenacity can retry."""
         self._rate_limit_wait()
+        resp = self.session.post(MONDAY_API_URL, json=body)
+        if resp.status_code == 429:
+            raise APIRateLimitError(MONDAY_API_URL, int(resp.headers.get("Retry-After", 30)))
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
+
+    def query(self, gql: str, variables: Optional[dict] = None) -> Optional[dict]:
+        """Execute a GraphQL query with rate limiting and retry on 429/5xx."""
         body: Dict[str, Any] = {"query": gql}
         if variables:
             body["variables"] = variables
         try:
-            resp = self.session.post(MONDAY_API_URL, json=body, timeout=30)
-            if resp.status_code == 429:
-                if _retries >= 3:
-                    logger.error("Monday.com rate-limited 3 times, giving up")
-                    return None
-                retry_after = int(resp.headers.get("Retry-After", 30))
-                logger.warning(
-                    f"Rate limited (429). Waiting {retry_after}s "
-                    f"(retry {_retries + 1}/3)"
-                )
-                time.sleep(retry_after)
-                return self.query(gql, variables, _retries + 1)
-            resp.raise_for_status()
-            data = resp.json()
-            if "errors" in data:
-                logger.error(f"GraphQL errors: {data['errors']}")
-                return None
-            return data.get("data")
-        except requests.RequestException as e:
+            data = self._post(body)
+        except APIRateLimitError:
+            logger.error(f"Monday.com rate-limited {MONDAY_MAX_ATTEMPTS} times, giving up")
+            return None
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Monday.com API request failed: {e}")
             return None
+        if "errors" in data:
+            logger.error(f"GraphQL errors: {data['errors']}")
+            return None
+        return data.get("data")
 
     def fetch_boards(self) -> List[dict]:
         """Fetch all boards with basic info."""
@@ -98,7 +194,7 @@ class MondayClient:
             gql = """
             query ($page: Int!) {
                 boards (page: $page, limit: 50) {
-                    id name description state board_kind
+                    id name description state board_kind updated_at
                     workspace { id name }
                     columns { id title type settings_str }
                     groups { id title color }
@@ -117,75 +213,89 @@ class MondayClient:
         logger.info(f"Fetched {len(all_boards)} boards")
         return all_boards
 
-    @staticmethod
-    def inject_column_titles(items: List[dict], columns: List[dict]):
-        """Map column id -> title into each item's column_values."""
-        col_map = {c.get("id"): c.get("title", "") for c in columns}
-        for item in items:
-            for cv in item.get("column_values", []):
-                cv["title"] = col_map.get(cv.get("id"), cv.get("id", ""))
-            for si in item.get("subitems", []):
-                for cv in si.get("column_values", []):
-                    cv["title"] = col_map.get(cv.get("id"), cv.get("id", ""))
+    def fetch_boards_first_pages(
+            self, board_ids: List[str], fields: str = ITEM_FIELDS_MINIMAL,
+    ) -> Dict[str, dict]:
+        """Fetch the first items page of several boards in one aliased query.
+
+        Returns board_id -> {"items", "cursor", "activity_logs"}; the
+        activity logs ride along so no separate per-board request is needed.
+        Boards missing from the response (or the whole batch, on error) are
+        left out, so callers fall back to per-board requests. Cursor pages
+        after the first cannot be batched.
+        """
+        if not board_ids:
+            return {}
+        aliases = {f"b{i}": str(bid) for i, bid in enumerate(board_ids)}
+        var_decls = ", ".join(f"${alias}: [ID!]!" for alias in aliases)
+        selections = "\n".join(
+            f"{alias}: boards (ids: ${alias}) {{ items_page (limit: 100) "
+            f"{{ cursor items {{ {fields} }} }} "
+            f"activity_logs (limit: 100) {{ {ACTIVITY_LOG_FIELDS} }} }}"
+            for alias in aliases
+        )
+        data = self.query(
+            f"query ({var_decls}) {{ {selections} }}",
+            {alias: [bid] for alias, bid in aliases.items()},
+        )
+        pages = {}
+        for alias, bid in aliases.items():
+            boards = (data or {}).get(alias)
+            if boards:
+                page_data = boards[0].get("items_page") or {}
+                pages[bid] = {
+                    "items": page_data.get("items", []),
+                    "cursor": page_data.get("cursor"),
+                    "activity_logs": boards[0].get("activity_logs") or [],
+                }
+        return pages
 
     def fetch_board_items(self, board_id: str, board_name: str = "",
-                          columns: Optional[List[dict]] = None) -> List[dict]:
-        """Fetch all items from a board with cursor pagination."""
+                          first_page: Optional[dict] = None,
+                          fields: str = ITEM_FIELDS_MINIMAL) -> List[dict]:
+        """Fetch all items from a board with cursor pagination.
+
+        ``first_page`` is a page already fetched by fetch_boards_first_pages;
+        without it the first page is requested here.
+        ``fields`` selects ITEM_FIELDS_MINIMAL or ITEM_FIELDS_FULL.
+        Column values carry their id, type and text (plus the raw value with
+        ITEM_FIELDS_FULL) but no title; titles live once on the board's
+        ``columns`` and are joined by the reader.
+        """
         logger.info(f"Fetching items for board {board_id} ({board_name})...")
-        all_items = []
-        cursor = None
-        page = 0
-        while True:
-            page += 1
-            if cursor:
-                gql = f"""
-                query ($cursor: String!) {{
-                    next_items_page (cursor: $cursor, limit: 100) {{
-                        cursor
-                        items {{ {ITEM_FIELDS} }}
-                    }}
-                }}
-                """
-                data = self.query(gql, {"cursor": cursor})
-                if not data or not data.get("next_items_page"):
-                    break
-                items = data["next_items_page"].get("items", [])
-                cursor = data["next_items_page"].get("cursor")
-            else:
-                gql = f"""
-                query ($boardId: [ID!]!) {{
-                    boards (ids: $boardId) {{
-                        items_page (limit: 100) {{
-                            cursor
-                            items {{ {ITEM_FIELDS} }}
-                        }}
-                    }}
+        if first_page is None:
+            first_page = self.fetch_boards_first_pages(
+                [board_id], fields).get(str(board_id))
+        first_page = first_page or {}
+        items = first_page.get("items", [])
+        cursor = first_page.get("cursor")
+        all_items = list(items)
+        while cursor and items:
+            gql = f"""
+            query ($cursor: String!) {{
+                next_items_page (cursor: $cursor, limit: 100) {{
+                    cursor
+                    items {{ {fields} }}
                 }}
-                """
-                data = self.query(gql, {"boardId": [str(board_id)]})
-                if not data or not data.get("boards") or not data["boards"]:
-                    break
-                page_data = data["boards"][0].get("items_page", {})
-                items = page_data.get("items", [])
-                cursor = page_data.get("cursor")
-            all_items.extend(items)
-            if not cursor or len(items) == 0:
+            }}
+            """
+            data = self.query(gql, {"cursor": cursor})
+            if not data or not data.get("next_items_page"):
                 break
-        if columns:
-            self.inject_column_titles(all_items, columns)
+            items = data["next_items_page"].get("items", [])
+            cursor = data["next_items_page"].get("cursor")
+            all_items.extend(items)
         logger.info(f"Fetched {len(all_items)} items from board {board_id}")
         return all_items
 
     def fetch_activity_logs(self, board_id: str) -> List[dict]:
         """Fetch activity logs for a board."""
-        gql = """
-        query ($boardId: [ID!]!) {
-            boards (ids: $boardId) {
-                activity_logs (limit: 100) {
-                    id event data created_at user_id
-                }
-            }
-        }
+        gql = f"""
+        query ($boardId: [ID!]!) {{
+            boards (ids: $boardId) {{
+                activity_logs (limit: 100) {{ {ACTIVITY_LOG_FIELDS} }}
+            }}
+        }}
         """
         data = self.query(gql, {"boardId": [str(board_id)]})
         if not data or not data.get("boards") or not data["boards"]:
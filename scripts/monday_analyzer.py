@@ -41,6 +41,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 RAW_DIR = BASE_DIR / "data" / "raw"
 PROCESSED_DIR = BASE_DIR / "data" / "processed"
 
+sys.path.insert(0, str(BASE_DIR))
+from scripts.lib.monday_boards import (
+    IC_GATE_KEYWORDS, board_has_ic_columns, is_ai_workspace, is_ic_board,
+    is_ma_board, workspace_name,
+)
+
 load_dotenv(BASE_DIR / ".env")
 
 logger = logging.getLogger(__name__)
@@ -122,11 +128,6 @@ def _is_subitem_board(board_name: str) -> bool:
     return board_name.lower().startswith("subitems of ")
 
 
-def _workspace_name(board: dict) -> str:
-    """Extract workspace name from a board dict, defaulting to 'No Workspace'."""
-    return (board.get("workspace") or {}).get("name", "") or "No Workspace"
-
-
 def _workspace_id(board: dict) -> str:
     return str((board.get("workspace") or {}).get("id", ""))
 
@@ -144,14 +145,6 @@ def _filter_real_boards(boards: List[dict]) -> List[dict]:
 # M&A Project Analyzer
 # ---------------------------------------------------------------------------
 
-MA_WORKSPACE_KEYWORDS = ["m&a", "merger", "acquisition"]
-
-MA_BOARD_KEYWORDS = [
-    "m&a", "merger", "acquisition", "deal flow", "dealflow",
-    "due diligence", "pipeline", "target", "investment",
-    "status", "deal timetable", "task tracker", "budget",
-]
-
 MA_STAGES_ORDERED = [
     "identified", "initial review", "screening", "nda signed",
     "information requested", "due diligence", "loi submitted",
@@ -161,20 +154,6 @@ MA_STAGES_ORDERED = [
 ]
 
 
-def _is_ma_workspace(board: dict) -> bool:
-    ws = _workspace_name(board).lower()
-    return any(kw in ws for kw in MA_WORKSPACE_KEYWORDS)
-
-
-def _is_ma_board(board: dict) -> bool:
-    """A board is M&A if it's in an M&A workspace OR its name matches."""
-    if _is_ma_workspace(board):
-        return True
-    name = (board.get("name") or "").lower()
-    desc = (board.get("description") or "").lower()
-    return any(kw in name or kw in desc for kw in MA_BOARD_KEYWORDS)
-
-
 def _classify_stage(status_text: str) -> str:
     if not status_text:
         return "unknown"
@@ -206,7 +185,7 @@ class MandAAnalyzer:
 
     def analyze(self, boards: List[dict], board_items: dict) -> dict:
         real_boards = _filter_real_boards(boards)
-        ma_boards = [b for b in real_boards if _is_ma_board(b)]
+        ma_boards = [b for b in real_boards if is_ma_board(b)]
 
         projects: List[dict] = []
         stage_counts: Dict[str, int] = defaultdict(int)
@@ -219,7 +198,7 @@ class MandAAnalyzer:
         for board in ma_boards:
             bid = str(board.get("id", ""))
             board_name = board.get("name", "")
-            ws = _workspace_name(board)
+            ws = workspace_name(board)
             board_data = board_items.get(bid, {})
             items = board_data.get("items", []) if isinstance(board_data, dict) else []
 
@@ -358,7 +337,7 @@ class MandAAnalyzer:
             "timeline": sorted(timeline, key=lambda t: t["date"] or ""),
             "boards_analyzed": [
                 {"id": b.get("id"), "name": b.get("name"),
-                 "workspace": _workspace_name(b)}
+                 "workspace": workspace_name(b)}
                 for b in ma_boards
             ],
         }
@@ -368,23 +347,11 @@ class MandAAnalyzer:
 # IC Scorecard Analyzer
 # ---------------------------------------------------------------------------
 
-# Columns that specifically hold IC gate scores (from M&A Status boards)
-IC_GATE_KEYWORDS = [
-    "gate 0", "gate 1", "gate 2", "gate 3",
-    "ic score", "latest ic",
-]
-
 IC_SCORE_KEYWORDS = [
     "score", "rating", "ic", "assessment", "grade", "rank",
     "evaluation", "total", "weighted", "points", "gate",
 ]
 
-IC_BOARD_KEYWORDS = [
-    "ic", "investment committee", "scorecard", "scoring",
-    "assessment", "evaluation", "rating", "review",
-    "status",  # The M&A "Status" board has IC columns
-]
-
 
 class ICScoreAnalyzer:
     """Analyzes IC (Investment Committee) scorecard progression.
@@ -393,22 +360,6 @@ class ICScoreAnalyzer:
     in M&A Status boards, plus any dedicated IC boards.
     """
 
-    def _is_ic_board(self, board: dict) -> bool:
-        """A board is IC-relevant if it's in an M&A workspace or has IC keywords."""
-        if _is_ma_workspace(board):
-            return True
-        name = (board.get("name") or "").lower()
-        desc = (board.get("description") or "").lower()
-        return any(kw in name or kw in desc for kw in IC_BOARD_KEYWORDS)
-
-    def _board_has_ic_columns(self, board: dict) -> bool:
-        """Check if a board has IC-specific columns in its definition."""
-        for col in board.get("columns", []):
-            title = (col.get("title") or "").lower()
-            if any(kw in title for kw in IC_GATE_KEYWORDS):
-                return True
-        return False
-
     def _extract_scores(self, item: dict) -> Tuple[Dict[str, float], Dict[str, str]]:
         """Extract IC scores and status decisions from an item."""
         numeric_scores: Dict[str, float] = {}
@@ -446,15 +397,15 @@ class ICScoreAnalyzer:
         real_boards = _filter_real_boards(boards)
 
         # Prioritise boards with IC columns, then IC-keyword boards
-        ic_boards = [b for b in real_boards if self._board_has_ic_columns(b)]
+        ic_boards = [b for b in real_boards if board_has_ic_columns(b)]
         if not ic_boards:
-            ic_boards = [b for b in real_boards if self._is_ic_board(b)]
+            ic_boards = [b for b in real_boards if is_ic_board(b)]
 
         all_items: List[dict] = []
         for board in ic_boards:
             bid = str(board.get("id", ""))
             board_name = board.get("name", "")
-            ws = _workspace_name(board)
+            ws = workspace_name(board)
             board_data = board_items.get(bid, {})
             items = board_data.get("items", []) if isinstance(board_data, dict) else []
 
@@ -616,7 +567,7 @@ class ICScoreAnalyzer:
             "items": all_items,
             "boards_analyzed": [
                 {"id": b.get("id"), "name": b.get("name"),
-                 "workspace": _workspace_name(b)}
+                 "workspace": workspace_name(b)}
                 for b in ic_boards
             ],
         }
@@ -626,8 +577,6 @@ class ICScoreAnalyzer:
 # AI Workspace Analyzer
 # ---------------------------------------------------------------------------
 
-AI_WORKSPACE_NAMES = ["ecomplete ai", "e-complete ai", "ai committee"]
-
 AI_BOARD_MAP = {
     "initiatives": ["initiative"],
     "tools": ["tool"],
@@ -642,10 +591,6 @@ AI_BOARD_MAP = {
 class AIWorkspaceAnalyzer:
     """Analyzes boards in the eComplete AI workspace."""
 
-    def _is_ai_workspace(self, board: dict) -> bool:
-        ws = _workspace_name(board).lower().strip()
-        return any(ws == name or ws.startswith(name) for name in AI_WORKSPACE_NAMES)
-
     def _classify_board(self, board_name: str) -> str:
         name_lower = board_name.lower()
         for category, keywords in AI_BOARD_MAP.items():
@@ -655,7 +600,7 @@ class AIWorkspaceAnalyzer:
 
     def analyze(self, boards: List[dict], board_items: dict) -> dict:
         real_boards = _filter_real_boards(boards)
-        ai_boards = [b for b in real_boards if self._is_ai_workspace(b)]
+        ai_boards = [b for b in real_boards if is_ai_workspace(b)]
 
         if not ai_boards:
             return {"total_items": 0, "boards": [], "categories": {}}
@@ -792,7 +737,7 @@ class BoardOverviewAnalyzer:
         for board in real_boards:
             bid = str(board.get("id", ""))
             board_name = board.get("name", "")
-            ws = _workspace_name(board)
+            ws = workspace_name(board)
             ws_id = _workspace_id(board)
 
             if ws not in workspace_map:
@@ -872,6 +817,27 @@ def _load_latest_raw(prefix: str) -> Any:
     return data.get("results", data)
 
 
+def _join_column_titles(boards: List[dict], board_items: dict):
+    """Attach each column value's title from its board's ``columns``.
+
+    The fetcher stores titles once per board rather than on every column
+    value of every item and subitem; analyzers match on ``cv["title"]``.
+    """
+    for board in boards:
+        board_data = board_items.get(str(board.get("id", "")))
+        if not isinstance(board_data, dict):
+            continue
+        title_for = {c.get("id"): c.get("title", "") for c in board.get("columns", [])}.get
+        for item in board_data.get("items") or ():
+            for cv in item.get("column_values") or ():
+                cid = cv.get("id")
+                cv["title"] = title_for(cid, cid or "")
+            for si in item.get("subitems") or ():
+                for cv in si.get("column_values") or ():
+                    cid = cv.get("id")
+                    cv["title"] = title_for(cid, cid or "")
+
+
 # ---------------------------------------------------------------------------
 # Orchestrator
 # ---------------------------------------------------------------------------
@@ -882,6 +848,8 @@ def run_monday_analysis() -> dict:
     boards = _load_latest_raw("monday_boards") or []
     board_items = _load_latest_raw("monday_items") or {}
     users = _load_latest_raw("monday_users") or []
+    if isinstance(board_items, dict):
+        _join_column_titles(boards, board_items)
 
     real_boards = _filter_real_boards(boards)
     logger.info(
@@ -0,0 +1,174 @@
+"""Tests for the HubSpot fetcher: incremental sync cursors and raw files."""
+
+import json
+
+import pytest
+
+from scripts import fetch_hubspot
+
+
+def _rec(record_id, updated_at):
+    return {"id": record_id, "updatedAt": updated_at}
+
+
+class TestHighWatermark:
+    def test_moves_forward_to_max_updated_at(self):
+        records = [
+            _rec("1", "2024-01-01T00:00:00Z"),
+            _rec("2", "2024-03-01T00:00:00Z"),
+            _rec("3", "2024-02-01T00:00:00Z"),
+        ]
+        previous = 1_700_000_000_000
+        assert fetch_hubspot._high_watermark(records, previous) == 1_709_251_200_000
+
+    def test_accepts_epoch_ms_strings(self):
+        records = [_rec("1", "1709251200000"), _rec("2", "1704067200000")]
+        assert fetch_hubspot._high_watermark(records, None) == 1_709_251_200_000
+
+    def test_stays_put_without_records(self):
+        assert fetch_hubspot._high_watermark([], 1_700_000_000_000) == 1_700_000_000_000
+
+    def test_stays_put_with_only_malformed_records(self):
+        records = [_rec("1", None), _rec("2", ""), _rec("3", "not a date"), {"id": "4"}]
+        assert fetch_hubspot._high_watermark(records, 1_700_000_000_000) == 1_700_000_000_000
+
+    def test_never_moves_backwards(self):
+        records = [_rec("1", "2020-01-01T00:00:00Z")]
+        assert fetch_hubspot._high_watermark(records, 1_700_000_000_000) == 1_700_000_000_000
+
+    def test_none_without_records_or_previous(self):
+        assert fetch_hubspot._high_watermark([], None) is None
+
+
+class _FakeClient:
+    association_calls = {}
+
+    def __init__(self, api_key):
+        _FakeClient.association_calls = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def paginate_all(self, endpoint, params=None):
+        return []
+
+    def get(self, endpoint, params=None):
+        return {"results": []}
+
+    def fetch_associations(self, from_type, to_type, ids):
+        _FakeClient.association_calls[(from_type, to_type)] = list(ids)
+        return {}
+
+
+@pytest.fixture
+def run_sync(monkeypatch):
+    """Run fetch_hubspot against canned per-object results; return (since, saved)."""
+
+    def _run(state, results, failing=()):
+        since_seen = {}
+        saved = {}
+
+        def fake_fetch_object(client, obj_type, props, since_ms, date_stamp):
+            since_seen[obj_type] = since_ms
+            if obj_type in failing:
+                raise RuntimeError(f"{obj_type} unavailable")
+            return results.get(obj_type, [])
+
+        monkeypatch.setenv("HUBSPOT_API_KEY", "pat-test")
+        monkeypatch.setattr(fetch_hubspot, "HubSpotClient", _FakeClient)
+        monkeypatch.setattr(fetch_hubspot, "_fetch_object", fake_fetch_object)
+        monkeypatch.setattr(fetch_hubspot, "_fetch_form_submissions", lambda client, d: None)
+        monkeypatch.setattr(fetch_hubspot, "_write_raw", lambda *a, **k: None)
+        monkeypatch.setattr(fetch_hubspot, "load_sync_state", lambda source: dict(state))
+        monkeypatch.setattr(fetch_hubspot, "save_sync_state",
+                            lambda source, new_state: saved.update(new_state))
+        fetch_hubspot.fetch_hubspot()
+        return since_seen, saved["cursors"]
+
+    return _run
+
+
+class TestSyncCursors:
+    def test_cursor_advances_to_latest_record(self, run_sync):
+        state = {"cursors": {"deals": 1_700_000_000_000}}
+        _, cursors = run_sync(state, {"deals": [_rec("1", "2024-03-01T00:00:00Z")]})
+        assert cursors["deals"] == 1_709_251_200_000
+
+    def test_cursor_kept_when_nothing_changed(self, run_sync):
+        state = {"cursors": {"deals": 1_700_000_000_000}}
+        _, cursors = run_sync(state, {"deals": [_rec("1", None)]})
+        assert cursors["deals"] == 1_700_000_000_000
+
+    def test_missing_cursor_falls_back_to_last_sync_ms(self, run_sync):
+        state = {"last_sync_ms": 1_690_000_000_000, "cursors": {"contacts": 1_700_000_000_000}}
+        since, cursors = run_sync(state, {})
+        assert since["contacts"] == 1_700_000_000_000
+        assert since["companies"] == 1_690_000_000_000
+        assert since["calls"] == 1_690_000_000_000
+        # Nothing new arrived, so the fallback is kept rather than dropped
+        assert cursors["companies"] == 1_690_000_000_000
+
+    def test_failed_engagement_type_keeps_previous_cursor(self, run_sync):
+        state = {"cursors": {"calls": 1_700_000_000_000, "emails": 1_700_000_000_000}}
+        results = {
+            "calls": [_rec("1", "2024-03-01T00:00:00Z")],
+            "emails": [_rec("2", "2024-03-01T00:00:00Z")],
+        }
+        _, cursors = run_sync(state, results, failing=("calls",))
+        assert cursors["calls"] == 1_700_000_000_000
+        assert cursors["emails"] == 1_709_251_200_000
+
+
+class TestAssociationPreselection:
+    def test_contacts_with_zero_counts_are_not_looked_up(self, run_sync):
+        contacts = [
+            {"id": "1", "num_associated_deals": "0", "num_associated_companies": "1"},
+            {"id": "2", "num_associated_deals": "3", "num_associated_companies": "0"},
+            {"id": "3", "num_associated_deals": None, "num_associated_companies": None},
+        ]
+        run_sync({}, {"contacts": contacts, "deals": [{"id": "9"}]})
+        calls = _FakeClient.association_calls
+        assert calls[("contacts", "deals")] == ["2", "3"]
+        assert calls[("contacts", "companies")] == ["1", "3"]
+        assert calls[("deals", "companies")] == ["9"]
+
+class TestWriteRawPages:
+    @pytest.fixture(autouse=True)
+    def raw_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(fetch_hubspot, "RAW_DIR", tmp_path)
+        return tmp_path
+
+    def test_round_trips_through_json_load(self, raw_dir):
+        pages = [[{"id": "1", "properties": {"amount": "10"}}, {"id": "2"}], [], [{"id": "3"}]]
+        count = fetch_hubspot._write_raw_pages("hubspot_deals", "2024-03-01", iter(pages))
+
+        with open(raw_dir / "hubspot_deals_2024-03-01.json", encoding="utf-8") as f:
+            data = json.load(f)
+        assert count == 3
+        assert data["record_count"] == 3
+        assert data["results"] == [r for page in pages for r in page]
+        assert data["object_type"] == "deals"
+        assert list(data)[-1] == "results"
+
+    def test_empty_pages_write_an_empty_list(self, raw_dir):
+        assert fetch_hubspot._write_raw_pages("hubspot_calls", "2024-03-01", []) == 0
+        with open(raw_dir / "hubspot_calls_2024-03-01.json", encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["record_count"] == 0
+        assert data["results"] == []
+
+    def test_failure_midway_keeps_previous_file(self, raw_dir):
+        out_path = raw_dir / "hubspot_deals_2024-03-01.json"
+        out_path.write_text('{"results": ["previous"]}')
+
+        def pages():
+            yield [{"id": "1"}]
+            raise RuntimeError("connection dropped")
+
+        with pytest.raises(RuntimeError):
+            fetch_hubspot._write_raw_pages("hubspot_deals", "2024-03-01", pages())
+        assert json.loads(out_path.read_text()) == {"results": ["previous"]}
+        assert list(raw_dir.iterdir()) == [out_path]
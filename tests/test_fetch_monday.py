@@ -0,0 +1,84 @@
+"""Tests for the Monday.com fetcher's SQLite board cache."""
+
+import json
+import zlib
+
+import pytest
+
+from scripts import fetch_monday
+
+
+@pytest.fixture(autouse=True)
+def cache_db(tmp_path, monkeypatch):
+    fetch_monday._cache_close()
+    fetch_monday._cache_read_version.cache_clear()
+    monkeypatch.setattr(fetch_monday, "CACHE_DB", tmp_path / "boards.db")
+    yield tmp_path / "boards.db"
+    fetch_monday._cache_close()
+
+
+def _insert(board_id, cached_at, payload):
+    fetch_monday._cache_db().execute(
+        "INSERT OR REPLACE INTO boards (board_id, cached_at, payload) VALUES (?, ?, ?)",
+        (board_id, cached_at, payload),
+    )
+
+
+class TestBoardCache:
+    def test_write_read_round_trip(self):
+        items = [{"id": "10", "name": "Item", "column_values": [{"id": "status", "text": "Done"}]}]
+        logs = [{"id": "a1", "event": "update_column_value"}]
+        fetch_monday._cache_write("42", "Pipeline", items, logs)
+
+        assert fetch_monday._cache_read("42") == {
+            "board_id": "42",
+            "board_name": "Pipeline",
+            "items": items,
+            "activity_logs": logs,
+        }
+
+    def test_payload_is_zlib_compressed(self):
+        fetch_monday._cache_write("42", "Pipeline", [{"id": "10"}], [])
+        blob = fetch_monday._cache_db().execute(
+            "SELECT payload FROM boards WHERE board_id = '42'").fetchone()[0]
+        assert blob[:1] != b"{"
+        assert json.loads(zlib.decompress(blob))["items"] == [{"id": "10"}]
+
+    def test_reads_legacy_plain_json_rows(self):
+        payload = {"board_id": "7", "items": [{"id": "1"}], "activity_logs": []}
+        _insert("7", 1_700_000_000.0, json.dumps(payload).encode())
+        assert fetch_monday._cache_read("7") == payload
+
+    def test_missing_or_corrupt_row_reads_as_none(self):
+        _insert("8", 1_700_000_000.0, b"\x78\x01not zlib")
+        assert fetch_monday._cache_read("8") is None
+        assert fetch_monday._cache_read("missing") is None
+
+    def test_session_closes_connection_on_error(self):
+        with pytest.raises(RuntimeError):
+            with fetch_monday._cache_session():
+                fetch_monday._cache_write("1", "Board", [], [])
+                raise RuntimeError("board worker failed")
+        assert fetch_monday._cache_conn is None
+
+
+class TestCacheFreshness:
+    def test_timestamps_skip_legacy_iso_rows(self):
+        _insert("1", 1_700_000_000.5, b"{}")
+        _insert("2", "2024-01-01T00:00:00+00:00", b"{}")
+        assert fetch_monday._cache_timestamps() == {"1": 1_700_000_000.5}
+
+    def test_fresh_cutoff_is_max_age_before_now(self, monkeypatch):
+        monkeypatch.setattr(fetch_monday.time, "time", lambda: 1_700_000_000.0)
+        assert fetch_monday._fresh_cutoff(24) == 1_700_000_000.0 - 24 * 3600
+
+    def test_new_write_is_fresh_and_old_row_is_stale(self, monkeypatch):
+        now = 1_700_000_000.0
+        monkeypatch.setattr(fetch_monday.time, "time", lambda: now)
+        fetch_monday._cache_write("new", "Board", [], [])
+        _insert("old", now - 25 * 3600, b"{}")
+
+        stamps = fetch_monday._cache_timestamps()
+        cutoff = fetch_monday._fresh_cutoff(24)
+        assert stamps["new"] > cutoff
+        assert stamps["old"] <= cutoff
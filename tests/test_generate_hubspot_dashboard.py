@@ -0,0 +1,142 @@
+"""Tests for the HubSpot dashboard generator."""
+
+import json
+import os
+
+import pytest
+
+from scripts import generate_hubspot_dashboard as dashboard
+
+
+METRICS = {
+    "insights": {
+        "win_loss_analysis": {"won_reasons": {"Price": 2, "Fit": 5}, "lost_reasons": ["Timing"]},
+    },
+}
+
+
+@pytest.fixture
+def metrics_file(tmp_path, monkeypatch):
+    """Point the generator at a tmp metrics file and count JSON parses."""
+    data_file = tmp_path / "hubspot_sales_metrics.json"
+    data_file.write_text(json.dumps(METRICS))
+    monkeypatch.setattr(dashboard, "DATA_FILE", data_file)
+    monkeypatch.setattr(dashboard, "METRICS_CACHE", tmp_path / "cache" / "metrics.norm.pkl")
+
+    parses = []
+    load_json = dashboard._load_json
+
+    def counting_load_json(path):
+        parses.append(path)
+        return load_json(path)
+
+    monkeypatch.setattr(dashboard, "_load_json", counting_load_json)
+    return data_file, parses
+
+
+class TestLoadMetricsCache:
+    def test_second_load_comes_from_cache(self, metrics_file):
+        _, parses = metrics_file
+        first = dashboard._load_metrics()
+        second = dashboard._load_metrics()
+        assert len(parses) == 1
+        assert second == first
+        assert second["insights"]["win_loss_analysis"]["won_reasons"] == [("Fit", 5), ("Price", 2)]
+
+    def test_changed_source_size_rebuilds(self, metrics_file):
+        data_file, parses = metrics_file
+        dashboard._load_metrics()
+        data_file.write_text(json.dumps({**METRICS, "extra": True}))
+        assert dashboard._load_metrics()["extra"] is True
+        assert len(parses) == 2
+
+    def test_changed_source_mtime_rebuilds(self, metrics_file):
+        data_file, parses = metrics_file
+        dashboard._load_metrics()
+        st = data_file.stat()
+        os.utime(data_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        dashboard._load_metrics()
+        assert len(parses) == 2
+
+    def test_version_bump_rebuilds(self, metrics_file, monkeypatch):
+        _, parses = metrics_file
+        dashboard._load_metrics()
+        monkeypatch.setattr(dashboard, "METRICS_CACHE_VERSION", dashboard.METRICS_CACHE_VERSION + 1)
+        dashboard._load_metrics()
+        dashboard._load_metrics()
+        assert len(parses) == 2
+
+    def test_truncated_pickle_falls_back_to_parse(self, metrics_file):
+        _, parses = metrics_file
+        expected = dashboard._load_metrics()
+        blob = dashboard.METRICS_CACHE.read_bytes()
+        dashboard.METRICS_CACHE.write_bytes(blob[:len(blob) // 2])
+
+        assert dashboard._load_metrics() == expected
+        assert len(parses) == 2
+        # The rewritten cache is whole again
+        assert dashboard._load_metrics() == expected
+        assert len(parses) == 2
+
+    def test_garbage_cache_file_falls_back_to_parse(self, metrics_file):
+        _, parses = metrics_file
+        dashboard.METRICS_CACHE.parent.mkdir(parents=True)
+        dashboard.METRICS_CACHE.write_bytes(b"\x00" * 8)
+        assert dashboard._load_metrics()["insights"]["win_loss_analysis"]["lost_reasons"] == [
+            ("Timing", None)]
+        assert len(parses) == 1
+
+
+class TestJsonEmbed:
+    def test_plain_payload_matches_orjson(self):
+        payload = {"2024-01": {"won": 3, "value": 1250.5, "owner": None}, "labels": ["a", "b"]}
+        assert dashboard._json_embed(payload) == dashboard.orjson.dumps(payload).decode()
+        assert json.loads(dashboard._json_embed(payload)) == payload
+
+    def test_non_finite_floats_keep_literals(self):
+        payload = {"rate": float("nan"), "series": [1.5, float("inf"), None], "floor": float("-inf")}
+        embedded = dashboard._json_embed(payload)
+        assert '"rate":NaN' in embedded
+        assert "[1.5,Infinity,null]" in embedded
+        assert '"floor":-Infinity' in embedded
+
+    def test_nan_text_in_strings_is_not_a_float(self):
+        payload = {"label": "NaN", "note": "Infinity", "missing": None}
+        assert dashboard._json_embed(payload) == dashboard.orjson.dumps(payload).decode()
+
+    def test_non_string_keys_are_kept(self):
+        assert json.loads(dashboard._json_embed({1: None, 2: [0.5]})) == {"1": None, "2": [0.5]}
+
+    def test_has_non_finite_walks_nested_containers(self):
+        assert dashboard._has_non_finite({"a": [{"b": (1, float("nan"))}]})
+        assert not dashboard._has_non_finite({"a": [{"b": (1, 2.5, None, "nan")}]})
+
+
+class TestSvgDonut:
+    @pytest.fixture
+    def rendered(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(dashboard, "_svg_donut_cached",
+                            lambda segments, size, inner_ratio: calls.append(segments) or "")
+        return calls
+
+    def test_long_tail_folds_into_other(self, rendered):
+        segments = [(f"Source {i}", float(i)) for i in range(1, 16)]
+        dashboard._svg_donut(segments)
+
+        (drawn,) = rendered
+        assert len(drawn) == dashboard._DONUT_TOP_SEGMENTS + 1
+        assert [label for label, _ in drawn[:3]] == ["Source 15", "Source 14", "Source 13"]
+        assert drawn[-1] == ("Other", 1.0 + 2.0 + 3.0 + 4.0 + 5.0)
+        assert sum(v for _, v in drawn) == sum(v for _, v in segments)
+
+    def test_short_series_is_drawn_as_given(self, rendered):
+        segments = [(f"Stage {i}", i) for i in range(dashboard._DONUT_MAX_SEGMENTS)]
+        dashboard._svg_donut(segments)
+        assert rendered == [tuple(segments)]
+
+    def test_renders_legend_with_other(self):
+        segments = [(f"Source {i}", i) for i in range(1, 14)]
+        svg = dashboard._svg_donut(segments)
+        assert "Other" in svg
+        assert "Source 3" not in svg
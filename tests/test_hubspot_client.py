@@ -0,0 +1,66 @@
+"""Tests for the HubSpot API client."""
+
+import pytest
+
+from scripts.lib import hubspot_client
+from scripts.lib.hubspot_client import HubSpotClient
+
+BASE_MS = 1_700_000_000_000
+
+
+class _FakeSearch:
+    """CRM search endpoint over a fixed record set, with HubSpot's paging window."""
+
+    def __init__(self, records):
+        self.records = records
+        self.bodies = []
+
+    def __call__(self, method, endpoint, params=None, body=None):
+        self.bodies.append(body)
+        since = int(body["filterGroups"][0]["filters"][0]["value"])
+        after = int(body["after"])
+        assert after < hubspot_client.HUBSPOT_SEARCH_WINDOW, "paged past the search window"
+        matching = [r for r in self.records if int(r["updatedAt"]) >= since]
+        page = matching[after:after + body["limit"]]
+        data = {"results": page, "total": len(matching)}
+        if after + body["limit"] < len(matching):
+            data["paging"] = {"next": {"after": str(after + body["limit"])}}
+        return data
+
+
+@pytest.fixture
+def client():
+    with HubSpotClient("pat-test") as c:
+        yield c
+
+
+class TestSearchModified:
+    def test_reanchors_past_search_window(self, client, monkeypatch):
+        # Three records per millisecond, so the 10,000th record shares its
+        # timestamp with records on both sides of the window boundary.
+        records = [{"id": str(i), "updatedAt": str(BASE_MS + i // 3)} for i in range(10_500)]
+        search = _FakeSearch(records)
+        monkeypatch.setattr(client, "_request", search)
+
+        found = client.search_modified("deals", BASE_MS, ["dealname"])
+
+        ids = [r["id"] for r in found]
+        assert len(ids) == len(set(ids))
+        assert ids == [r["id"] for r in records]
+
+        window_pages = hubspot_client.HUBSPOT_SEARCH_WINDOW // hubspot_client.HUBSPOT_SEARCH_LIMIT
+        reanchored = search.bodies[window_pages]
+        last_in_window = records[hubspot_client.HUBSPOT_SEARCH_WINDOW - 1]
+        assert reanchored["after"] == 0
+        assert reanchored["filterGroups"][0]["filters"][0]["value"] == last_in_window["updatedAt"]
+        assert reanchored["filterGroups"][0]["filters"][0]["operator"] == "GTE"
+
+    def test_stops_when_window_does_not_advance(self, client, monkeypatch):
+        records = [{"id": str(i), "updatedAt": str(BASE_MS)} for i in range(10_200)]
+        search = _FakeSearch(records)
+        monkeypatch.setattr(client, "_request", search)
+
+        found = client.search_modified("contacts", BASE_MS, [])
+
+        assert len(found) == hubspot_client.HUBSPOT_SEARCH_WINDOW
+        assert all(b["after"] != 0 for b in search.bodies[1:])